@@ -0,0 +1,4 @@
+# benchmarks/__init__.py
+"""
+Scripts de benchmark (python -m benchmarks.<nom>)
+"""
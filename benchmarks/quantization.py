@@ -0,0 +1,122 @@
+# benchmarks/quantization.py
+"""
+Rapport de précision réduite : float64 vs float16 / int8 sur le split de test
+
+Usage : python -m benchmarks.quantization [--bundle CHEMIN] [--export int8]
+"""
+import argparse
+import json
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import accuracy_score, f1_score
+
+from config.settings import DATA_DIR, MODELS_DIR, REPORTS_DIR, MODEL_CONFIG
+from models.ml_model import MLModel
+from models.quantized import QUANTIZED_DTYPES
+
+
+def load_test_split():
+    """Reproduit le split train/test de preprocessing.py"""
+    df = pd.read_csv(DATA_DIR / 'spam.csv', encoding='latin-1')
+    df = df[['v1', 'v2']]
+    df.columns = ['label', 'message']
+    
+    _, X_test, _, y_test = train_test_split(
+        df['message'], df['label'].map({'ham': 0, 'spam': 1}),
+        test_size=MODEL_CONFIG['test_size'],
+        random_state=MODEL_CONFIG['random_state'],
+        stratify=df['label']
+    )
+    return list(X_test), np.asarray(y_test)
+
+
+def weight_bytes(model):
+    """Mémoire des poids (log-probabilités ou coefficients, et IDF appliqué)"""
+    estimator, vectorizer = model.model, model.vectorizer
+    if hasattr(estimator, 'nbytes'):
+        return estimator.nbytes + vectorizer.nbytes
+    
+    weights = getattr(estimator, 'feature_log_prob_', None)
+    if weights is None:
+        weights = estimator.coef_
+    # Le vectorizer.pkl historique n'expose pas idf_ et n'applique aucun IDF
+    idf = getattr(vectorizer, 'idf_', None)
+    return weights.nbytes + (idf.nbytes if idf is not None else 0)
+
+
+def compare(reference, quantized, cleaned, y_test):
+    """Précision et accord du modèle quantifié avec la référence"""
+    ref_proba = reference.model.predict_proba(reference.vectorizer.transform(cleaned))
+    q_proba = quantized.model.predict_proba(quantized.vectorizer.transform(cleaned))
+    
+    ref_pred = ref_proba.argmax(axis=1)
+    q_pred = q_proba.argmax(axis=1)
+    spam_diff = np.abs(ref_proba[:, 1] - q_proba[:, 1])
+    
+    return {
+        'version': quantized.version,
+        'accuracy': accuracy_score(y_test, q_pred),
+        'accuracy_delta': accuracy_score(y_test, q_pred) - accuracy_score(y_test, ref_pred),
+        'f1': f1_score(y_test, q_pred),
+        'agreement': float(np.mean(ref_pred == q_pred)),
+        'spam_prob_mean_abs_diff': float(spam_diff.mean()),
+        'spam_prob_max_abs_diff': float(spam_diff.max()),
+        'weight_bytes': weight_bytes(quantized)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--bundle', help="Bundle de référence (défaut: modèle actuel)")
+    parser.add_argument('--export', choices=QUANTIZED_DTYPES,
+                        help="Exporter aussi le bundle quantifié")
+    args = parser.parse_args()
+    
+    print("="*60)
+    print("🗜️ RAPPORT DE QUANTIFICATION DU MODÈLE")
+    print("="*60 + "\n")
+    
+    reference = MLModel()
+    loaded = reference.load_bundle(args.bundle) if args.bundle else reference.load_model()
+    if not loaded:
+        print("❌ Modèle de référence introuvable")
+        return
+    
+    X_test, y_test = load_test_split()
+    cleaned = reference.text_processor.clean_batch(X_test)
+    ref_pred = reference.model.predict_proba(reference.vectorizer.transform(cleaned)).argmax(axis=1)
+    
+    report = {
+        'reference': {
+            'version': reference.version,
+            'accuracy': accuracy_score(y_test, ref_pred),
+            'f1': f1_score(y_test, ref_pred),
+            'weight_bytes': weight_bytes(reference)
+        },
+        'test_size': len(y_test)
+    }
+    print(f"float64  acc={report['reference']['accuracy']*100:.2f}%  "
+          f"poids={report['reference']['weight_bytes']/1024:.1f} Ko")
+    
+    for dtype in QUANTIZED_DTYPES:
+        result = compare(reference, reference.quantize(dtype), cleaned, y_test)
+        report[dtype] = result
+        print(f"{dtype:<8} acc={result['accuracy']*100:.2f}%  "
+              f"accord={result['agreement']*100:.2f}%  "
+              f"Δp max={result['spam_prob_max_abs_diff']:.4f}  "
+              f"poids={result['weight_bytes']/1024:.1f} Ko")
+    
+    output_path = REPORTS_DIR / 'quantization_report.json'
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Rapport sauvegardé : {output_path}")
+    
+    if args.export:
+        bundle_path = MODELS_DIR / f"spam_detector_{args.export}.pkl"
+        if reference.export_quantized(bundle_path, args.export):
+            print(f"✅ Bundle {args.export} exporté : {bundle_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+# benchmarks/scalability.py
+"""
+Passage à l'échelle de MLModel.train et courbes d'apprentissage
+
+Pour chaque algorithme et chaque max_features, le modèle est entraîné sur
+des corpus de tailles géométriques (par défaut 1k à 1M messages, jusqu'à
+10M avec --max-size) : durées de nettoyage et d'entraînement, pic mémoire,
+taille du bundle et F1 sur un jeu de test fixe. Chaque mesure s'exécute
+dans un processus neuf (mode spawn), pour que le pic mémoire soit celui
+de cette seule taille. Les données sont générées par
+benchmarks.synthetic_corpus, ou lues dans un CSV / JSONL (--data).
+
+L'exposant de croissance de la durée (pente log-log) est ajouté au
+rapport, pour extrapoler aux tailles non mesurées.
+
+Usage : python -m benchmarks.scalability [--max-size 10000000] [--algorithms naive_bayes svm]
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.metrics import f1_score
+
+from config.settings import SCALABILITY_CONFIG
+from models.ml_model import MLModel
+from models.text_processor import TextProcessor
+from training.streaming import iter_chunks, peak_rss_mb
+from .synthetic_corpus import CorpusStatistics, SyntheticCorpus
+
+
+def geometric_sizes(min_size, max_size, points_per_decade):
+    """Tailles réparties géométriquement entre min_size et max_size (inclus)"""
+    count = int(round(np.log10(max_size / min_size) * points_per_decade)) + 1
+    return sorted({int(round(size, -2)) or int(size)
+                   for size in np.geomspace(min_size, max_size, count)})
+
+
+def load_rows(size, holdout_size, data_path=None, seed=None):
+    """
+    Jeu d'entraînement de size messages et jeu de test fixe
+    
+    Avec data_path, le jeu de test est le début du fichier et l'entraînement
+    les lignes suivantes ; sinon, deux corpus synthétiques de graines différentes.
+    
+    Returns:
+        tuple: (X_train, y_train, X_test, y_test), textes bruts
+    """
+    if data_path is None:
+        seed = SCALABILITY_CONFIG['seed'] if seed is None else seed
+        statistics = CorpusStatistics.from_csv()
+        corpora = [SyntheticCorpus(statistics, size, seed=seed),
+                   SyntheticCorpus(statistics, holdout_size, seed=seed + 1)]
+        rows = []
+        for corpus in corpora:
+            messages, labels = [], []
+            for chunk_messages, chunk_labels, _ in corpus.iter_chunks():
+                messages.extend(chunk_messages)
+                labels.extend(chunk_labels.tolist())
+            rows.append((messages, np.asarray(labels)))
+        (X_train, y_train), (X_test, y_test) = rows
+        return X_train, y_train, X_test, y_test
+    
+    messages, labels = [], []
+    for chunk_messages, chunk_labels in iter_chunks(data_path, 50_000):
+        messages.extend(chunk_messages)
+        labels.extend(chunk_labels.tolist())
+        if len(messages) >= holdout_size + size:
+            break
+    if len(messages) < holdout_size + size:
+        raise ValueError(f"{data_path} : {len(messages)} lignes, {holdout_size + size} nécessaires")
+    labels = np.asarray(labels)
+    return (messages[holdout_size:holdout_size + size], labels[holdout_size:holdout_size + size],
+            messages[:holdout_size], labels[:holdout_size])
+
+
+def measure(algorithm, max_features, size, holdout_size, data_path=None, seed=None):
+    """
+    Une mesure (exécutée dans un processus neuf)
+    
+    Returns:
+        dict: Durées, pic mémoire, taille du bundle et F1 de test
+    """
+    start = time.perf_counter()
+    X_train, y_train, X_test, y_test = load_rows(size, holdout_size, data_path, seed)
+    load_time = time.perf_counter() - start
+    rss_data = peak_rss_mb()
+    
+    processor = TextProcessor()
+    start = time.perf_counter()
+    X_train = processor.clean_batch(X_train)
+    clean_time = time.perf_counter() - start
+    X_test = processor.clean_batch(X_test)
+    
+    model = MLModel(algorithm, max_features=max_features)
+    start = time.perf_counter()
+    if not model.train(X_train, y_train):
+        raise RuntimeError(f"Échec de l'entraînement ({algorithm}, {size} messages)")
+    train_time = time.perf_counter() - start
+    
+    y_pred = model.model.predict(model.vectorizer.transform(X_test))
+    with tempfile.TemporaryDirectory() as workdir:
+        bundle_path = Path(workdir) / "model.pkl"
+        model.save_bundle(bundle_path)
+        artifact_mb = bundle_path.stat().st_size / 1024 / 1024
+    
+    return {
+        'algorithm': algorithm,
+        'max_features': max_features,
+        'size': size,
+        'load_s': load_time,
+        'clean_s': clean_time,
+        'train_s': train_time,
+        'rss_mb': peak_rss_mb(),
+        'rss_data_mb': rss_data,
+        'artifact_mb': artifact_mb,
+        'f1': f1_score(y_test, y_pred, zero_division=0)
+    }
+
+
+def run_isolated(*args):
+    """Exécute measure dans un processus neuf (pic mémoire propre à la mesure)"""
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1) as pool:
+        return pool.apply(measure, args)
+
+
+def growth_exponent(points, key):
+    """Pente log-log de key en fonction de la taille (1 : linéaire), ou None"""
+    points = [(p['size'], p[key]) for p in points if p[key]]
+    if len(points) < 2:
+        return None
+    sizes, values = np.log(np.array(points, dtype=float)).T
+    return float(np.polyfit(sizes, values, 1)[0])
+
+
+def render(report, output_path):
+    """
+    Figure des quatre courbes (durée, mémoire, taille, F1) en fonction de la taille
+    
+    Returns:
+        Path: Figure écrite, ou None si matplotlib est absent
+    """
+    try:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+    except ImportError:
+        return None
+    
+    figure = Figure(figsize=(12, 9), dpi=100)
+    FigureCanvasAgg(figure)
+    panels = [('train_s', "Entraînement (s)", True), ('rss_mb', "Pic mémoire (Mo)", True),
+              ('artifact_mb', "Bundle (Mo)", True), ('f1', "F1 (test)", False)]
+    for position, (key, title, log_scale) in enumerate(panels, start=1):
+        ax = figure.add_subplot(2, 2, position)
+        for name, series in report['series'].items():
+            points = series['points']
+            ax.plot([p['size'] for p in points], [p[key] for p in points], marker='o', label=name)
+        ax.set_xscale('log')
+        if log_scale:
+            ax.set_yscale('log')
+        ax.set_xlabel('Messages d\'entraînement')
+        ax.set_title(title)
+        ax.grid(alpha=0.3, which='both')
+    figure.axes[0].legend(fontsize=8)
+    figure.tight_layout()
+    
+    output_path = Path(output_path)
+    figure.savefig(output_path)
+    return output_path
+
+
+def main():
+    config = SCALABILITY_CONFIG
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--min-size', type=int, default=config['min_size'])
+    parser.add_argument('--max-size', type=int, default=config['max_size'])
+    parser.add_argument('--points-per-decade', type=int, default=config['points_per_decade'])
+    parser.add_argument('--algorithms', nargs='+', default=config['algorithms'],
+                        choices=list(MLModel.ALGORITHMS))
+    parser.add_argument('--max-features', nargs='+', type=int, default=config['max_features_grid'])
+    parser.add_argument('--holdout-size', type=int, default=config['holdout_size'])
+    parser.add_argument('--time-budget', type=float, default=config['time_budget_s'],
+                        help="Arrête une série dès qu'un entraînement dépasse cette durée (s)")
+    parser.add_argument('--data', help="CSV ou JSONL (défaut: corpus synthétique)")
+    args = parser.parse_args()
+    
+    print("="*60)
+    print("📈 PASSAGE À L'ÉCHELLE DE L'ENTRAÎNEMENT")
+    print("="*60 + "\n")
+    
+    sizes = geometric_sizes(args.min_size, args.max_size, args.points_per_decade)
+    report = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'data': args.data or 'synthetic',
+        'holdout_size': args.holdout_size,
+        'sizes': sizes,
+        'series': {}
+    }
+    
+    for algorithm, max_features in itertools.product(args.algorithms, args.max_features):
+        name = f"{algorithm}@{max_features}"
+        points = []
+        for size in sizes:
+            point = run_isolated(algorithm, max_features, size, args.holdout_size, args.data)
+            points.append(point)
+            print(f"{name:<28} {size:>10}  clean={point['clean_s']:7.1f} s  "
+                  f"train={point['train_s']:7.2f} s  RSS={point['rss_mb']:6.0f} Mo  "
+                  f"bundle={point['artifact_mb']:6.2f} Mo  F1={point['f1']*100:.2f}%")
+            if point['train_s'] > args.time_budget:
+                print(f"⏱️ {name} : budget de {args.time_budget:.0f} s dépassé, série arrêtée")
+                break
+        
+        report['series'][name] = {
+            'points': points,
+            'train_time_exponent': growth_exponent(points, 'train_s'),
+            'rss_exponent': growth_exponent(points, 'rss_mb')
+        }
+    
+    output_path = Path(config['report_path'])
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Rapport sauvegardé : {output_path}")
+    
+    figure_path = render(report, config['plot_path'])
+    if figure_path is not None:
+        print(f"✅ Figure : {figure_path}")
+
+
+if __name__ == "__main__":
+    main()
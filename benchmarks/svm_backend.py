@@ -0,0 +1,108 @@
+# benchmarks/svm_backend.py
+"""
+Benchmark : SVC(kernel='linear', probability=True) vs CalibratedLinearSVC
+
+Usage : python -m benchmarks.svm_backend
+"""
+import json
+import pickle
+import time
+import numpy as np
+from scipy import sparse
+from sklearn.svm import SVC
+from sklearn.metrics import accuracy_score, f1_score
+
+from config.settings import MODELS_DIR, REPORTS_DIR, MODEL_CONFIG
+from models.linear_svm import CalibratedLinearSVC
+
+BACKENDS = {
+    'libsvm_svc': lambda: SVC(kernel='linear', probability=True),
+    'linear_svc_calibrated': CalibratedLinearSVC
+}
+
+# Tailles d'entraînement (échantillonnage avec remise au-delà du train set)
+TRAIN_SIZES = [1000, 2000, 4000, 8000, 16000]
+
+# Au-delà de cette taille, libsvm est trop lent pour un benchmark interactif
+LIBSVM_MAX_SIZE = 8000
+
+
+def resample(X, y, size, rng):
+    """Échantillonne `size` lignes (avec remise si nécessaire)"""
+    idx = rng.choice(X.shape[0], size=size, replace=size > X.shape[0])
+    return X[idx], np.asarray(y)[idx]
+
+
+def benchmark_backend(name, factory, X_train, y_train, X_test, y_test):
+    """Mesure entraînement, latence unitaire, débit batch et qualité"""
+    model = factory()
+    
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    train_time = time.perf_counter() - start
+    
+    # Latence sur un message (cas de PredictionService.predict)
+    latencies = []
+    for i in range(min(200, X_test.shape[0])):
+        row = X_test[i]
+        start = time.perf_counter()
+        model.predict_proba(row)
+        latencies.append(time.perf_counter() - start)
+    
+    # Débit batch
+    start = time.perf_counter()
+    probabilities = model.predict_proba(X_test)
+    batch_time = time.perf_counter() - start
+    
+    y_pred = probabilities.argmax(axis=1)
+    
+    return {
+        'backend': name,
+        'train_size': X_train.shape[0],
+        'train_time_s': train_time,
+        'latency_p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'latency_p99_ms': float(np.percentile(latencies, 99) * 1000),
+        'batch_throughput_msg_s': X_test.shape[0] / batch_time if batch_time else float('inf'),
+        'accuracy': accuracy_score(y_test, y_pred),
+        'f1': f1_score(y_test, y_pred)
+    }
+
+
+def main():
+    print("="*60)
+    print("⚡ BENCHMARK SVM : libsvm vs LinearSVC calibré")
+    print("="*60 + "\n")
+    
+    with open(MODELS_DIR / 'train_data.pkl', 'rb') as f:
+        X_train, X_test, y_train, y_test = pickle.load(f)
+    
+    X_train = sparse.csr_matrix(X_train)
+    X_test = sparse.csr_matrix(X_test)
+    rng = np.random.default_rng(MODEL_CONFIG['random_state'])
+    
+    results = []
+    for size in TRAIN_SIZES:
+        X_sub, y_sub = resample(X_train, y_train, size, rng)
+        
+        for name, factory in BACKENDS.items():
+            if name == 'libsvm_svc' and size > LIBSVM_MAX_SIZE:
+                continue
+            
+            result = benchmark_backend(name, factory, X_sub, y_sub, X_test, y_test)
+            results.append(result)
+            
+            print(f"{name:<24} n={size:<6} "
+                  f"train={result['train_time_s']:.2f}s  "
+                  f"p50={result['latency_p50_ms']:.3f}ms  "
+                  f"batch={result['batch_throughput_msg_s']:.0f} msg/s  "
+                  f"acc={result['accuracy']*100:.2f}%")
+    
+    output_path = REPORTS_DIR / 'svm_backend_benchmark.json'
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    
+    print(f"\n✅ Rapport sauvegardé : {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+# benchmarks/synthetic_corpus.py
+"""
+Générateur déterministe de corpus synthétiques, pour les tests de charge
+
+Les statistiques sont apprises sur data/spam.csv, séparément pour le ham
+et le spam : premiers tokens, bigrammes, unigrammes et longueurs (en
+tokens). Les messages sont tirés par blocs (chaîne de Markov sur les
+bigrammes, vectorisée avec numpy), avec une part de doublons exacts et de quasi-doublons
+(campagnes de spam) et des horodatages croissants sur une période donnée.
+La même graine donne toujours le même corpus ; la mémoire reste bornée
+par la taille d'un bloc, quelle que soit la taille demandée.
+
+Formats : CSV (colonnes v1/v2 de data/spam.csv, plus timestamp), JSONL
+(label, message, timestamp), ou SQLite (table predictions de DatabaseManager).
+
+Usage : python -m benchmarks.synthetic_corpus --size 1000000 [--format jsonl] [--spam-ratio 0.3]
+"""
+import argparse
+import csv
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config.settings import SYNTHETIC_CONFIG
+from database.db_manager import DatabaseManager
+
+LABEL_NAMES = ('ham', 'spam')
+FORMATS = {'csv': '.csv', 'jsonl': '.jsonl', 'sqlite': '.db'}
+
+
+class CorpusStatistics:
+    """Statistiques de tokens d'un corpus source, par classe"""
+    
+    def __init__(self, messages, labels):
+        """
+        Apprend les statistiques
+        
+        Args:
+            messages (list): Messages bruts (découpés sur les espaces, ponctuation conservée)
+            labels: Labels (0 = ham, 1 = spam)
+        """
+        tokenized = [str(message).split() or ['.'] for message in messages]
+        labels = np.asarray(labels, dtype=int)
+        
+        vocabulary = sorted({token for tokens in tokenized for token in tokens})
+        index = {token: i for i, token in enumerate(vocabulary)}
+        self.vocabulary = np.array(vocabulary, dtype=object)
+        self.spam_ratio = float(labels.mean())
+        
+        # Par classe, sous forme d'urnes (une entrée par occurrence, tirage uniforme) :
+        # premiers tokens, tous les tokens, successeurs groupés par token précédent
+        self.starts, self.unigrams, self.successors, self.offsets, self.lengths = [], [], [], [], []
+        for label in (0, 1):
+            documents = [np.array([index[token] for token in tokens])
+                         for tokens, value in zip(tokenized, labels) if value == label]
+            previous = np.concatenate([ids[:-1] for ids in documents])
+            following = np.concatenate([ids[1:] for ids in documents])
+            order = np.argsort(previous, kind='stable')
+            
+            self.starts.append(np.array([ids[0] for ids in documents]))
+            self.unigrams.append(np.concatenate(documents))
+            self.successors.append(following[order])
+            self.offsets.append(np.concatenate([[0], np.cumsum(
+                np.bincount(previous, minlength=len(vocabulary))
+            )]))
+            self.lengths.append(np.array([len(ids) for ids in documents]))
+    
+    @classmethod
+    def from_csv(cls, path=None):
+        """Statistiques d'un CSV au format de data/spam.csv"""
+        df = pd.read_csv(path or SYNTHETIC_CONFIG['source_path'], encoding='latin-1')
+        return cls(df['v2'].tolist(), df['v1'].map({'ham': 0, 'spam': 1}).to_numpy())
+    
+    def sample_unigrams(self, label, count, rng):
+        """Tokens tirés selon leur fréquence dans la classe"""
+        urn = self.unigrams[label]
+        return urn[rng.integers(0, len(urn), count)]
+    
+    def sample_tokens(self, label, count, rng, length_scale=1.0, unigram_mix=0.1):
+        """
+        Tire des messages d'une classe
+        
+        Les messages sont générés du plus long au plus court : à chaque
+        position, seuls ceux qui ne sont pas terminés tirent un token.
+        
+        Args:
+            label (int): 0 = ham, 1 = spam
+            count (int): Nombre de messages
+            rng (np.random.Generator): Générateur aléatoire
+            length_scale (float): Facteur appliqué aux longueurs observées
+            unigram_mix (float): Part des tokens tirés hors bigrammes (diversité)
+        
+        Returns:
+            list: Messages
+        """
+        if count == 0:
+            return []
+        lengths = rng.choice(self.lengths[label], count)
+        lengths = np.maximum(1, np.round(lengths * length_scale)).astype(int)
+        order = np.argsort(-lengths, kind='stable')
+        lengths = lengths[order]
+        successors, offsets = self.successors[label], self.offsets[label]
+        
+        tokens = np.empty((count, lengths[0]), dtype=np.int64)
+        starts = self.starts[label]
+        tokens[:, 0] = starts[rng.integers(0, len(starts), count)]
+        for step in range(1, lengths[0]):
+            active = int(np.count_nonzero(lengths > step))
+            previous = tokens[:active, step - 1]
+            begin = offsets[previous]
+            width = offsets[previous + 1] - begin
+            
+            positions = begin + (rng.random(active) * width).astype(np.int64)
+            bigram = (width > 0) & (rng.random(active) >= unigram_mix)
+            tokens[:active, step] = np.where(
+                bigram,
+                successors[np.minimum(positions, len(successors) - 1)],
+                self.sample_unigrams(label, active, rng)
+            )
+        
+        messages = np.empty(count, dtype=object)
+        messages[order] = [' '.join(self.vocabulary[row[:length]])
+                           for row, length in zip(tokens, lengths)]
+        return messages.tolist()
+
+
+class SyntheticCorpus:
+    """Corpus synthétique produit par blocs, de façon déterministe"""
+    
+    def __init__(self, statistics, size, spam_ratio=None, duplicate_rate=None,
+                 near_duplicate_rate=None, length_scale=None, unigram_mix=None,
+                 start=None, days=None, chunk_size=None, seed=None):
+        """
+        Initialise le générateur (les valeurs absentes viennent de SYNTHETIC_CONFIG)
+        
+        Args:
+            statistics (CorpusStatistics): Statistiques du corpus source
+            size (int): Nombre de messages
+            spam_ratio (float): Part de spam (None : celle du corpus source)
+            duplicate_rate (float): Part de copies exactes d'un message récent
+            near_duplicate_rate (float): Part de copies légèrement modifiées
+            length_scale (float): Facteur sur la distribution des longueurs
+            unigram_mix (float): Part des tokens tirés hors bigrammes
+            start (str): Date du premier message (ISO)
+            days (float): Période couverte par les horodatages
+            chunk_size (int): Messages générés par bloc
+            seed (int): Graine
+        """
+        config = SYNTHETIC_CONFIG
+        self.statistics = statistics
+        self.size = int(size)
+        self.spam_ratio = next(v for v in (spam_ratio, config['spam_ratio'], statistics.spam_ratio)
+                               if v is not None)
+        self.duplicate_rate = config['duplicate_rate'] if duplicate_rate is None else duplicate_rate
+        self.near_duplicate_rate = (config['near_duplicate_rate'] if near_duplicate_rate is None
+                                    else near_duplicate_rate)
+        self.length_scale = length_scale or config['length_scale']
+        self.unigram_mix = config['unigram_mix'] if unigram_mix is None else unigram_mix
+        self.start = np.datetime64(start or config['start'], 's')
+        self.days = days or config['days']
+        self.chunk_size = chunk_size or config['chunk_size']
+        self.seed = config['seed'] if seed is None else seed
+        
+        if self.duplicate_rate + self.near_duplicate_rate > 1:
+            raise ValueError("duplicate_rate + near_duplicate_rate doit rester inférieur à 1")
+    
+    def iter_chunks(self):
+        """
+        Génère le corpus
+        
+        Yields:
+            tuple: (messages, labels np.ndarray, timestamps np.ndarray de chaînes)
+        """
+        step = self.days * 86400 / max(self.size, 1)
+        recent_messages, recent_labels = [], np.array([], dtype=int)
+        
+        for number, offset in enumerate(range(0, self.size, self.chunk_size)):
+            count = min(self.chunk_size, self.size - offset)
+            # Un générateur par bloc : le bloc n ne dépend que de la graine et de n
+            rng = np.random.default_rng([self.seed, number])
+            
+            labels = (rng.random(count) < self.spam_ratio).astype(int)
+            messages = np.empty(count, dtype=object)
+            for label in (0, 1):
+                rows = np.nonzero(labels == label)[0]
+                messages[rows] = self.statistics.sample_tokens(
+                    label, len(rows), rng, self.length_scale, self.unigram_mix
+                )
+            
+            # Doublons et quasi-doublons de messages déjà émis (bloc précédent ou courant)
+            kinds = rng.random(count)
+            copies = np.nonzero(kinds < self.duplicate_rate + self.near_duplicate_rate)[0]
+            pool_size = len(recent_messages)
+            for row in copies:
+                source = rng.integers(0, pool_size + row) if pool_size + row else None
+                if source is None:
+                    continue
+                if source < pool_size:
+                    message, label = recent_messages[source], recent_labels[source]
+                else:
+                    message, label = messages[source - pool_size], labels[source - pool_size]
+                if kinds[row] >= self.duplicate_rate:
+                    message = self._mutate(message, label, rng)
+                messages[row], labels[row] = message, label
+            
+            seconds = (offset + np.arange(count) + rng.random(count)) * step
+            timestamps = self.start + seconds.astype('timedelta64[s]')
+            timestamps = np.char.replace(timestamps.astype(str), 'T', ' ')
+            
+            recent_messages, recent_labels = messages, labels
+            yield messages.tolist(), labels, timestamps
+    
+    def _mutate(self, message, label, rng):
+        """Quasi-doublon : un ou deux tokens remplacés (numéro, lien, mot...)"""
+        tokens = message.split()
+        replacements = self.statistics.sample_unigrams(label, rng.integers(1, 3), rng)
+        for token in self.statistics.vocabulary[replacements]:
+            tokens[rng.integers(0, len(tokens))] = token
+        return ' '.join(tokens)
+    
+    def write(self, path, fmt=None):
+        """
+        Écrit le corpus
+        
+        Args:
+            path (str): Fichier de sortie
+            fmt (str): 'csv', 'jsonl' ou 'sqlite' (par défaut, d'après l'extension)
+        
+        Returns:
+            dict: Nombre de messages, de spams et durée
+        """
+        path = Path(path)
+        fmt = fmt or next((name for name, suffix in FORMATS.items() if path.suffix == suffix), 'csv')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        writer = {'csv': self._write_csv, 'jsonl': self._write_jsonl,
+                  'sqlite': self._write_sqlite}[fmt]
+        
+        start = time.perf_counter()
+        spam = writer(path)
+        return {'path': str(path), 'format': fmt, 'messages': self.size, 'spam': spam,
+                'seconds': time.perf_counter() - start}
+    
+    def _write_csv(self, path):
+        spam = 0
+        # Même encodage que data/spam.csv (les tokens en proviennent)
+        with open(path, 'w', encoding='latin-1', errors='replace', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['v1', 'v2', 'timestamp'])
+            for messages, labels, timestamps in self.iter_chunks():
+                writer.writerows(zip((LABEL_NAMES[label] for label in labels), messages, timestamps))
+                spam += int(labels.sum())
+        return spam
+    
+    def _write_jsonl(self, path):
+        spam = 0
+        with open(path, 'w', encoding='utf-8') as f:
+            for messages, labels, timestamps in self.iter_chunks():
+                f.writelines(
+                    json.dumps({'label': LABEL_NAMES[label], 'message': message,
+                                'timestamp': timestamp}, ensure_ascii=False) + '\n'
+                    for message, label, timestamp in zip(messages, labels, timestamps)
+                )
+                spam += int(labels.sum())
+        return spam
+    
+    def _write_sqlite(self, path):
+        """Table predictions de DatabaseManager, avec des probabilités cohérentes avec le label"""
+        DatabaseManager(path).close()
+        spam = 0
+        conn = sqlite3.connect(path)
+        try:
+            # Chargement en masse : ni journal ni synchronisation, une transaction par bloc
+            conn.execute('PRAGMA journal_mode = OFF')
+            conn.execute('PRAGMA synchronous = OFF')
+            for number, (messages, labels, timestamps) in enumerate(self.iter_chunks()):
+                rng = np.random.default_rng([self.seed, number, 1])
+                confidence = rng.beta(8, 1, len(labels))
+                spam_probability = np.where(labels == 1, confidence, 1 - confidence)
+                conn.executemany(
+                    'INSERT INTO predictions (message, prediction, confidence, ham_probability, '
+                    'spam_probability, model_version, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    zip(messages, labels.tolist(), confidence.tolist(),
+                        (1 - spam_probability).tolist(), spam_probability.tolist(),
+                        ['synthetic'] * len(labels), timestamps.tolist())
+                )
+                conn.commit()
+                spam += int(labels.sum())
+        finally:
+            conn.close()
+        return spam
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=SYNTHETIC_CONFIG['size'])
+    parser.add_argument('--format', choices=list(FORMATS),
+                        help="Format (défaut: d'après l'extension de --output, sinon csv)")
+    parser.add_argument('--output', help="Fichier de sortie (défaut: SYNTHETIC_CONFIG['output_dir'])")
+    parser.add_argument('--spam-ratio', type=float)
+    parser.add_argument('--duplicate-rate', type=float)
+    parser.add_argument('--near-duplicate-rate', type=float)
+    parser.add_argument('--length-scale', type=float)
+    parser.add_argument('--start', help="Date du premier message (ISO)")
+    parser.add_argument('--days', type=float)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+    
+    print("="*60)
+    print("🧪 CORPUS SYNTHÉTIQUE")
+    print("="*60 + "\n")
+    
+    output = args.output or (SYNTHETIC_CONFIG['output_dir']
+                             / f"synthetic_{args.size}{FORMATS[args.format or 'csv']}")
+    corpus = SyntheticCorpus(
+        CorpusStatistics.from_csv(),
+        args.size,
+        spam_ratio=args.spam_ratio,
+        duplicate_rate=args.duplicate_rate,
+        near_duplicate_rate=args.near_duplicate_rate,
+        length_scale=args.length_scale,
+        start=args.start,
+        days=args.days,
+        seed=args.seed
+    )
+    result = corpus.write(output, args.format)
+    
+    print(f"✅ {result['messages']} messages ({result['spam']} spams) écrits dans "
+          f"{result['path']} en {result['seconds']:.1f} s "
+          f"({result['messages'] / max(result['seconds'], 1e-9):.0f} msg/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# benchmarks/warm_start.py
+"""
+Réentraînement incrémental (warm start) vs réentraînement complet
+
+Le modèle est d'abord entraîné sur la partie la plus ancienne du split
+d'entraînement, puis réentraîné sur l'archive complète : en repartant du
+modèle (seuls les nouveaux exemples sont appris) ou depuis zéro.
+
+Usage : python -m benchmarks.warm_start [--initial 0.8] [--algorithms naive_bayes svm]
+"""
+import argparse
+import copy
+import json
+import time
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import accuracy_score, f1_score
+
+from config.settings import DATA_DIR, REPORTS_DIR, MODEL_CONFIG
+from models.ml_model import MLModel
+from models.text_processor import TextProcessor
+
+
+def load_split():
+    """Reproduit le split train/test de preprocessing.py (textes nettoyés)"""
+    df = pd.read_csv(DATA_DIR / 'spam.csv', encoding='latin-1')
+    df = df[['v1', 'v2']]
+    df.columns = ['label', 'message']
+    
+    X_train, X_test, y_train, y_test = train_test_split(
+        df['message'], df['label'].map({'ham': 0, 'spam': 1}),
+        test_size=MODEL_CONFIG['test_size'],
+        random_state=MODEL_CONFIG['random_state'],
+        stratify=df['label']
+    )
+    processor = TextProcessor()
+    return (processor.clean_batch(list(X_train)), np.asarray(y_train),
+            processor.clean_batch(list(X_test)), np.asarray(y_test))
+
+
+def evaluate(model, X_test, y_test):
+    """Accuracy et F1 sur le split de test"""
+    y_pred = model.model.predict(model.vectorizer.transform(X_test))
+    return accuracy_score(y_test, y_pred), f1_score(y_test, y_pred)
+
+
+def timed_train(model, X_train, y_train, warm_start):
+    """Durée d'un entraînement (secondes)"""
+    start = time.perf_counter()
+    if not model.train(X_train, y_train, warm_start=warm_start):
+        raise RuntimeError(f"Échec de l'entraînement ({model.algorithm})")
+    return time.perf_counter() - start
+
+
+def compare(algorithm, X_train, y_train, X_test, y_test, initial):
+    """Warm start et entraînement complet à partir du même modèle initial"""
+    cutoff = int(len(y_train) * initial)
+    
+    base = MLModel(algorithm)
+    initial_time = timed_train(base, X_train[:cutoff], y_train[:cutoff], warm_start=False)
+    
+    warm = copy.deepcopy(base)
+    warm_time = timed_train(warm, X_train, y_train, warm_start=True)
+    warm_acc, warm_f1 = evaluate(warm, X_test, y_test)
+    
+    # Référence : nouveau vectorizer et nouvel estimateur sur toute l'archive
+    cold = MLModel(algorithm)
+    cold_time = timed_train(cold, X_train, y_train, warm_start=False)
+    cold_acc, cold_f1 = evaluate(cold, X_test, y_test)
+    
+    return {
+        'initial_samples': cutoff,
+        'new_samples': len(y_train) - cutoff,
+        'initial_time_s': initial_time,
+        'warm_time_s': warm_time,
+        'cold_time_s': cold_time,
+        'speedup': cold_time / warm_time if warm_time else None,
+        'warm_accuracy': warm_acc,
+        'cold_accuracy': cold_acc,
+        'accuracy_delta': warm_acc - cold_acc,
+        'warm_f1': warm_f1,
+        'cold_f1': cold_f1,
+        'f1_delta': warm_f1 - cold_f1
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--initial', type=float, default=0.8,
+                        help="Part de l'archive apprise lors de l'entraînement initial")
+    parser.add_argument('--algorithms', nargs='+', default=list(MLModel.ALGORITHMS),
+                        choices=list(MLModel.ALGORITHMS))
+    args = parser.parse_args()
+    
+    print("="*60)
+    print("🔁 RÉENTRAÎNEMENT INCRÉMENTAL VS COMPLET")
+    print("="*60 + "\n")
+    
+    X_train, y_train, X_test, y_test = load_split()
+    report = {
+        'initial_fraction': args.initial,
+        'train_size': len(y_train),
+        'test_size': len(y_test),
+        'replay_size': MODEL_CONFIG['replay_size']
+    }
+    
+    for algorithm in args.algorithms:
+        result = compare(algorithm, X_train, y_train, X_test, y_test, args.initial)
+        report[algorithm] = result
+        print(f"{algorithm:<20} warm={result['warm_time_s']*1000:7.1f} ms  "
+              f"complet={result['cold_time_s']*1000:7.1f} ms  "
+              f"Δacc={result['accuracy_delta']*100:+.2f}%  "
+              f"ΔF1={result['f1_delta']*100:+.2f}%")
+    
+    output_path = REPORTS_DIR / 'warm_start_report.json'
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Rapport sauvegardé : {output_path}")
+
+
+if __name__ == "__main__":
+    main()
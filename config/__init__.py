@@ -6,6 +6,25 @@ from .settings import *
 
 __all__ = [
     'MODEL_CONFIG',
+    'ONLINE_LEARNING_CONFIG',
+    'CASCADE_CONFIG',
+    'HOT_RELOAD_CONFIG',
+    'PREFILTER_CONFIG',
+    'NEAR_DUPLICATE_CONFIG',
+    'VERDICT_CACHE_CONFIG',
+    'ASYNC_BATCH_CONFIG',
+    'SHADOW_CONFIG',
+    'MODEL_CACHE_CONFIG',
+    'REGISTRY_CONFIG',
+    'MODEL_SELECTION_CONFIG',
+    'PIPELINE_CONFIG',
+    'STREAMING_CONFIG',
+    'EVALUATION_CONFIG',
+    'SEARCH_CONFIG',
+    'HISTORY_TRAINING_CONFIG',
+    'RETRAIN_CONFIG',
+    'SYNTHETIC_CONFIG',
+    'SCALABILITY_CONFIG',
     'DATABASE_CONFIG',
     'LOGGING_CONFIG',
     'UI_CONFIG',
@@ -24,7 +24,200 @@ MODEL_CONFIG = {
     'max_features': 3000,
     'test_size': 0.2,
     'random_state': 42,
-    'min_accuracy': 0.95  # Seuil minimum accepté
+    'min_accuracy': 0.95,  # Seuil minimum accepté
+    'explain_top_k': 5,  # Tokens affichés par sens dans l'explication (0 = désactivé)
+    'replay_size': 10000,  # Exemples de l'archive rejoués lors d'un réentraînement incrémental
+    'warm_f1_tolerance': 0.01  # Baisse de F1 tolérée avant de réapprendre toute l'archive
+}
+
+# Configuration de l'apprentissage en ligne (corrections utilisateur)
+ONLINE_LEARNING_CONFIG = {
+    'enabled': True,
+    'batch_size': 10,  # Corrections accumulées avant chaque partial_fit
+    'checkpoint_every': 5,  # Mises à jour entre deux sauvegardes du modèle
+    'max_pending': 1000  # Corrections gardées en mémoire (les autres restent en base)
+}
+
+# Configuration de la cascade de modèles (Naive Bayes puis modèle plus coûteux)
+CASCADE_CONFIG = {
+    'enabled': False,
+    'secondary_algorithm': 'logistic_regression',
+    # Bundle entraîné sur le vectorizer du modèle primaire (python train.py --cascade-secondary)
+    'secondary_model_path': MODELS_DIR / "spam_detector_lr.pkl",
+    'uncertainty_band': (0.2, 0.8)  # Probabilité spam déclenchant l'escalade
+}
+
+# Configuration du rechargement à chaud du modèle
+HOT_RELOAD_CONFIG = {
+    'bundle_path': MODELS_DIR / "spam_detector_bundle.pkl",
+    'watch_enabled': False,
+    'poll_interval': 5.0,  # secondes
+    'warmup_messages': [
+        "Congratulations! You've won a FREE prize! Call now to claim.",
+        "Hey, are we still meeting for lunch tomorrow?",
+        "URGENT! Your account has been suspended, verify your details."
+    ]
+}
+
+# Configuration du préfiltre des messages connus (dataset + historique)
+PREFILTER_CONFIG = {
+    'enabled': True,
+    'dataset_path': DATA_DIR / "spam.csv",
+    'bloom_capacity': 1_000_000,
+    'bloom_error_rate': 0.001
+}
+
+# Index des quasi-doublons (variantes d'une même campagne)
+NEAR_DUPLICATE_CONFIG = {
+    'enabled': True,
+    'capacity': 100_000,
+    'num_bands': 16,
+    'rows_per_band': 4,
+    'shingle_size': 5,
+    'similarity_threshold': 0.7,
+    'index_path': DB_DIR / "near_duplicates.npz"
+}
+
+# Cache des verdicts du modèle principal (messages répétés)
+VERDICT_CACHE_CONFIG = {
+    'enabled': True,
+    'max_entries': 50_000,  # Au-delà, les verdicts les moins récemment utilisés sont évincés
+    'ttl_seconds': 3600  # Durée de vie d'un verdict (None : illimitée)
+}
+
+# Micro-lots de PredictionService.predict_async
+ASYNC_BATCH_CONFIG = {
+    'max_batch_size': 64,
+    'max_wait_ms': 10,  # Attente maximale d'un lot incomplet (trafic soutenu)
+    'smoothing': 0.2  # Poids d'un nouvel intervalle entre requêtes dans la moyenne mobile
+}
+
+# Mode shadow : modèle challenger évalué sur le trafic réel
+SHADOW_CONFIG = {
+    'enabled': False,
+    'bundle_path': MODELS_DIR / "spam_detector_challenger.pkl",
+    'queue_size': 1000,  # Au-delà, les messages ne sont pas scorés par le challenger
+    'batch_size': 32  # Verdicts écrits en base par lot
+}
+
+# Modèles par client ou par langue, chargés à la demande
+MODEL_CACHE_CONFIG = {
+    'bundle_dir': MODELS_DIR / "tenants",  # Un bundle <identifiant>.pkl par modèle
+    'memory_budget_mb': 512  # Au-delà, les modèles les moins récemment utilisés sont évincés
+}
+
+# Registre des modèles (table models)
+REGISTRY_CONFIG = {
+    'registry_dir': MODELS_DIR / "registry",
+    'keep_models': 5,  # Modèles récents conservés par le nettoyage
+    'rollback_depth': 3  # Activations précédentes toujours conservées
+}
+
+# Pipeline d'entraînement par étapes (training.pipeline)
+PIPELINE_CONFIG = {
+    'data_path': DATA_DIR / "spam.csv",
+    'cache_dir': MODELS_DIR / "pipeline_cache",
+    'bundle_path': MODELS_DIR / "spam_detector_pipeline.pkl"
+}
+
+# Entraînement en flux, hors mémoire (training.streaming)
+STREAMING_CONFIG = {
+    'data_path': DATA_DIR / "spam.csv",
+    'chunk_size': 10_000,  # Lignes lues et apprises par bloc
+    'n_features': 2 ** 18,  # Dimension du HashingVectorizer
+    'holdout_size': 2000,  # Réservoir d'évaluation échantillonné dans le flux
+    'bundle_path': MODELS_DIR / "spam_detector_streaming.pkl"
+}
+
+# Rapports d'évaluation sans affichage (training.evaluation)
+EVALUATION_CONFIG = {
+    'output_dir': REPORTS_DIR / "evaluation",
+    'render_plots': True,  # Figures PNG (matplotlib importé seulement au rendu)
+    'curve_points': 200,  # Points conservés par courbe dans le JSON
+    'dpi': 100
+}
+
+# Corpus synthétiques pour les tests de charge (benchmarks.synthetic_corpus)
+SYNTHETIC_CONFIG = {
+    'source_path': DATA_DIR / "spam.csv",  # Corpus dont les statistiques de tokens sont reproduites
+    'size': 1_000_000,
+    'spam_ratio': None,  # None = part de spam du corpus source
+    'duplicate_rate': 0.05,  # Copies exactes d'un message récent
+    'near_duplicate_rate': 0.05,  # Copies avec un ou deux tokens remplacés
+    'length_scale': 1.0,  # Facteur sur les longueurs observées
+    'unigram_mix': 0.1,  # Part des tokens tirés hors bigrammes
+    'start': '2024-01-01',
+    'days': 365,  # Période couverte par les horodatages
+    'chunk_size': 50_000,
+    'seed': 42,
+    'output_dir': DATA_DIR / "synthetic"
+}
+
+# Entraînement sur l'historique des prédictions (training.history)
+HISTORY_TRAINING_CONFIG = {
+    'csv_path': DATA_DIR / "spam.csv",  # Jeu de données fusionné avec l'historique
+    'min_confidence': 0.95,  # Verdicts non corrigés retenus comme exemples
+    'batch_size': 5000,  # Lignes lues et nettoyées par lot
+    'dedup_capacity': 10_000_000,  # Messages distincts attendus (filtre de Bloom)
+    'dedup_error_rate': 0.001,
+    'bundle_path': MODELS_DIR / "spam_detector_history.pkl"
+}
+
+# Réentraînement en arrière-plan depuis l'interface (services.retrain_job)
+RETRAIN_CONFIG = {
+    'algorithm': None,  # None = MODEL_CONFIG['algorithm']
+    'use_csv': True,  # Fusionner data/spam.csv avec l'historique des prédictions
+    'hot_swap': True,  # Activer le nouveau modèle dès qu'il est enregistré
+    'output_dir': MODELS_DIR / "retrained",
+    'poll_interval_ms': 200,  # Intervalle de lecture de la progression par l'interface
+    'cancel_grace_s': 5  # Délai avant d'interrompre un processus qui n'a pas vu l'annulation
+}
+
+# Passage à l'échelle de l'entraînement (benchmarks.scalability)
+SCALABILITY_CONFIG = {
+    'min_size': 1_000,
+    'max_size': 1_000_000,  # Jusqu'à 10_000_000 sur une machine de réentraînement
+    'points_per_decade': 2,
+    'algorithms': ['naive_bayes', 'logistic_regression', 'svm'],
+    'max_features_grid': [3000, 10000],
+    'holdout_size': 20_000,  # Jeu de test fixe, commun à toutes les tailles
+    'time_budget_s': 600,  # Une série s'arrête dès qu'un entraînement dépasse cette durée
+    'seed': 42,
+    'report_path': REPORTS_DIR / "scalability_report.json",
+    'plot_path': REPORTS_DIR / "scalability.png"
+}
+
+# Recherche d'hyperparamètres par validation croisée (training.search)
+SEARCH_CONFIG = {
+    'data_path': DATA_DIR / "spam.csv",
+    'param_grid': {
+        'naive_bayes': {'alpha': [0.01, 0.03, 0.1, 0.3, 1.0]},
+        'logistic_regression': {'C': [0.3, 1.0, 3.0, 10.0, 30.0]},
+        'svm': {'C': [0.03, 0.1, 0.3, 1.0, 3.0]}
+    },
+    'max_features_grid': [1000, 3000, 5000, 10000],
+    'cv_folds': 5,
+    'scoring': 'f1',  # Nom de scorer scikit-learn
+    'halving_factor': 3,  # Part des configurations conservées à chaque tour : 1 / facteur
+    'min_samples': 500,  # Exemples d'apprentissage par fold au premier tour
+    'workers': None,  # Processus (None = nombre de cœurs)
+    'cache_dir': MODELS_DIR / "search_cache",  # Matrices des folds, réutilisées d'une recherche à l'autre
+    'bundle_path': MODELS_DIR / "spam_detector_tuned.pkl",
+    'report_path': REPORTS_DIR / "hyperparameter_search.json"
+}
+
+# Sélection de modèle (train.compare_models)
+MODEL_SELECTION_CONFIG = {
+    'max_features_grid': [1000, 3000, 5000, 10000],
+    'selection_metric': 'accuracy',  # Métrique maximisée parmi les candidats conformes au SLA
+    'latency_samples': 300,  # Messages prédits un par un pour les percentiles de latence
+    'workers': None,  # Processus d'évaluation en parallèle (None = nombre de cœurs)
+    'sla': {
+        'latency_p99_ms': 5.0,
+        'rss_mb': 300,  # Mémoire d'un processus qui sert le modèle
+        'artifact_mb': 20
+    },
+    'report_path': REPORTS_DIR / "model_selection_report.json"
 }
 
 # Configuration de la base de données
@@ -31,5 +31,5 @@ class AppController:
     def shutdown(self):
         """Arrêt propre de l'application"""
         logger.info("👋 Arrêt de l'application...")
-        # Cleanup si nécessaire
+        self.prediction_service.shutdown()
         logger.info("✅ Application arrêtée")
\ No newline at end of file
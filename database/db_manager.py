@@ -4,6 +4,7 @@ Gestionnaire de base de données SQLite
 """
 import sqlite3
 import json
+import threading
 from datetime import datetime
 from pathlib import Path
 import logging
@@ -15,10 +16,27 @@ class DatabaseManager:
     def __init__(self, db_path=None):
         """Initialise la connexion à la base de données"""
         self.db_path = db_path or DATABASE_CONFIG['db_path']
-        self.conn = None
-        self.cursor = None
+        # Connexion et curseur propres à chaque thread : le service partage
+        # cette instance avec ses threads (rechargement, réentraînement, micro-lots)
+        self._local = threading.local()
         self._create_tables()
     
+    @property
+    def conn(self):
+        return getattr(self._local, 'conn', None)
+    
+    @conn.setter
+    def conn(self, value):
+        self._local.conn = value
+    
+    @property
+    def cursor(self):
+        return getattr(self._local, 'cursor', None)
+    
+    @cursor.setter
+    def cursor(self, value):
+        self._local.cursor = value
+    
     def connect(self):
         """Établit la connexion à la base de données"""
         try:
@@ -80,7 +98,29 @@ class DatabaseManager:
                 f1_score REAL NOT NULL,
                 training_date DATETIME NOT NULL,
                 is_active INTEGER DEFAULT 0,
-                metadata TEXT
+                metadata TEXT,
+                bundle_path TEXT
+            )
+        ''')
+        
+        # Bases créées avant l'ajout du chemin du bundle
+        columns = [row['name'] for row in self.cursor.execute('PRAGMA table_info(models)')]
+        if 'bundle_path' not in columns:
+            self.cursor.execute('ALTER TABLE models ADD COLUMN bundle_path TEXT')
+        
+        # Empreinte du nettoyage ayant produit cleaned_message (réutilisation à l'entraînement)
+        columns = [row['name'] for row in self.cursor.execute('PRAGMA table_info(predictions)')]
+        if 'cleaner_version' not in columns:
+            self.cursor.execute('ALTER TABLE predictions ADD COLUMN cleaner_version TEXT')
+        
+        # Historique des activations (pour le retour arrière)
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS model_activations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                model_version TEXT NOT NULL,
+                rolled_back INTEGER DEFAULT 0,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (model_version) REFERENCES models(version)
             )
         ''')
         
@@ -93,6 +133,36 @@ class DatabaseManager:
             )
         ''')
         
+        # Table des corrections utilisateur (apprentissage en ligne)
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS feedback (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                prediction_id INTEGER NOT NULL,
+                correct_label INTEGER NOT NULL,
+                applied INTEGER DEFAULT 0,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (prediction_id) REFERENCES predictions(id)
+            )
+        ''')
+        
+        # Table des verdicts du modèle challenger (mode shadow)
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS shadow_predictions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                prediction_id INTEGER,
+                primary_version TEXT NOT NULL,
+                challenger_version TEXT NOT NULL,
+                primary_prediction INTEGER NOT NULL,
+                primary_spam_probability REAL NOT NULL,
+                primary_latency_ms REAL,
+                prediction INTEGER NOT NULL,
+                spam_probability REAL NOT NULL,
+                latency_ms REAL NOT NULL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (prediction_id) REFERENCES predictions(id)
+            )
+        ''')
+        
         # Table des logs d'erreurs
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS error_logs (
@@ -108,30 +178,70 @@ class DatabaseManager:
         logger.info("✅ Tables de la base de données créées/vérifiées")
     
     def add_prediction(self, message, cleaned_message, prediction, 
-                      confidence, ham_prob, spam_prob, model_version='2.0.0'):
+                      confidence, ham_prob, spam_prob, model_version='2.0.0',
+                      cleaner_version=None):
         """Ajoute une prédiction à l'historique"""
         try:
             self.connect()
             self.cursor.execute('''
                 INSERT INTO predictions 
                 (message, cleaned_message, prediction, confidence, 
-                 ham_probability, spam_probability, model_version)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                 ham_probability, spam_probability, model_version, cleaner_version)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ''', (message, cleaned_message, prediction, confidence, 
-                  ham_prob, spam_prob, model_version))
+                  ham_prob, spam_prob, model_version, cleaner_version))
+            # Lu avant la mise à jour des statistiques, qui réutilise le curseur
+            prediction_id = self.cursor.lastrowid
             self.conn.commit()
             
             # Mettre à jour les statistiques
             self._update_daily_stats()
             
             logger.info(f"✅ Prédiction enregistrée: {prediction}")
-            return self.cursor.lastrowid
+            return prediction_id
         except sqlite3.Error as e:
             logger.error(f"❌ Erreur lors de l'enregistrement: {e}")
             return None
         finally:
             self.close()
     
+    def add_predictions(self, rows):
+        """
+        Ajoute plusieurs prédictions à l'historique, en une seule transaction
+        
+        Args:
+            rows (list): Tuples (message, cleaned_message, prediction, confidence,
+                         ham_prob, spam_prob, model_version, cleaner_version)
+        
+        Returns:
+            list: Identifiants des lignes insérées (None partout en cas d'erreur)
+        """
+        if not rows:
+            return []
+        try:
+            self.connect()
+            ids = []
+            for row in rows:
+                self.cursor.execute('''
+                    INSERT INTO predictions 
+                    (message, cleaned_message, prediction, confidence, 
+                     ham_probability, spam_probability, model_version, cleaner_version)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', row)
+                ids.append(self.cursor.lastrowid)
+            self.conn.commit()
+            
+            self._update_daily_stats()
+            
+            logger.info(f"✅ {len(ids)} prédictions enregistrées")
+            return ids
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            logger.error(f"❌ Erreur lors de l'enregistrement: {e}")
+            return [None] * len(rows)
+        finally:
+            self.close()
+    
     def get_predictions(self, limit=50, offset=0):
         """Récupère l'historique des prédictions"""
         try:
@@ -149,6 +259,247 @@ class DatabaseManager:
         finally:
             self.close()
     
+    def get_prediction(self, prediction_id):
+        """Récupère une prédiction par son identifiant"""
+        try:
+            self.connect()
+            self.cursor.execute('SELECT * FROM predictions WHERE id = ?', (prediction_id,))
+            result = self.cursor.fetchone()
+            return dict(result) if result else None
+        except sqlite3.Error as e:
+            logger.error(f"❌ Erreur lors de la récupération: {e}")
+            return None
+        finally:
+            self.close()
+    
+    def add_feedback(self, prediction_id, correct_label):
+        """Enregistre la correction d'une prédiction par l'utilisateur"""
+        try:
+            self.connect()
+            self.cursor.execute('''
+                INSERT INTO feedback (prediction_id, correct_label)
+                VALUES (?, ?)
+            ''', (prediction_id, correct_label))
+            self.conn.commit()
+            logger.info(f"✅ Correction enregistrée pour la prédiction {prediction_id}")
+            return self.cursor.lastrowid
+        except sqlite3.Error as e:
+            logger.error(f"❌ Erreur enregistrement correction: {e}")
+            return None
+        finally:
+            self.close()
+    
+    def get_pending_feedback(self, limit=None):
+        """
+        Récupère les corrections non encore intégrées au modèle sauvegardé
+        
+        Args:
+            limit (int): Ne garder que les plus récentes (par défaut, toutes)
+        
+        Returns:
+            list: Corrections, de la plus ancienne à la plus récente
+        """
+        try:
+            self.connect()
+            self.cursor.execute('''
+                SELECT f.id, f.prediction_id, f.correct_label,
+                       p.message, p.cleaned_message
+                FROM feedback f
+                JOIN predictions p ON p.id = f.prediction_id
+                WHERE f.applied = 0
+                ORDER BY f.id DESC
+                LIMIT ?
+            ''', (-1 if limit is None else limit,))
+            results = self.cursor.fetchall()
+            return [dict(row) for row in reversed(results)]
+        except sqlite3.Error as e:
+            logger.error(f"❌ Erreur récupération corrections: {e}")
+            return []
+        finally:
+            self.close()
+    
+    def mark_feedback_applied(self, feedback_ids):
+        """Marque des corrections comme intégrées au modèle sauvegardé"""
+        if not feedback_ids:
+            return 0
+        try:
+            self.connect()
+            self.cursor.executemany(
+                'UPDATE feedback SET applied = 1 WHERE id = ?',
+                [(feedback_id,) for feedback_id in feedback_ids]
+            )
+            self.conn.commit()
+            return len(feedback_ids)
+        except sqlite3.Error as e:
+            logger.error(f"❌ Erreur mise à jour corrections: {e}")
+            return 0
+        finally:
+            self.close()
+    
+    def iter_labeled_messages(self, batch_size=1000):
+        """
+        Parcourt les messages déjà classés, avec la correction utilisateur
+        la plus récente si elle existe
+        
+        Utilise sa propre connexion pour ne pas interférer avec les autres
+        appels pendant le parcours.
+        
+        Yields:
+            dict: message, prediction, spam_probability, correct_label
+        """
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.execute('''
+                SELECT p.message, p.prediction, p.spam_probability,
+                       (SELECT f.correct_label FROM feedback f
+                        WHERE f.prediction_id = p.id
+                        ORDER BY f.id DESC LIMIT 1) AS correct_label
+                FROM predictions p
+            ''')
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+        except sqlite3.Error as e:
+            logger.error(f"❌ Erreur parcours des prédictions: {e}")
+        finally:
+            conn.close()
+    
+    def iter_training_rows(self, corrected, min_confidence=0.0, batch_size=1000):
+        """
+        Parcourt les prédictions utilisables comme exemples d'entraînement
+        
+        Comme iter_labeled_messages, la lecture se fait par lots (fetchmany)
+        sur une connexion dédiée : la mémoire ne dépend pas de la taille de
+        la table.
+        
+        Args:
+            corrected (bool): True : messages corrigés par l'utilisateur (label
+                              = dernière correction), les plus récemment
+                              corrigés d'abord ; False : verdicts non
+                              corrigés dont la confiance atteint min_confidence
+            min_confidence (float): Confiance minimale d'un verdict non corrigé
+            batch_size (int): Lignes lues par lot
+        
+        Yields:
+            dict: id, message, cleaned_message, cleaner_version, label
+        """
+        if corrected:
+            query = '''
+                SELECT p.id, p.message, p.cleaned_message, p.cleaner_version,
+                       f.correct_label AS label
+                FROM predictions p
+                JOIN feedback f ON f.id = (
+                    SELECT MAX(id) FROM feedback WHERE prediction_id = p.id
+                )
+                ORDER BY f.id DESC
+            '''
+            params = ()
+        else:
+            query = '''
+                SELECT p.id, p.message, p.cleaned_message, p.cleaner_version,
+                       p.prediction AS label
+                FROM predictions p
+                WHERE p.confidence >= ?
+                  AND NOT EXISTS (SELECT 1 FROM feedback f WHERE f.prediction_id = p.id)
+                ORDER BY p.id
+            '''
+            params = (min_confidence,)
+        
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+        except sqlite3.Error as e:
+            logger.error(f"❌ Erreur parcours des exemples d'entraînement: {e}")
+        finally:
+            conn.close()
+    
+    def add_shadow_predictions(self, rows):
+        """
+        Enregistre un lot de verdicts du modèle challenger
+        
+        Args:
+            rows (list): Tuples (prediction_id, primary_version, challenger_version,
+                         primary_prediction, primary_spam_probability,
+                         primary_latency_ms, prediction, spam_probability, latency_ms)
+        """
+        if not rows:
+            return 0
+        try:
+            self.connect()
+            self.cursor.executemany('''
+                INSERT INTO shadow_predictions
+                (prediction_id, primary_version, challenger_version, primary_prediction,
+                 primary_spam_probability, primary_latency_ms, prediction,
+                 spam_probability, latency_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            self.conn.commit()
+            return len(rows)
+        except sqlite3.Error as e:
+            logger.error(f"❌ Erreur enregistrement shadow: {e}")
+            return 0
+        finally:
+            self.close()
+    
+    def get_shadow_report(self, challenger_version=None):
+        """
+        Compare le modèle challenger au modèle principal
+        
+        Les corrections utilisateur servent de vérité terrain quand elles existent.
+        
+        Returns:
+            list: Une ligne par couple (version principale, version challenger)
+        """
+        try:
+            self.connect()
+            self.cursor.execute('''
+                SELECT
+                    s.primary_version,
+                    s.challenger_version,
+                    COUNT(*) as total,
+                    AVG(CASE WHEN s.prediction = s.primary_prediction THEN 1.0 ELSE 0.0 END)
+                        as agreement_rate,
+                    SUM(CASE WHEN s.primary_prediction = 0 AND s.prediction = 1 THEN 1 ELSE 0 END)
+                        as ham_to_spam,
+                    SUM(CASE WHEN s.primary_prediction = 1 AND s.prediction = 0 THEN 1 ELSE 0 END)
+                        as spam_to_ham,
+                    AVG(ABS(s.spam_probability - s.primary_spam_probability)) as avg_probability_gap,
+                    AVG(s.primary_latency_ms) as primary_avg_latency_ms,
+                    AVG(s.latency_ms) as challenger_avg_latency_ms,
+                    COUNT(f.correct_label) as labeled,
+                    AVG(CASE WHEN f.correct_label IS NULL THEN NULL
+                             WHEN s.primary_prediction = f.correct_label THEN 1.0 ELSE 0.0 END)
+                        as primary_accuracy,
+                    AVG(CASE WHEN f.correct_label IS NULL THEN NULL
+                             WHEN s.prediction = f.correct_label THEN 1.0 ELSE 0.0 END)
+                        as challenger_accuracy
+                FROM shadow_predictions s
+                LEFT JOIN feedback f ON f.id = (
+                    SELECT MAX(id) FROM feedback WHERE prediction_id = s.prediction_id
+                )
+                WHERE ? IS NULL OR s.challenger_version = ?
+                GROUP BY s.primary_version, s.challenger_version
+                ORDER BY MAX(s.id) DESC
+            ''', (challenger_version, challenger_version))
+            results = self.cursor.fetchall()
+            return [dict(row) for row in results]
+        except sqlite3.Error as e:
+            logger.error(f"❌ Erreur rapport shadow: {e}")
+            return []
+        finally:
+            self.close()
+    
     def get_statistics(self, days=7):
         """Récupère les statistiques sur N jours"""
         try:
@@ -215,17 +566,18 @@ class DatabaseManager:
             logger.error(f"❌ Erreur mise à jour stats: {e}")
     
     def add_model_info(self, version, algorithm, accuracy, precision, 
-                      recall, f1, metadata=None):
+                      recall, f1, metadata=None, bundle_path=None):
         """Enregistre les informations d'un modèle"""
         try:
             self.connect()
             self.cursor.execute('''
                 INSERT INTO models 
                 (version, algorithm, accuracy, precision_score, recall_score, 
-                 f1_score, training_date, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                 f1_score, training_date, metadata, bundle_path)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (version, algorithm, accuracy, precision, recall, f1,
-                  datetime.now(), json.dumps(metadata) if metadata else None))
+                  datetime.now(), json.dumps(metadata) if metadata else None,
+                  str(bundle_path) if bundle_path else None))
             self.conn.commit()
             logger.info(f"✅ Modèle {version} enregistré")
             return True
@@ -235,6 +587,129 @@ class DatabaseManager:
         finally:
             self.close()
     
+    def get_models(self):
+        """Récupère les modèles enregistrés, du plus récent au plus ancien"""
+        try:
+            self.connect()
+            self.cursor.execute('''
+                SELECT m.*,
+                       (SELECT MAX(a.timestamp) FROM model_activations a
+                        WHERE a.model_version = m.version) AS last_activated
+                FROM models m
+                ORDER BY m.training_date DESC, m.id DESC
+            ''')
+            return [dict(row) for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            logger.error(f"❌ Erreur récupération modèles: {e}")
+            return []
+        finally:
+            self.close()
+    
+    def get_model_info(self, version):
+        """Récupère un modèle enregistré par sa version"""
+        try:
+            self.connect()
+            self.cursor.execute('SELECT * FROM models WHERE version = ?', (version,))
+            result = self.cursor.fetchone()
+            return dict(result) if result else None
+        except sqlite3.Error as e:
+            logger.error(f"❌ Erreur récupération modèle: {e}")
+            return None
+        finally:
+            self.close()
+    
+    def get_active_model(self):
+        """Récupère le modèle actif"""
+        try:
+            self.connect()
+            self.cursor.execute('SELECT * FROM models WHERE is_active = 1 LIMIT 1')
+            result = self.cursor.fetchone()
+            return dict(result) if result else None
+        except sqlite3.Error as e:
+            logger.error(f"❌ Erreur récupération modèle actif: {e}")
+            return None
+        finally:
+            self.close()
+    
+    def set_active_model(self, version, record=True):
+        """
+        Active un modèle (et désactive les autres) dans une seule transaction
+        
+        Args:
+            version (str): Version à activer
+            record (bool): Ajouter l'activation à l'historique (False pour un retour arrière)
+        """
+        try:
+            self.connect()
+            self.cursor.execute('UPDATE models SET is_active = 0 WHERE is_active = 1')
+            self.cursor.execute('UPDATE models SET is_active = 1 WHERE version = ?', (version,))
+            if self.cursor.rowcount != 1:
+                self.conn.rollback()
+                logger.error(f"❌ Modèle {version} inconnu")
+                return False
+            if record:
+                self.cursor.execute(
+                    'INSERT INTO model_activations (model_version) VALUES (?)', (version,)
+                )
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"❌ Erreur activation modèle: {e}")
+            return False
+        finally:
+            self.close()
+    
+    def get_activation_history(self, include_rolled_back=False):
+        """Récupère les activations, de la plus récente à la plus ancienne"""
+        try:
+            self.connect()
+            self.cursor.execute('''
+                SELECT a.id, a.model_version, a.rolled_back, a.timestamp, m.bundle_path
+                FROM model_activations a
+                JOIN models m ON m.version = a.model_version
+                WHERE ? OR a.rolled_back = 0
+                ORDER BY a.id DESC
+            ''', (int(include_rolled_back),))
+            return [dict(row) for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            logger.error(f"❌ Erreur historique des activations: {e}")
+            return []
+        finally:
+            self.close()
+    
+    def mark_activation_rolled_back(self, activation_id):
+        """Marque une activation comme annulée"""
+        try:
+            self.connect()
+            self.cursor.execute(
+                'UPDATE model_activations SET rolled_back = 1 WHERE id = ?', (activation_id,)
+            )
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"❌ Erreur retour arrière: {e}")
+            return False
+        finally:
+            self.close()
+    
+    def delete_model_info(self, version):
+        """Supprime un modèle du registre (et son historique d'activation)"""
+        try:
+            self.connect()
+            # Le modèle actif n'est jamais supprimé, ni son historique
+            self.cursor.execute('DELETE FROM models WHERE version = ? AND is_active = 0', (version,))
+            if self.cursor.rowcount != 1:
+                self.conn.rollback()
+                return False
+            self.cursor.execute('DELETE FROM model_activations WHERE model_version = ?', (version,))
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"❌ Erreur suppression modèle: {e}")
+            return False
+        finally:
+            self.close()
+    
     def log_error(self, error_type, error_message, stack_trace=None):
         """Enregistre une erreur"""
         try:
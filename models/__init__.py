@@ -4,5 +4,19 @@ Package des modèles ML
 """
 from .ml_model import MLModel
 from .text_processor import TextProcessor
+from .cascade import ModelCascade
+from .linear_svm import CalibratedLinearSVC
+from .quantized import QuantizedModel, QuantizedVectorizer
+from .model_cache import ModelCache
+from .prediction_result import PredictionResult
 
-__all__ = ['MLModel', 'TextProcessor']
\ No newline at end of file
+__all__ = [
+    'MLModel',
+    'TextProcessor',
+    'ModelCascade',
+    'CalibratedLinearSVC',
+    'QuantizedModel',
+    'QuantizedVectorizer',
+    'ModelCache',
+    'PredictionResult'
+]
\ No newline at end of file
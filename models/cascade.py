@@ -0,0 +1,167 @@
+# models/cascade.py
+"""
+Cascade de modèles : modèle rapide d'abord, modèle coûteux en cas de doute
+"""
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ModelCascade:
+    """Combine un modèle primaire rapide et un modèle secondaire plus précis"""
+    
+    def __init__(self, primary, secondary, uncertainty_band=(0.2, 0.8)):
+        """
+        Initialise la cascade
+        
+        Args:
+            primary (MLModel): Modèle rapide (Naive Bayes) qui score tout
+            secondary (MLModel): Modèle coûteux, partageant le vectorizer du primaire
+            uncertainty_band (tuple): Bornes (basse, haute) de probabilité spam
+                                      déclenchant l'escalade
+        """
+        self.primary = primary
+        self.secondary = secondary
+        self.uncertainty_band = uncertainty_band
+        self.reset_stats()
+        
+        logger.info(f"🪜 Cascade {primary.algorithm} -> {secondary.algorithm} "
+                    f"(bande {uncertainty_band[0]:.2f}-{uncertainty_band[1]:.2f})")
+    
+    def reset_stats(self):
+        """Réinitialise les compteurs"""
+        self.stats = {
+            'total': 0,
+            'escalated': 0,
+            'primary_time': 0.0,
+            'secondary_time': 0.0
+        }
+    
+    def is_uncertain(self, spam_probability):
+        """Indique si une probabilité tombe dans la bande d'incertitude"""
+        low, high = self.uncertainty_band
+        return low <= spam_probability <= high
+    
+    def predict(self, message, return_vector=False):
+        """
+        Prédit avec escalade éventuelle vers le modèle secondaire
+        
+        Args:
+            message (str): Message à analyser
+            return_vector (bool): Retourner aussi la ligne TF-IDF calculée
+        
+        Returns:
+            PredictionResult: Résultat de la prédiction, avec le tier utilisé (tuple
+                  (résultat, ligne TF-IDF) si return_vector)
+        """
+        try:
+            start = time.perf_counter()
+            cleaned, vectorized = self.primary.vectorize(message)
+            
+            if vectorized is None:
+                result = self.primary.build_result(message, cleaned, None)
+                result['tier'] = 'primary'
+                return (result, None) if return_vector else result
+            
+            probabilities = self.primary.predict_vector(vectorized)
+            primary_done = time.perf_counter()
+            
+            self.stats['total'] += 1
+            self.stats['primary_time'] += primary_done - start
+            tier = 'primary'
+            explainer = self.primary
+            
+            if self.is_uncertain(probabilities[1]):
+                # Même ligne vectorisée, aucun re-nettoyage
+                probabilities = self.secondary.predict_vector(vectorized)
+                self.stats['escalated'] += 1
+                self.stats['secondary_time'] += time.perf_counter() - primary_done
+                tier = 'secondary'
+                explainer = self.secondary
+            
+            result = self.primary.build_result(message, cleaned, probabilities, vectorized,
+                                               explainer=explainer)
+            result['tier'] = tier
+            if tier == 'secondary':
+                result['model_version'] = self.secondary.version
+            return (result, vectorized) if return_vector else result
+        
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de la prédiction en cascade: {e}")
+            return (None, None) if return_vector else None
+    
+    def predict_batch(self, messages, return_vectors=False):
+        """
+        Prédit pour plusieurs messages : le primaire score tout le lot, le
+        secondaire les seules lignes incertaines, elles aussi en un passage
+        
+        Args:
+            messages (list): Liste de messages
+            return_vectors (bool): Retourner aussi la ligne TF-IDF de chaque message
+        
+        Returns:
+            list: Résultats avec le tier utilisé (tuple (résultats, lignes TF-IDF
+                  ou None) si return_vectors)
+        """
+        failed = [None] * len(messages)
+        try:
+            start = time.perf_counter()
+            cleaned, rows, vectorized = self.primary.vectorize_batch(messages)
+            results = [None if text else self.primary.build_result(msg, text, None)
+                       for msg, text in zip(messages, cleaned)]
+            vectors = [None] * len(messages)
+            for result in results:
+                if result is not None:
+                    result['tier'] = 'primary'
+            if not rows:
+                return (results, vectors) if return_vectors else results
+            
+            probabilities = self.primary.model.predict_proba(vectorized)
+            primary_done = time.perf_counter()
+            self.stats['total'] += len(rows)
+            self.stats['primary_time'] += primary_done - start
+            
+            escalated = [position for position, spam in enumerate(probabilities[:, 1])
+                         if self.is_uncertain(spam)]
+            if escalated:
+                # Mêmes lignes vectorisées, aucun re-nettoyage
+                probabilities[escalated] = self.secondary.model.predict_proba(vectorized[escalated])
+                self.stats['escalated'] += len(escalated)
+                self.stats['secondary_time'] += time.perf_counter() - primary_done
+            escalated = set(escalated)
+            
+            for position, i in enumerate(rows):
+                secondary = position in escalated
+                results[i] = self.primary.build_result(
+                    messages[i], cleaned[i], probabilities[position], vectorized, position,
+                    explainer=self.secondary if secondary else self.primary
+                )
+                results[i]['tier'] = 'secondary' if secondary else 'primary'
+                if secondary:
+                    results[i]['model_version'] = self.secondary.version
+                if return_vectors:
+                    vectors[i] = vectorized[position:position + 1]
+            return (results, vectors) if return_vectors else results
+        
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de la prédiction en cascade par lot: {e}")
+            return (failed, failed) if return_vectors else failed
+    
+    def get_stats(self):
+        """
+        Retourne les statistiques de la cascade
+        
+        Returns:
+            dict: Taux d'escalade et latence moyenne ajoutée par chaque tier (ms)
+        """
+        total = self.stats['total']
+        escalated = self.stats['escalated']
+        return {
+            'total': total,
+            'escalated': escalated,
+            'escalation_rate': escalated / total if total else 0.0,
+            'primary_avg_ms': self.stats['primary_time'] / total * 1000 if total else 0.0,
+            'secondary_avg_ms': (self.stats['secondary_time'] / escalated * 1000
+                                 if escalated else 0.0),
+            'uncertainty_band': self.uncertainty_band
+        }
@@ -0,0 +1,124 @@
+# models/linear_svm.py
+"""
+SVM linéaire (solveur primal) avec calibration sigmoïde séparée
+"""
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import minimize
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold, cross_val_predict
+from sklearn.svm import LinearSVC
+
+class CalibratedLinearSVC(ClassifierMixin, BaseEstimator):
+    """
+    Remplaçant de SVC(kernel='linear', probability=True)
+    
+    LinearSVC (liblinear) est entraîné une seule fois sur toutes les
+    données ; la calibration de Platt est ajustée à part sur des scores
+    hors-fold. L'inférence se réduit à un produit creux et une sigmoïde.
+    
+    Avec warm_start, les coefficients d'un nouvel entraînement partent des
+    coefficients actuels. liblinear n'acceptant pas de point de départ, le
+    même problème primal (hinge au carré, pénalité L2 y compris sur
+    l'intercept) est alors résolu par Newton-CG.
+    """
+    
+    def __init__(self, C=1.0, calibration_folds=3, max_iter=2000, random_state=42,
+                 warm_start=False):
+        self.C = C
+        self.calibration_folds = calibration_folds
+        self.max_iter = max_iter
+        self.random_state = random_state
+        self.warm_start = warm_start
+    
+    def __setstate__(self, state):
+        # Modèles sauvegardés avant l'ajout de warm_start
+        state.setdefault('warm_start', False)
+        super().__setstate__(state)
+    
+    def _make_svm(self):
+        return LinearSVC(C=self.C, max_iter=self.max_iter, dual='auto')
+    
+    def _fit_primal(self, X, y, sample_weight):
+        """
+        Minimise 0.5 (||w||² + b²) + C Σ s_i max(0, 1 - y_i (x_i.w + b))²
+        par Newton-CG, à partir des coefficients actuels
+        
+        Returns:
+            tuple: (coef_ (1, n_features), intercept_ (1,))
+        """
+        X = sp.csr_matrix(X)
+        signs = np.where(y == self.classes_[1], 1.0, -1.0)
+        weights = self.C * (sample_weight if sample_weight is not None else 1.0)
+        
+        def objective(theta):
+            w, b = theta[:-1], theta[-1]
+            margins = np.maximum(1.0 - signs * (X @ w + b), 0.0)
+            slope = -2.0 * weights * signs * margins
+            value = 0.5 * (w @ w + b * b) + np.sum(weights * margins ** 2)
+            return value, np.append(w + X.T @ slope, b + slope.sum())
+        
+        def hessian_product(theta, v):
+            # Hessienne généralisée : seuls les exemples dans la marge comptent
+            active = signs * (X @ theta[:-1] + theta[-1]) < 1.0
+            scaled = 2.0 * weights * active * (X @ v[:-1] + v[-1])
+            return np.append(v[:-1] + X.T @ scaled, v[-1] + scaled.sum())
+        
+        start = np.append(self.coef_[0], self.intercept_[0])
+        result = minimize(objective, start, jac=True, hessp=hessian_product,
+                          method='Newton-CG', options={'maxiter': self.max_iter})
+        return result.x[:-1].reshape(1, -1), result.x[-1:].copy()
+    
+    def fit(self, X, y, sample_weight=None):
+        """
+        Entraîne le SVM puis la calibration sigmoïde
+        
+        Args:
+            X: Matrice TF-IDF
+            y: Labels (0 = ham, 1 = spam)
+            sample_weight: Poids des exemples (optionnel)
+        """
+        y = np.asarray(y)
+        warm = self.warm_start and hasattr(self, 'coef_') and self.coef_.shape[1] == X.shape[1]
+        self.classes_ = np.unique(y)
+        params = {}
+        if sample_weight is not None:
+            params['sample_weight'] = np.asarray(sample_weight, dtype=np.float64)
+        
+        # Scores hors-fold pour ajuster la calibration sans sur-apprentissage
+        folds = StratifiedKFold(
+            n_splits=self.calibration_folds,
+            shuffle=True,
+            random_state=self.random_state
+        )
+        oof_scores = cross_val_predict(
+            self._make_svm(), X, y, cv=folds, method='decision_function', params=params
+        )
+        
+        calibrator = LogisticRegression(C=1e6)
+        calibrator.fit(oof_scores.reshape(-1, 1), y, **params)
+        self.calibration_ = (float(calibrator.coef_[0, 0]), float(calibrator.intercept_[0]))
+        
+        if warm:
+            self.coef_, self.intercept_ = self._fit_primal(X, y, params.get('sample_weight'))
+        else:
+            svm = self._make_svm().fit(X, y, **params)
+            self.coef_ = svm.coef_
+            self.intercept_ = svm.intercept_
+        self.n_features_in_ = X.shape[1]
+        return self
+    
+    def decision_function(self, X):
+        """Score brut du SVM"""
+        return np.asarray(X @ self.coef_[0]).ravel() + self.intercept_[0]
+    
+    def predict_proba(self, X):
+        """Probabilités [ham, spam] calibrées"""
+        a, b = self.calibration_
+        spam = 1.0 / (1.0 + np.exp(-(a * self.decision_function(X) + b)))
+        return np.column_stack([1.0 - spam, spam])
+    
+    def predict(self, X):
+        """Classe prédite"""
+        return self.classes_[(self.predict_proba(X)[:, 1] >= 0.5).astype(int)]
@@ -2,46 +2,105 @@
 """
 Module de gestion du modèle ML
 """
+import copy
+import hashlib
+import os
 import pickle
+import sys
 import numpy as np
+import scipy.sparse as sp
+from datetime import datetime
 from pathlib import Path
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.linear_model import LogisticRegression
-from sklearn.svm import SVC
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 import logging
 
-from config.settings import MODELS_DIR, MODEL_CONFIG
+from config.settings import MODELS_DIR, MODEL_CONFIG, APP_INFO
 from .text_processor import TextProcessor
+from .linear_svm import CalibratedLinearSVC
+from .quantized import QuantizedModel, QuantizedVectorizer, dequantize_columns
+from .prediction_result import PredictionResult
 
 logger = logging.getLogger(__name__)
 
+BUNDLE_FORMAT = 1
+
+def file_version(path):
+    """Version dérivée du contenu d'un fichier de modèle"""
+    with open(path, 'rb') as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    return f"{APP_INFO['version']}-{digest[:8]}"
+
+def feature_fingerprint(vectorizer):
+    """Empreinte du vocabulaire et des poids IDF d'un vectorizer"""
+    digest = hashlib.sha1(type(vectorizer).__name__.encode('utf-8'))
+    vocabulary = getattr(vectorizer, 'vocabulary_', None) or {}
+    for token, column in sorted(vocabulary.items()):
+        digest.update(f"{token}:{column};".encode('utf-8'))
+    idf = getattr(vectorizer, 'idf_', None)
+    if idf is not None:
+        digest.update(np.asarray(idf, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+def object_bytes(value, depth=3):
+    """Estimation de la mémoire d'un attribut d'estimateur (tableaux, vocabulaire)"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            sys.getsizeof(key) + object_bytes(item, depth - 1) for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(object_bytes(item, depth - 1) for item in value)
+    if depth > 0 and hasattr(value, '__dict__') and not isinstance(value, type):
+        return sum(object_bytes(item, depth - 1) for item in vars(value).values())
+    return sys.getsizeof(value)
+
 class MLModel:
     """Classe pour gérer le modèle de Machine Learning"""
     
     ALGORITHMS = {
         'naive_bayes': MultinomialNB,
         'logistic_regression': lambda: LogisticRegression(max_iter=1000),
-        'svm': lambda: SVC(kernel='linear', probability=True)
+        'svm': CalibratedLinearSVC
     }
     
-    def __init__(self, algorithm='naive_bayes'):
+    def __init__(self, algorithm='naive_bayes', max_features=None, params=None):
         """
         Initialise le modèle ML
         
         Args:
             algorithm (str): Type d'algorithme à utiliser
+            max_features (int): Taille du vocabulaire TF-IDF (par défaut, MODEL_CONFIG)
+            params (dict): Hyperparamètres de l'estimateur (ex. {'alpha': 0.1}, voir training.search)
         """
         self.algorithm = algorithm
+        self.max_features = max_features or MODEL_CONFIG['max_features']
+        self.params = dict(params or {})
         self.model = None
         self.vectorizer = None
         self.text_processor = TextProcessor()
         self.is_trained = False
         self.metrics = {}
+        self.online_updates = 0
+        self.base_version = APP_INFO['version']
+        # Réentraînement incrémental : exemples déjà appris (dans l'ordre
+        # d'arrivée) et échantillon rejoué pour les modèles linéaires
+        self.trained_samples = 0
+        self.replay = None
+        self._explainer = None
         
         logger.info(f"🤖 MLModel initialisé avec {algorithm}")
     
+    @property
+    def version(self):
+        """Version du modèle, suffixée par le nombre de mises à jour en ligne"""
+        if self.online_updates:
+            return f"{self.base_version}+u{self.online_updates}"
+        return self.base_version
+    
     def load_model(self, model_path=None, vectorizer_path=None):
         """
         Charge un modèle pré-entraîné
@@ -62,6 +121,7 @@ class MLModel:
             with open(vectorizer_path, 'rb') as f:
                 self.vectorizer = pickle.load(f)
             
+            self.base_version = file_version(model_path)
             self.is_trained = True
             logger.info(f"✅ Modèle chargé depuis {model_path}")
             return True
@@ -98,7 +158,121 @@ class MLModel:
             logger.error(f"❌ Erreur lors de la sauvegarde: {e}")
             return False
     
-    def train(self, X_train, y_train, X_test=None, y_test=None):
+    def load_bundle(self, bundle_path):
+        """
+        Charge un bundle (modèle + vectorizer + métadonnées dans un seul fichier)
+        
+        Args:
+            bundle_path (str): Chemin vers le bundle
+        """
+        try:
+            with open(bundle_path, 'rb') as f:
+                bundle = pickle.load(f)
+            
+            self.model = bundle['model']
+            self.vectorizer = bundle['vectorizer']
+            self.algorithm = bundle.get('algorithm', self.algorithm)
+            self.max_features = bundle.get('max_features', self.max_features)
+            self.params = bundle.get('params', {})
+            self.metrics = bundle.get('metrics', {})
+            self.base_version = bundle.get('version') or file_version(bundle_path)
+            self.online_updates = bundle.get('online_updates', 0)
+            self.trained_samples = bundle.get('trained_samples', 0)
+            self.replay = bundle.get('replay')
+            self.is_trained = True
+            logger.info(f"✅ Bundle {self.version} chargé depuis {bundle_path}")
+            return True
+        
+        except FileNotFoundError as e:
+            logger.error(f"❌ Bundle non trouvé: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"❌ Erreur lors du chargement du bundle: {e}")
+            return False
+    
+    def save_bundle(self, bundle_path, metadata=None):
+        """
+        Sauvegarde le modèle sous forme de bundle
+        
+        L'écriture passe par un fichier temporaire renommé ensuite, pour
+        qu'un lecteur concurrent ne voie jamais un bundle incomplet.
+        
+        Args:
+            bundle_path (str): Chemin de sauvegarde
+            metadata (dict): Métadonnées supplémentaires
+        """
+        try:
+            bundle = {
+                'format': BUNDLE_FORMAT,
+                'algorithm': self.algorithm,
+                'max_features': self.max_features,
+                'params': self.params,
+                'model': self.model,
+                'vectorizer': self.vectorizer,
+                'metrics': self.metrics,
+                'version': self.base_version,
+                'online_updates': self.online_updates,
+                'trained_samples': self.trained_samples,
+                'replay': self.replay,
+                'created_at': datetime.now().isoformat(),
+                'metadata': metadata or {}
+            }
+            
+            tmp_path = Path(f"{bundle_path}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(bundle, f)
+            os.replace(tmp_path, bundle_path)
+            
+            logger.info(f"✅ Bundle {self.version} sauvegardé dans {bundle_path}")
+            return True
+        
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de la sauvegarde du bundle: {e}")
+            return False
+    
+    def memory_footprint(self):
+        """
+        Estime la mémoire occupée par le modèle chargé
+        
+        Returns:
+            int: Octets (poids de l'estimateur, IDF et vocabulaire du vectorizer)
+        """
+        return object_bytes(self.model) + object_bytes(self.vectorizer)
+    
+    def quantize(self, dtype='int8'):
+        """
+        Retourne une copie du modèle dont les poids sont en précision réduite
+        
+        Args:
+            dtype (str): 'float16' ou 'int8' (avec échelle par classe)
+        
+        Returns:
+            MLModel: Modèle quantifié, utilisable comme l'original
+        """
+        quantized = copy.copy(self)
+        quantized.model = QuantizedModel.from_estimator(self.model, dtype)
+        quantized.vectorizer = QuantizedVectorizer.from_vectorizer(self.vectorizer, dtype)
+        quantized.base_version = f"{self.base_version}-{dtype}"
+        return quantized
+    
+    def export_quantized(self, bundle_path, dtype='int8'):
+        """
+        Exporte un bundle aux poids réduits (log-probabilités ou
+        coefficients, et IDF), rechargeable avec load_bundle
+        
+        Args:
+            bundle_path (str): Chemin de sauvegarde
+            dtype (str): 'float16' ou 'int8'
+        """
+        try:
+            quantized = self.quantize(dtype)
+        except ValueError as e:
+            logger.error(f"❌ Quantification impossible: {e}")
+            return False
+        
+        return quantized.save_bundle(bundle_path, metadata={'quantized': dtype})
+    
+    def train(self, X_train, y_train, X_test=None, y_test=None, warm_start=False):
         """
         Entraîne le modèle
         
@@ -107,29 +281,34 @@ class MLModel:
             y_train: Labels d'entraînement
             X_test: Données de test (optionnel)
             y_test: Labels de test (optionnel)
+            warm_start (bool): Repartir du modèle actuel et n'apprendre que les
+                               exemples ajoutés depuis le dernier entraînement ;
+                               X_train est alors l'archive complète, dans l'ordre
+                               d'arrivée, et le vectorizer n'est pas réappris
         """
         try:
-            logger.info(f"🚀 Début de l'entraînement ({self.algorithm})...")
-            
-            # Créer le vectorizer si nécessaire
-            if self.vectorizer is None:
-                self.vectorizer = TfidfVectorizer(
-                    max_features=MODEL_CONFIG['max_features']
-                )
-                X_train_vec = self.vectorizer.fit_transform(X_train)
-            else:
-                X_train_vec = self.vectorizer.transform(X_train)
+            y_train = np.asarray(y_train)
             
-            # Créer et entraîner le modèle
-            if self.algorithm in self.ALGORITHMS:
-                algo_class = self.ALGORITHMS[self.algorithm]
-                self.model = algo_class() if callable(algo_class) else algo_class
+            if warm_start and self.is_trained and self.trained_samples > 0:
+                new_samples = len(y_train) - self.trained_samples
+                if new_samples <= 0:
+                    logger.info("ℹ️ Aucune donnée nouvelle depuis le dernier entraînement")
+                    return True
+                
+                logger.info(f"🚀 Réentraînement incrémental ({self.algorithm}, "
+                            f"{new_samples} nouveaux exemples)...")
+                if not self._warm_fit(list(X_train), y_train, X_test, y_test):
+                    return False
             else:
-                logger.error(f"❌ Algorithme inconnu: {self.algorithm}")
-                return False
+                if warm_start:
+                    logger.warning("⚠️ Historique d'entraînement inconnu, entraînement complet")
+                if not self._cold_fit(X_train, y_train):
+                    return False
             
-            self.model.fit(X_train_vec, y_train)
+            self.trained_samples = len(y_train)
             self.is_trained = True
+            self.online_updates = 0
+            self.base_version = f"{APP_INFO['version']}-{datetime.now():%Y%m%d%H%M%S}"
             
             # Évaluer si données de test fournies
             if X_test is not None and y_test is not None:
@@ -153,73 +332,438 @@ class MLModel:
             logger.error(f"❌ Erreur lors de l'entraînement: {e}")
             return False
     
-    def predict(self, message):
+    def set_trained(self, estimator, vectorizer, X_train_vec=None, y_train=None,
+                    metrics=None, trained_samples=None):
+        """
+        Installe un estimateur entraîné en dehors de train (pipeline, flux)
+        
+        Args:
+            estimator: Estimateur déjà entraîné
+            vectorizer: Vectorizer ayant produit X_train_vec
+            X_train_vec: Matrice TF-IDF d'entraînement (échantillon rejoué), ou None
+            y_train: Labels d'entraînement
+            metrics (dict): Métriques d'évaluation
+            trained_samples (int): Exemples appris (par défaut, lignes de X_train_vec)
+        """
+        self.model = estimator
+        self.vectorizer = vectorizer
+        self.metrics = metrics or {}
+        self.replay = None
+        if X_train_vec is not None:
+            self._update_replay(X_train_vec, np.asarray(y_train), seen=0)
+        self.trained_samples = (trained_samples if trained_samples is not None
+                                else X_train_vec.shape[0])
+        self.is_trained = True
+        self.online_updates = 0
+        self.base_version = f"{APP_INFO['version']}-{datetime.now():%Y%m%d%H%M%S}"
+    
+    def _cold_fit(self, X_train, y_train):
+        """Entraînement complet d'un nouvel estimateur"""
+        logger.info(f"🚀 Début de l'entraînement ({self.algorithm})...")
+        
+        # Créer le vectorizer si nécessaire
+        if self.vectorizer is None:
+            self.vectorizer = TfidfVectorizer(
+                max_features=self.max_features
+            )
+            X_train_vec = self.vectorizer.fit_transform(X_train)
+        else:
+            X_train_vec = self.vectorizer.transform(X_train)
+        
+        # Créer et entraîner le modèle
+        if self.algorithm in self.ALGORITHMS:
+            algo_class = self.ALGORITHMS[self.algorithm]
+            self.model = algo_class() if callable(algo_class) else algo_class
+            if self.params:
+                self.model.set_params(**self.params)
+        else:
+            logger.error(f"❌ Algorithme inconnu: {self.algorithm}")
+            return False
+        
+        self.model.fit(X_train_vec, y_train)
+        self.replay = None
+        self._update_replay(X_train_vec, y_train, seen=0)
+        return True
+    
+    def _warm_fit(self, X_train, y_train, X_check=None, y_check=None):
+        """
+        Met à jour l'estimateur actuel avec les seuls nouveaux exemples
+        
+        Naive Bayes ajoute les nouveaux comptages aux anciens (résultat
+        identique à un entraînement complet). Les modèles linéaires repartent
+        des coefficients précédents (warm_start) et apprennent les nouveaux
+        exemples avec l'échantillon rejoué, pondéré pour représenter toute
+        l'archive ; si leur F1 baisse malgré tout sur le jeu de contrôle,
+        l'archive complète est réapprise.
+        
+        Args:
+            X_train: Archive complète, dans l'ordre d'arrivée
+            y_train: Labels de l'archive
+            X_check: Jeu de contrôle (par défaut, l'échantillon rejoué, appris
+                     par les deux modèles : la baisse mesure alors l'oubli)
+            y_check: Labels du jeu de contrôle
+        
+        Returns:
+            bool: Succès
+        """
+        X_new = self.vectorizer.transform(X_train[self.trained_samples:])
+        new_labels = y_train[self.trained_samples:]
+        model = copy.deepcopy(self.model)
+        
+        if hasattr(model, 'feature_count_'):
+            model.partial_fit(X_new, new_labels)
+        elif self.replay is None:
+            logger.warning("⚠️ Aucun échantillon de l'archive, entraînement complet")
+            return self._cold_fit(X_train, y_train)
+        else:
+            if 'warm_start' in model.get_params():
+                model.set_params(warm_start=True)
+            self._fit_with_replay(model, X_new, new_labels)
+            
+            if X_check is None or y_check is None:
+                X_check_vec, y_check = self.replay
+            else:
+                X_check_vec = self.vectorizer.transform(X_check)
+            before = f1_score(y_check, self.model.predict(X_check_vec), zero_division=0)
+            after = f1_score(y_check, model.predict(X_check_vec), zero_division=0)
+            if after < before - MODEL_CONFIG['warm_f1_tolerance']:
+                logger.warning(f"⚠️ F1 de contrôle en baisse ({before:.3f} -> {after:.3f}), "
+                               f"entraînement complet")
+                return self._cold_fit(X_train, y_train)
+        
+        self.model = model
+        self._update_replay(X_new, new_labels, seen=self.trained_samples)
+        return True
+    
+    def _fit_with_replay(self, model, X_new, y_new):
+        """
+        Entraîne un modèle linéaire sur des nouveaux exemples et l'échantillon rejoué
+        
+        Chaque exemple rejoué compte pour trained_samples / taille du
+        réservoir : l'objectif est celui d'un entraînement sur toute l'archive.
+        """
+        X_replay, y_replay = self.replay
+        weights = np.concatenate([
+            np.ones(X_new.shape[0]),
+            np.full(len(y_replay), self.trained_samples / len(y_replay))
+        ])
+        model.fit(sp.vstack([X_new, X_replay], format='csr'),
+                  np.concatenate([y_new, y_replay]), sample_weight=weights)
+    
+    def _update_replay(self, X_new, y_new, seen):
+        """
+        Échantillon uniforme de l'archive (reservoir sampling)
+        
+        Args:
+            X_new: Nouvelles lignes TF-IDF
+            y_new: Nouveaux labels
+            seen (int): Nombre d'exemples déjà passés par le réservoir
+        """
+        size = MODEL_CONFIG['replay_size']
+        rng = np.random.default_rng(MODEL_CONFIG['random_state'] + seen)
+        
+        if self.replay is None:
+            X_pool, y_pool = X_new, np.asarray(y_new)
+            slots = []
+        else:
+            X_pool = sp.vstack([self.replay[0], X_new], format='csr')
+            y_pool = np.concatenate([self.replay[1], y_new])
+            slots = list(range(self.replay[0].shape[0]))
+        offset = X_pool.shape[0] - X_new.shape[0]
+        
+        # Remplissage, puis remplacement avec probabilité size / (rang + 1)
+        fill = min(max(size - len(slots), 0), X_new.shape[0])
+        slots.extend(range(offset, offset + fill))
+        ranks = np.arange(seen + fill, seen + X_new.shape[0])
+        draws = rng.integers(0, ranks + 1) if len(ranks) else ranks
+        for position in np.nonzero(draws < size)[0]:
+            slots[draws[position]] = offset + fill + position
+        
+        self.replay = (X_pool[slots], y_pool[slots])
+    
+    def supports_partial_fit(self):
+        """Indique si le modèle chargé peut être mis à jour incrémentalement"""
+        return self.model is not None and hasattr(self.model, 'partial_fit')
+    
+    def partial_fit(self, messages, labels, already_cleaned=False):
+        """
+        Met à jour le modèle de façon incrémentale (apprentissage en ligne)
+        
+        La mise à jour est appliquée sur une copie de l'estimateur, puis
+        substituée d'un bloc : les prédictions en cours ne voient jamais
+        un modèle à moitié mis à jour.
+        
+        Args:
+            messages (list): Messages corrigés
+            labels (list): Labels corrects (0 = ham, 1 = spam)
+            already_cleaned (bool): Les messages sont déjà nettoyés
+        
+        Returns:
+            bool: Succès de la mise à jour
+        """
+        if not self.is_trained:
+            logger.error("❌ Modèle non entraîné")
+            return False
+        
+        if not self.supports_partial_fit():
+            logger.warning(f"⚠️ {self.algorithm} ne supporte pas l'apprentissage incrémental")
+            return False
+        
+        try:
+            cleaned = messages if already_cleaned else self.text_processor.clean_batch(messages)
+            X_vec = self.vectorizer.transform(cleaned)
+            
+            updated = copy.deepcopy(self.model)
+            updated.partial_fit(X_vec, np.asarray(labels, dtype=int))
+            self.model = updated
+            self.online_updates += 1
+            
+            logger.info(f"✅ Modèle mis à jour avec {len(labels)} corrections")
+            return True
+        
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de la mise à jour incrémentale: {e}")
+            return False
+    
+    def vectorize(self, message):
+        """
+        Nettoie et vectorise un message
+        
+        Args:
+            message (str): Message brut
+        
+        Returns:
+            tuple: (texte nettoyé, ligne TF-IDF ou None si le texte est vide)
+        """
+        cleaned = self.text_processor.clean_text(message)
+        if not cleaned:
+            return cleaned, None
+        return cleaned, self.vectorizer.transform([cleaned])
+    
+    def predict_vector(self, vectorized):
+        """
+        Calcule les probabilités [ham, spam] d'une ligne déjà vectorisée
+        
+        Args:
+            vectorized: Matrice creuse (1, n_features)
+        
+        Returns:
+            np.ndarray: Probabilités par classe
+        """
+        return self.model.predict_proba(vectorized)[0]
+    
+    def _token_weights(self):
+        """
+        Log-odds spam/ham de chaque feature, avec les noms des features
+        
+        Naive Bayes : log P(mot|spam) - log P(mot|ham) ; modèles linéaires :
+        coefficients (multipliés par la pente de calibration le cas échéant).
+        Le résultat est mis en cache tant que le modèle n'est pas remplacé.
+        
+        Returns:
+            tuple: (poids np.ndarray, noms des features)
+        """
+        cached = self._explainer
+        if cached is not None and cached[0] is self.model and cached[1] is self.vectorizer:
+            return cached[2], cached[3]
+        
+        model = self.model
+        calibration = None
+        if isinstance(model, QuantizedModel):
+            rows = dequantize_columns(*model.weights, slice(None))
+            weights = rows[1] - rows[0] if model.kind == 'naive_bayes' else rows[0]
+            calibration = model.calibration
+        elif hasattr(model, 'feature_log_prob_'):
+            weights = model.feature_log_prob_[1] - model.feature_log_prob_[0]
+        else:
+            weights = np.atleast_2d(model.coef_)[0]
+            calibration = getattr(model, 'calibration_', None)
+        
+        if calibration is not None:
+            weights = weights * calibration[0]
+        
+        weights = np.asarray(weights, dtype=np.float64)
+        # Un vectorizer par hachage (entraînement en flux) n'a pas de vocabulaire
+        names = (self.vectorizer.get_feature_names_out()
+                 if hasattr(self.vectorizer, 'get_feature_names_out') else None)
+        self._explainer = (model, self.vectorizer, weights, names)
+        return weights, names
+    
+    def explain_vectors(self, vectorized, k=None):
+        """
+        Tokens qui poussent le plus vers spam et vers ham, pour chaque ligne
+        
+        Les contributions (tf-idf x log-odds) de toutes les lignes sont
+        obtenues par un seul produit creux, sans appel supplémentaire au modèle.
+        
+        Args:
+            vectorized: Matrice creuse (n_messages, n_features)
+            k (int): Nombre de tokens par sens (par défaut, MODEL_CONFIG)
+        
+        Returns:
+            list: Un dict {'spam': [(token, contribution)], 'ham': [...]} par ligne
+        """
+        k = k or MODEL_CONFIG['explain_top_k']
+        weights, names = self._token_weights()
+        
+        def name(column):
+            return str(names[column]) if names is not None else f"#{column}"
+        
+        contributions = vectorized.tocsr().multiply(weights).tocsr()
+        
+        explanations = []
+        for row in range(contributions.shape[0]):
+            start, end = contributions.indptr[row], contributions.indptr[row + 1]
+            data = contributions.data[start:end]
+            columns = contributions.indices[start:end]
+            order = np.argsort(data)
+            
+            spam = [i for i in order[::-1][:k] if data[i] > 0]
+            ham = [i for i in order[:k] if data[i] < 0]
+            explanations.append({
+                'spam': [(name(columns[i]), float(data[i])) for i in spam],
+                'ham': [(name(columns[i]), float(data[i])) for i in ham]
+            })
+        return explanations
+    
+    def explain(self, message, k=None):
+        """
+        Explique la prédiction d'un message
+        
+        Args:
+            message (str): Message brut
+            k (int): Nombre de tokens par sens
+        
+        Returns:
+            dict: Top-k tokens vers spam et vers ham, avec leur contribution
+        """
+        _, vectorized = self.vectorize(message)
+        if vectorized is None:
+            return {'spam': [], 'ham': []}
+        return self.explain_vectors(vectorized, k)[0]
+    
+    def build_result(self, message, cleaned, probabilities, vectors=None, row=0, explainer=None):
+        """
+        Construit le résultat à partir des probabilités
+        
+        Les features et l'explication ne sont calculées que si elles sont lues.
+        
+        Args:
+            message (str): Message original
+            cleaned (str): Message nettoyé
+            probabilities: Probabilités [ham, spam] ou None si message vide
+            vectors: Matrice TF-IDF contenant la ligne du message (pour l'explication)
+            row (int): Indice de la ligne du message dans vectors
+            explainer (MLModel): Modèle qui explique le verdict (par défaut, celui-ci)
+        
+        Returns:
+            PredictionResult: Résultat de la prédiction
+        """
+        if probabilities is None or not MODEL_CONFIG['explain_top_k']:
+            vectors = None
+        return PredictionResult.from_probabilities(
+            probabilities, self.version,
+            original_message=message,
+            cleaned_message=cleaned,
+            processor=self.text_processor if probabilities is not None else None,
+            explainer=explainer or self,
+            vectors=vectors,
+            row=row
+        )
+    
+    def predict(self, message, return_vector=False):
         """
         Prédit si un message est spam
         
         Args:
             message (str): Message à analyser
-            
+            return_vector (bool): Retourner aussi la ligne TF-IDF calculée
+        
         Returns:
-            dict: Résultat de la prédiction
+            PredictionResult: Résultat de la prédiction (tuple (résultat, ligne TF-IDF)
+                  si return_vector)
         """
         if not self.is_trained:
             logger.error("❌ Modèle non entraîné")
-            return None
+            return (None, None) if return_vector else None
         
         try:
-            # Nettoyer le message
-            cleaned = self.text_processor.clean_text(message)
+            cleaned, vectorized = self.vectorize(message)
             
-            if not cleaned:
+            if vectorized is None:
                 logger.warning("⚠️ Message vide après nettoyage")
-                return {
-                    'prediction': 0,
-                    'is_spam': False,
-                    'confidence': 0.5,
-                    'probabilities': {'ham': 0.5, 'spam': 0.5},
-                    'cleaned_message': cleaned
-                }
+                result = self.build_result(message, cleaned, None)
+                return (result, None) if return_vector else result
             
-            # Vectoriser
-            vectorized = self.vectorizer.transform([cleaned])
-            
-            # Prédire
-            prediction = self.model.predict(vectorized)[0]
-            probabilities = self.model.predict_proba(vectorized)[0]
-            
-            result = {
-                'prediction': int(prediction),
-                'is_spam': bool(prediction == 1),
-                'confidence': float(probabilities[prediction]),
-                'probabilities': {
-                    'ham': float(probabilities[0]),
-                    'spam': float(probabilities[1])
-                },
-                'cleaned_message': cleaned,
-                'features': self.text_processor.extract_features(message)
-            }
+            result = self.build_result(message, cleaned, self.predict_vector(vectorized),
+                                       vectorized)
             
             logger.debug(f"Prédiction: {'SPAM' if result['is_spam'] else 'HAM'} "
                         f"({result['confidence']*100:.1f}%)")
             
-            return result
-            
+            return (result, vectorized) if return_vector else result
+        
         except Exception as e:
             logger.error(f"❌ Erreur lors de la prédiction: {e}")
-            return None
+            return (None, None) if return_vector else None
     
-    def predict_batch(self, messages):
+    def vectorize_batch(self, messages):
+        """
+        Nettoie et vectorise plusieurs messages en un seul passage
+        
+        Args:
+            messages (list): Messages bruts
+        
+        Returns:
+            tuple: (textes nettoyés, indices des textes non vides, matrice TF-IDF
+                   de ces textes ou None)
+        """
+        cleaned = self.text_processor.clean_batch(messages)
+        rows = [i for i, text in enumerate(cleaned) if text]
+        if not rows:
+            return cleaned, rows, None
+        return cleaned, rows, self.vectorizer.transform([cleaned[i] for i in rows])
+    
+    def predict_batch(self, messages, return_vectors=False):
         """
         Prédit pour plusieurs messages
         
+        Les messages sont nettoyés, vectorisés et scorés en un seul passage.
+        
         Args:
             messages (list): Liste de messages
-            
+            return_vectors (bool): Retourner aussi la ligne TF-IDF de chaque message
+        
         Returns:
-            list: Liste de résultats
+            list: Liste de résultats (tuple (résultats, lignes TF-IDF ou None)
+                  si return_vectors)
         """
-        return [self.predict(msg) for msg in messages]
+        failed = [None] * len(messages)
+        if not self.is_trained:
+            logger.error("❌ Modèle non entraîné")
+            return (failed, failed) if return_vectors else failed
+        
+        try:
+            cleaned, rows, vectorized = self.vectorize_batch(messages)
+            results = [None if text else self.build_result(msg, text, None)
+                       for msg, text in zip(messages, cleaned)]
+            vectors = [None] * len(messages)
+            if rows:
+                probabilities = self.model.predict_proba(vectorized)
+                
+                # Les résultats partagent la matrice : l'explication d'un message
+                # n'est calculée que si elle est lue
+                for position, i in enumerate(rows):
+                    results[i] = self.build_result(
+                        messages[i], cleaned[i], probabilities[position], vectorized, position
+                    )
+                    if return_vectors:
+                        vectors[i] = vectorized[position:position + 1]
+            return (results, vectors) if return_vectors else results
+        
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de la prédiction par lot: {e}")
+            return (failed, failed) if return_vectors else failed
     
     def get_metrics(self):
         """Retourne les métriques du modèle"""
@@ -229,7 +773,10 @@ class MLModel:
         """Retourne les informations du modèle"""
         return {
             'algorithm': self.algorithm,
+            'version': self.version,
             'is_trained': self.is_trained,
             'metrics': self.metrics,
-            'max_features': MODEL_CONFIG['max_features']
+            'online_updates': self.online_updates,
+            'max_features': self.max_features,
+            'params': self.params
         }
\ No newline at end of file
@@ -0,0 +1,172 @@
+# models/model_cache.py
+"""
+Cache de modèles par client (tenant) ou par langue, borné en mémoire
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+
+from config.settings import MODEL_CACHE_CONFIG
+from .ml_model import MLModel
+
+logger = logging.getLogger(__name__)
+
+class ModelCache:
+    """Charge les bundles à la demande et évince les moins récemment utilisés"""
+    
+    def __init__(self, bundle_dir=None, memory_budget_mb=None, loader=None):
+        """
+        Initialise un cache vide
+        
+        Args:
+            bundle_dir (str): Dossier des bundles, un fichier <model_id>.pkl par modèle
+            memory_budget_mb (float): Mémoire totale autorisée pour les modèles résidents
+            loader (callable): model_id -> MLModel ou None (par défaut, lecture du bundle)
+        """
+        self.bundle_dir = Path(bundle_dir or MODEL_CACHE_CONFIG['bundle_dir'])
+        budget = memory_budget_mb or MODEL_CACHE_CONFIG['memory_budget_mb']
+        self.memory_budget = int(budget * 1024 * 1024)
+        self.loader = loader or self._load_bundle
+        
+        # model_id -> (MLModel, octets), du moins au plus récemment utilisé
+        self._models = OrderedDict()
+        # model_id -> Future des chargements en cours
+        self._loading = {}
+        self._lock = threading.Lock()
+        self.resident_bytes = 0
+        self.reset_stats()
+    
+    def reset_stats(self):
+        """Réinitialise les compteurs"""
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'shared_loads': 0,
+            'load_errors': 0,
+            'evictions': 0,
+            'load_time': 0.0
+        }
+    
+    def bundle_path(self, model_id):
+        """Chemin du bundle d'un modèle"""
+        return self.bundle_dir / f"{model_id}.pkl"
+    
+    def _load_bundle(self, model_id):
+        """Chargeur par défaut : bundle <bundle_dir>/<model_id>.pkl"""
+        path = self.bundle_path(model_id)
+        if not path.exists():
+            logger.warning(f"⚠️ Aucun modèle pour '{model_id}' ({path})")
+            return None
+        
+        model = MLModel()
+        return model if model.load_bundle(path) else None
+    
+    def get(self, model_id):
+        """
+        Retourne le modèle demandé, en le chargeant si nécessaire
+        
+        Plusieurs threads demandant le même modèle absent déclenchent un
+        seul chargement : les suivants attendent son résultat.
+        
+        Args:
+            model_id (str): Identifiant du client, de la langue ou du modèle
+        
+        Returns:
+            MLModel: Modèle chargé, ou None s'il est indisponible
+        """
+        with self._lock:
+            entry = self._models.get(model_id)
+            if entry is not None:
+                self._models.move_to_end(model_id)
+                self.stats['hits'] += 1
+                return entry[0]
+            
+            future = self._loading.get(model_id)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._loading[model_id] = future
+                self.stats['misses'] += 1
+            else:
+                self.stats['shared_loads'] += 1
+        
+        if not owner:
+            return future.result()
+        
+        model = None
+        start = time.perf_counter()
+        try:
+            model = self.loader(model_id)
+        except Exception as e:
+            logger.error(f"❌ Erreur chargement du modèle '{model_id}': {e}")
+        elapsed = time.perf_counter() - start
+        
+        with self._lock:
+            self.stats['load_time'] += elapsed
+            if model is None:
+                self.stats['load_errors'] += 1
+            else:
+                self._insert(model_id, model)
+            del self._loading[model_id]
+        
+        future.set_result(model)
+        if model is not None:
+            logger.info(f"📦 Modèle '{model_id}' chargé en {elapsed*1000:.0f} ms "
+                        f"({self.resident_bytes / 1024 / 1024:.1f} Mo résidents)")
+        return model
+    
+    def _insert(self, model_id, model):
+        """Ajoute un modèle et évince les plus anciens au-delà du budget (verrou requis)"""
+        size = model.memory_footprint()
+        self._models[model_id] = (model, size)
+        self.resident_bytes += size
+        
+        # Le modèle qui vient d'être chargé est toujours conservé
+        while self.resident_bytes > self.memory_budget and len(self._models) > 1:
+            evicted_id, (_, evicted_size) = self._models.popitem(last=False)
+            self.resident_bytes -= evicted_size
+            self.stats['evictions'] += 1
+            logger.info(f"♻️ Modèle '{evicted_id}' évincé du cache")
+    
+    def invalidate(self, model_id=None):
+        """
+        Retire un modèle du cache (ou tous), pour forcer son rechargement
+        
+        Returns:
+            int: Nombre de modèles retirés
+        """
+        with self._lock:
+            ids = list(self._models) if model_id is None else [model_id]
+            removed = 0
+            for key in ids:
+                entry = self._models.pop(key, None)
+                if entry is not None:
+                    self.resident_bytes -= entry[1]
+                    removed += 1
+            return removed
+    
+    def __contains__(self, model_id):
+        return model_id in self._models
+    
+    def get_stats(self):
+        """
+        Retourne les métriques du cache
+        
+        Returns:
+            dict: Taux de succès, chargements, évictions, mémoire résidente
+        """
+        with self._lock:
+            requests = self.stats['hits'] + self.stats['misses'] + self.stats['shared_loads']
+            loads = self.stats['misses']
+            return {
+                **self.stats,
+                'hit_rate': self.stats['hits'] / requests if requests else 0.0,
+                'avg_load_ms': self.stats['load_time'] / loads * 1000 if loads else 0.0,
+                'resident_models': len(self._models),
+                'resident_mb': self.resident_bytes / 1024 / 1024,
+                'memory_budget_mb': self.memory_budget / 1024 / 1024,
+                'loading': len(self._loading)
+            }
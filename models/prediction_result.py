@@ -0,0 +1,211 @@
+# models/prediction_result.py
+"""
+Résultat de prédiction compact, compatible avec l'accès par clé des dictionnaires
+"""
+
+_UNSET = object()
+
+class PredictionResult:
+    """
+    Verdict d'un message
+    
+    Les probabilités sont stockées à plat ; le texte nettoyé, les features
+    et l'explication ne sont calculés qu'au premier accès. Les vues et les
+    services y accèdent comme à un dict (result['is_spam'], result.get(...)),
+    et to_dict en donne une copie sérialisable.
+    """
+    
+    __slots__ = (
+        'prediction', 'ham_probability', 'spam_probability', 'model_version',
+        'original_message', 'tier', 'id', 'timestamp', 'tenant', 'cluster_id',
+        'similarity', '_cleaned', '_features', '_explanation', '_processor',
+        '_explainer', '_vectors', '_row', '_extras'
+    )
+    
+    # Clés exposées, dans l'ordre de l'ancien dictionnaire de résultat
+    KEYS = (
+        'prediction', 'is_spam', 'confidence', 'probabilities', 'cleaned_message',
+        'features', 'model_version', 'explanation', 'tier', 'tenant', 'cluster_id',
+        'similarity', 'timestamp', 'original_message', 'id'
+    )
+    LAZY_KEYS = ('cleaned_message', 'features', 'explanation')
+    
+    def __init__(self, prediction, ham_probability, spam_probability, model_version,
+                 original_message=None, cleaned_message=_UNSET, processor=None,
+                 explainer=None, vectors=None, row=0, tier=None, **extras):
+        """
+        Initialise le résultat
+        
+        Args:
+            prediction (int): 0 = ham, 1 = spam
+            ham_probability (float): Probabilité ham
+            spam_probability (float): Probabilité spam
+            model_version (str): Version du modèle (ou de la source) du verdict
+            original_message (str): Message brut
+            cleaned_message (str): Message nettoyé, s'il est déjà connu
+            processor (TextProcessor): Calcule le texte nettoyé et les features à la demande
+            explainer (MLModel): Modèle qui explique le verdict à la demande
+            vectors: Matrice TF-IDF contenant la ligne du message
+            row (int): Indice de la ligne du message dans vectors
+            tier (str): Étage qui a produit le verdict (prefilter, primary...)
+            **extras: Champs supplémentaires (tenant, cluster_id, similarity...)
+        """
+        self.prediction = prediction
+        self.ham_probability = ham_probability
+        self.spam_probability = spam_probability
+        self.model_version = model_version
+        self.original_message = original_message
+        self.tier = tier
+        self.id = None
+        self.timestamp = None
+        self.tenant = None
+        self.cluster_id = None
+        self.similarity = None
+        self._cleaned = cleaned_message
+        self._features = _UNSET
+        self._explanation = _UNSET
+        self._processor = processor
+        self._explainer = explainer
+        self._vectors = vectors
+        self._row = row
+        self._extras = None
+        for key, value in extras.items():
+            self[key] = value
+    
+    @classmethod
+    def from_probabilities(cls, probabilities, model_version, **kwargs):
+        """Résultat à partir des probabilités [ham, spam] (None : message vide, 50/50)"""
+        if probabilities is None:
+            return cls(0, 0.5, 0.5, model_version, **kwargs)
+        ham, spam = float(probabilities[0]), float(probabilities[1])
+        return cls(int(spam > ham), ham, spam, model_version, **kwargs)
+    
+    @property
+    def is_spam(self):
+        return self.prediction == 1
+    
+    @property
+    def confidence(self):
+        return self.spam_probability if self.prediction == 1 else self.ham_probability
+    
+    @property
+    def probabilities(self):
+        return {'ham': self.ham_probability, 'spam': self.spam_probability}
+    
+    @property
+    def cleaned_message(self):
+        if self._cleaned is _UNSET:
+            self._cleaned = (self._processor.clean_text(self.original_message)
+                             if self._processor is not None and self.original_message is not None
+                             else None)
+        return self._cleaned
+    
+    @cleaned_message.setter
+    def cleaned_message(self, value):
+        self._cleaned = value
+    
+    @property
+    def features(self):
+        if self._features is _UNSET:
+            self._features = (self._processor.extract_features(self.original_message)
+                              if self._processor is not None and self.original_message is not None
+                              else None)
+        return self._features
+    
+    @features.setter
+    def features(self, value):
+        self._features = value
+    
+    @property
+    def explanation(self):
+        if self._explanation is _UNSET:
+            self._explanation = None
+            if self._explainer is not None and self._vectors is not None:
+                row = self._vectors[self._row:self._row + 1]
+                self._explanation = self._explainer.explain_vectors(row)[0]
+            # La ligne TF-IDF n'est plus nécessaire
+            self._explainer = self._vectors = None
+        return self._explanation
+    
+    @explanation.setter
+    def explanation(self, value):
+        self._explanation = value
+        self._explainer = self._vectors = None
+    
+    # Accès façon dictionnaire
+    
+    def __getitem__(self, key):
+        if key in self.KEYS:
+            return getattr(self, key)
+        if self._extras is not None and key in self._extras:
+            return self._extras[key]
+        raise KeyError(key)
+    
+    def __setitem__(self, key, value):
+        if key in self.KEYS:
+            setattr(self, key, value)
+        else:
+            if self._extras is None:
+                self._extras = {}
+            self._extras[key] = value
+    
+    def get(self, key, default=None):
+        """Comme dict.get : default si la clé est absente ou vaut None"""
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None else value
+    
+    def __contains__(self, key):
+        return self.get(key) is not None
+    
+    def keys(self, include_lazy=True):
+        """Clés renseignées (les champs paresseux sont calculés si include_lazy)"""
+        keys = [
+            key for key in self.KEYS
+            if (include_lazy or key not in self.LAZY_KEYS) and self[key] is not None
+        ]
+        return keys + list(self._extras or ())
+    
+    def __iter__(self):
+        return iter(self.keys())
+    
+    def __len__(self):
+        return len(self.keys())
+    
+    def __bool__(self):
+        # Un résultat est toujours vrai : ne pas passer par __len__ (calculs paresseux)
+        return True
+    
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+    
+    def copy(self):
+        """Copie indépendante (les champs paresseux déjà calculés sont conservés)"""
+        clone = PredictionResult.__new__(PredictionResult)
+        for name in self.__slots__:
+            setattr(clone, name, getattr(self, name))
+        if self._extras is not None:
+            clone._extras = dict(self._extras)
+        return clone
+    
+    def detach(self):
+        """Oublie le modèle et la matrice TF-IDF (une explication non calculée vaudra None)"""
+        if self._explanation is _UNSET:
+            self._explanation = None
+        self._explainer = self._vectors = None
+        self._row = 0
+    
+    def to_dict(self, include_lazy=True):
+        """
+        Copie du résultat sous forme de dictionnaire (même format qu'auparavant)
+        
+        Args:
+            include_lazy (bool): Calculer texte nettoyé, features et explication
+        """
+        return {key: self[key] for key in self.keys(include_lazy)}
+    
+    def __repr__(self):
+        return (f"PredictionResult({'SPAM' if self.is_spam else 'HAM'}, "
+                f"confidence={self.confidence:.3f}, model_version={self.model_version!r})")
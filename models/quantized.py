@@ -0,0 +1,210 @@
+# models/quantized.py
+"""
+Poids du modèle en précision réduite (float16 ou int8)
+
+QuantizedModel et QuantizedVectorizer remplacent l'estimateur et le
+vectorizer d'un MLModel : ils exposent la même interface (transform,
+predict_proba) et calculent directement à partir des poids réduits.
+Seules les colonnes présentes dans les messages sont déquantifiées.
+"""
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.preprocessing import normalize
+
+QUANTIZED_DTYPES = ('float16', 'int8')
+
+def quantize_rows(weights, dtype):
+    """
+    Quantifie une matrice ligne par ligne
+    
+    En int8, chaque ligne (classe) a son propre pas et son propre
+    décalage : w ≈ (q + 128) * scale + offset.
+    
+    Args:
+        weights: Matrice (n_lignes, n_features)
+        dtype (str): 'float16' ou 'int8'
+    
+    Returns:
+        tuple: (poids quantifiés, scales, offsets) ; scales et offsets
+               valent None en float16
+    """
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    
+    if dtype == 'float16':
+        return weights.astype(np.float16), None, None
+    
+    if dtype == 'int8':
+        low = weights.min(axis=1)
+        scales = (weights.max(axis=1) - low) / 255.0
+        scales[scales == 0] = 1.0
+        q = np.round((weights - low[:, None]) / scales[:, None]) - 128
+        return q.astype(np.int8), scales.astype(np.float32), low.astype(np.float32)
+    
+    raise ValueError(f"Précision non supportée: {dtype} (attendu: {QUANTIZED_DTYPES})")
+
+def dequantize_columns(weights, scales, offsets, columns):
+    """Déquantifie uniquement les colonnes demandées (float32)"""
+    block = weights[:, columns].astype(np.float32)
+    if scales is None:
+        return block
+    return (block + 128.0) * scales[:, None] + offsets[:, None]
+
+def sparse_dot(X, weights, scales, offsets):
+    """
+    Calcule X @ W.T sans reconstruire W en pleine précision
+    
+    Args:
+        X: Matrice creuse CSR (n_messages, n_features)
+        weights, scales, offsets: Sortie de quantize_rows
+    
+    Returns:
+        np.ndarray: Scores (n_messages, n_lignes)
+    """
+    X = X.tocsr()
+    contributions = dequantize_columns(weights, scales, offsets, X.indices) * X.data
+    doc_ids = np.repeat(np.arange(X.shape[0]), np.diff(X.indptr))
+    
+    scores = np.empty((X.shape[0], weights.shape[0]), dtype=np.float64)
+    for row in range(weights.shape[0]):
+        scores[:, row] = np.bincount(doc_ids, weights=contributions[row], minlength=X.shape[0])
+    return scores
+
+
+class QuantizedVectorizer:
+    """Équivalent de TfidfVectorizer avec un vecteur IDF en précision réduite"""
+    
+    def __init__(self, counter, idf, norm='l2', sublinear_tf=False):
+        """
+        Args:
+            counter (CountVectorizer): Comptage sur le vocabulaire d'origine
+            idf (tuple): Sortie de quantize_rows pour le vecteur IDF, ou None
+            norm (str): Normalisation des lignes ('l2', 'l1' ou None)
+            sublinear_tf (bool): Remplacer tf par 1 + log(tf)
+        """
+        self.counter = counter
+        self.idf = idf
+        self.norm = norm
+        self.sublinear_tf = sublinear_tf
+    
+    @classmethod
+    def from_vectorizer(cls, vectorizer, dtype='int8'):
+        """Construit la version réduite d'un TfidfVectorizer entraîné"""
+        count_params = CountVectorizer().get_params()
+        params = {key: value for key, value in vectorizer.get_params().items()
+                  if key in count_params}
+        params.update(dtype=np.float32)
+        # Vocabulaire installé comme appris : passé en paramètre, il serait
+        # recopié dans vocabulary_ et gardé deux fois en mémoire
+        counter = CountVectorizer(**params)
+        counter.vocabulary_ = vectorizer.vocabulary_
+        counter.fixed_vocabulary_ = True
+        
+        # Comme TfidfTransformer.transform, l'IDF n'est appliqué que si idf_
+        # existe : le vectorizer.pkl historique, picklé par une ancienne
+        # version de scikit-learn, ne l'expose plus et n'en applique aucun
+        idf = getattr(vectorizer, 'idf_', None) if vectorizer.use_idf else None
+        if idf is not None:
+            idf = quantize_rows(idf, dtype)
+        return cls(counter, idf, vectorizer.norm, vectorizer.sublinear_tf)
+    
+    @property
+    def vocabulary_(self):
+        return self.counter.vocabulary_
+    
+    def get_feature_names_out(self):
+        return self.counter.get_feature_names_out()
+    
+    def transform(self, documents):
+        """Vectorise des textes nettoyés en TF-IDF"""
+        X = self.counter.transform(documents).tocsr()
+        
+        if self.sublinear_tf:
+            np.log(X.data, out=X.data)
+            X.data += 1
+        
+        if self.idf is not None:
+            X.data *= dequantize_columns(*self.idf, X.indices)[0]
+        
+        if self.norm:
+            X = normalize(X, norm=self.norm, copy=False)
+        return X
+    
+    @property
+    def nbytes(self):
+        """Mémoire occupée par les poids IDF"""
+        if self.idf is None:
+            return 0
+        return sum(part.nbytes for part in self.idf if part is not None)
+
+
+class QuantizedModel:
+    """Estimateur linéaire (Naive Bayes, LR, SVM) en précision réduite"""
+    
+    def __init__(self, kind, weights, intercept, classes, calibration=None):
+        """
+        Args:
+            kind (str): 'naive_bayes' (log-probabilités) ou 'linear' (coefficients)
+            weights (tuple): Sortie de quantize_rows
+            intercept: Log-priors (NB) ou biais (linéaire), en float32
+            classes: Classes de l'estimateur d'origine
+            calibration (tuple): (a, b) de la sigmoïde de CalibratedLinearSVC
+        """
+        self.kind = kind
+        self.weights = weights
+        self.intercept = intercept
+        self.classes_ = classes
+        self.calibration = calibration
+        self.n_features_in_ = weights[0].shape[1]
+    
+    @classmethod
+    def from_estimator(cls, estimator, dtype='int8'):
+        """Construit la version réduite d'un estimateur entraîné"""
+        if hasattr(estimator, 'feature_log_prob_'):
+            return cls(
+                'naive_bayes',
+                quantize_rows(estimator.feature_log_prob_, dtype),
+                estimator.class_log_prior_.astype(np.float32),
+                estimator.classes_
+            )
+        
+        coef = getattr(estimator, 'coef_', None)
+        if coef is not None and np.atleast_2d(coef).shape[0] == 1:
+            return cls(
+                'linear',
+                quantize_rows(coef, dtype),
+                np.asarray(estimator.intercept_, dtype=np.float32),
+                estimator.classes_,
+                getattr(estimator, 'calibration_', None)
+            )
+        
+        raise ValueError(f"Modèle non quantifiable: {type(estimator).__name__}")
+    
+    def decision_function(self, X):
+        """Scores bruts (log-vraisemblances jointes pour NB, marge pour linéaire)"""
+        return sparse_dot(X, *self.weights) + self.intercept
+    
+    def predict_proba(self, X):
+        """Probabilités [ham, spam]"""
+        scores = self.decision_function(X)
+        
+        if self.kind == 'naive_bayes':
+            scores -= scores.max(axis=1, keepdims=True)
+            probabilities = np.exp(scores)
+            return probabilities / probabilities.sum(axis=1, keepdims=True)
+        
+        margin = scores[:, 0]
+        if self.calibration is not None:
+            a, b = self.calibration
+            margin = a * margin + b
+        spam = 1.0 / (1.0 + np.exp(-margin))
+        return np.column_stack([1.0 - spam, spam])
+    
+    def predict(self, X):
+        """Classe prédite"""
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+    
+    @property
+    def nbytes(self):
+        """Mémoire occupée par les poids"""
+        return (sum(part.nbytes for part in self.weights if part is not None)
+                + self.intercept.nbytes)
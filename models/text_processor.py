@@ -2,6 +2,7 @@
 """
 Module de prétraitement de texte
 """
+import hashlib
 import re
 import nltk
 from nltk.corpus import stopwords
@@ -9,12 +10,17 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Version du nettoyage : à incrémenter dès que clean_text produit un autre
+# résultat pour un même texte (les textes nettoyés enregistrés sont alors ignorés)
+CLEANER_VERSION = 1
+
 class TextProcessor:
     """Classe pour le prétraitement de texte"""
     
     def __init__(self, language='english'):
         """Initialise le processeur de texte"""
         self.language = language
+        self._fingerprint = None
         try:
             self.stop_words = set(stopwords.words(language))
             logger.info(f"✅ Stopwords chargés ({language})")
@@ -23,6 +29,20 @@ class TextProcessor:
             nltk.download('stopwords')
             self.stop_words = set(stopwords.words(language))
     
+    @property
+    def fingerprint(self):
+        """
+        Empreinte du nettoyage (CLEANER_VERSION et stopwords)
+        
+        Un texte nettoyé enregistré avec la même empreinte est identique à
+        celui que clean_text produirait : il peut être réutilisé tel quel.
+        """
+        if self._fingerprint is None:
+            digest = hashlib.sha1(f"{CLEANER_VERSION}:".encode('utf-8'))
+            digest.update(' '.join(sorted(self.stop_words)).encode('utf-8'))
+            self._fingerprint = digest.hexdigest()[:16]
+        return self._fingerprint
+    
     def clean_text(self, text):
         """
         Nettoie un texte pour le ML
@@ -4,5 +4,13 @@ Package des services
 """
 from .prediction_service import PredictionService
 from .statistics_service import StatisticsService
+from .prefilter import KnownMessageFilter
+from .near_duplicate import NearDuplicateIndex
+from .verdict_cache import VerdictCache
+from .micro_batcher import MicroBatcher
+from .shadow import ShadowScorer
+from .model_registry import ModelRegistry
+from .retrain_job import RetrainJob
 
-__all__ = ['PredictionService', 'StatisticsService']
\ No newline at end of file
+__all__ = ['PredictionService', 'StatisticsService', 'KnownMessageFilter', 'NearDuplicateIndex',
+           'VerdictCache', 'MicroBatcher', 'ShadowScorer', 'ModelRegistry', 'RetrainJob']
\ No newline at end of file
@@ -0,0 +1,177 @@
+# services/micro_batcher.py
+"""
+Regroupement en micro-lots des requêtes asynchrones
+"""
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config.settings import ASYNC_BATCH_CONFIG
+
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    """
+    Réunit les requêtes concurrentes et les traite par lots sur un thread de travail
+    
+    Un lot part dès qu'il atteint max_batch_size, ou à la fin de la fenêtre
+    d'attente. La fenêtre suit l'intervalle moyen entre deux requêtes : nulle
+    quand le trafic est faible (attendre n'apporterait aucun autre message),
+    le temps de compléter le lot (au plus max_wait_ms) sinon. Pendant qu'un
+    lot est traité, les requêtes suivantes s'accumulent et partent ensemble
+    dès qu'il se termine.
+    
+    L'état n'est manipulé que depuis la boucle asyncio ; seul le handler
+    s'exécute sur le thread de travail.
+    """
+    
+    def __init__(self, handler, max_batch_size=None, max_wait_ms=None, smoothing=None):
+        """
+        Initialise le regroupement
+        
+        Args:
+            handler (callable): Liste d'éléments -> liste de résultats (même ordre)
+            max_batch_size (int): Taille maximale d'un lot
+            max_wait_ms (float): Attente maximale avant l'envoi d'un lot incomplet
+            smoothing (float): Poids d'un nouvel intervalle dans la moyenne mobile
+        """
+        config = ASYNC_BATCH_CONFIG
+        self.handler = handler
+        self.max_batch_size = max_batch_size or config['max_batch_size']
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else config['max_wait_ms']) / 1000
+        self.smoothing = smoothing or config['smoothing']
+        
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="predict-batch")
+        # (élément, Future) en attente, dans l'ordre d'arrivée
+        self._pending = []
+        self._timer = None
+        self._running = False
+        self._last_arrival = None
+        self._interval = None
+        self.reset_stats()
+    
+    def reset_stats(self):
+        """Réinitialise les compteurs"""
+        self.stats = {
+            'requests': 0,
+            'batches': 0,
+            'full_batches': 0,
+            'largest_batch': 0,
+            'errors': 0,
+            'batch_time': 0.0
+        }
+    
+    @property
+    def window(self):
+        """Attente (s) avant l'envoi d'un lot incomplet, d'après le débit observé"""
+        if self._interval is None or self._interval >= self.max_wait:
+            return 0.0
+        missing = self.max_batch_size - len(self._pending)
+        return min(self.max_wait, self._interval * missing)
+    
+    async def submit(self, item):
+        """
+        Ajoute un élément au prochain lot et attend son résultat
+        
+        Args:
+            item: Élément transmis au handler
+        
+        Returns:
+            Résultat du handler pour cet élément
+        """
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._last_arrival is not None:
+            gap = now - self._last_arrival
+            self._interval = (gap if self._interval is None
+                              else self._interval + self.smoothing * (gap - self._interval))
+        self._last_arrival = now
+        
+        future = loop.create_future()
+        self._pending.append((item, future))
+        self.stats['requests'] += 1
+        
+        if len(self._pending) >= self.max_batch_size:
+            self._flush(loop)
+        elif self._timer is None and not self._running:
+            self._timer = loop.call_later(self.window, self._flush, loop)
+        return await future
+    
+    async def run(self, func, *args):
+        """Exécute un appel individuel sur le thread de travail (hors lot)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+    
+    def _flush(self, loop):
+        """Envoie les éléments en attente (sauf si un lot est déjà en cours)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._running or not self._pending:
+            return
+        
+        batch = self._pending[:self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+        self._running = True
+        loop.create_task(self._run_batch(loop, batch))
+    
+    async def _run_batch(self, loop, batch):
+        """Traite un lot sur le thread de travail et résout chaque Future"""
+        start = time.perf_counter()
+        try:
+            results = await loop.run_in_executor(
+                self._executor, self.handler, [item for item, _ in batch]
+            )
+            error = None
+        except Exception as e:
+            logger.error(f"❌ Erreur lors du traitement d'un lot: {e}")
+            results, error = None, e
+            self.stats['errors'] += 1
+        
+        self.stats['batch_time'] += time.perf_counter() - start
+        self.stats['batches'] += 1
+        self.stats['full_batches'] += len(batch) == self.max_batch_size
+        self.stats['largest_batch'] = max(self.stats['largest_batch'], len(batch))
+        
+        for position, (_, future) in enumerate(batch):
+            # Requête annulée entre-temps : son résultat est ignoré
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(results[position])
+        
+        self._running = False
+        # Les requêtes arrivées pendant le lot ont déjà attendu
+        if self._pending:
+            self._flush(loop)
+    
+    def close(self):
+        """Annule les requêtes en attente et arrête le thread de travail"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for _, future in self._pending:
+            future.cancel()
+        self._pending = []
+        self._executor.shutdown(wait=False)
+    
+    def get_stats(self):
+        """
+        Retourne les métriques du regroupement
+        
+        Returns:
+            dict: Taille moyenne des lots, durée moyenne d'un lot, fenêtre actuelle
+        """
+        batches = self.stats['batches']
+        return {
+            **self.stats,
+            'avg_batch_size': self.stats['requests'] / batches if batches else 0.0,
+            'avg_batch_ms': self.stats['batch_time'] / batches * 1000 if batches else 0.0,
+            'window_ms': self.window * 1000,
+            'pending': len(self._pending),
+            'max_batch_size': self.max_batch_size
+        }
@@ -0,0 +1,230 @@
+# services/model_registry.py
+"""
+Registre des modèles (table models) : enregistrement, activation, retour arrière
+"""
+import json
+import logging
+import shutil
+from pathlib import Path
+
+from models.ml_model import MLModel
+from database.db_manager import DatabaseManager
+from config.settings import REGISTRY_CONFIG
+
+logger = logging.getLogger(__name__)
+
+class ModelRegistry:
+    """Versions de modèles enregistrées, avec un seul modèle actif"""
+    
+    def __init__(self, db_manager=None, registry_dir=None):
+        """
+        Initialise le registre
+        
+        Args:
+            db_manager (DatabaseManager): Accès à la table models
+            registry_dir (str): Dossier où sont copiés les bundles enregistrés
+        """
+        self.db_manager = db_manager or DatabaseManager()
+        self.registry_dir = Path(registry_dir or REGISTRY_CONFIG['registry_dir'])
+        self.registry_dir.mkdir(parents=True, exist_ok=True)
+    
+    def register(self, model, metadata=None, activate=False):
+        """
+        Enregistre un modèle entraîné : son bundle est écrit dans le registre
+        
+        Une version déjà enregistrée est refusée, pour ne jamais réécrire
+        le bundle d'un modèle que le retour arrière peut réactiver.
+        
+        Args:
+            model (MLModel): Modèle à enregistrer
+            metadata (dict): Métadonnées (jeu de données, paramètres...)
+            activate (bool): Activer immédiatement le modèle
+        
+        Returns:
+            str: Version enregistrée, ou None en cas d'échec
+        """
+        version = model.version
+        if self.is_registered(version):
+            logger.error(f"❌ Modèle {version} déjà enregistré: son bundle n'est pas réécrit")
+            return None
+        
+        bundle_path = self.registry_dir / f"{version}.pkl"
+        if not model.save_bundle(bundle_path, metadata):
+            return None
+        return self._add(version, model.algorithm, model.metrics, bundle_path, metadata, activate)
+    
+    def register_bundle(self, bundle_path, metadata=None, activate=False, copy=True):
+        """
+        Enregistre un bundle existant, avec les métriques qu'il contient
+        
+        Args:
+            bundle_path (str): Bundle produit par MLModel.save_bundle
+            metadata (dict): Métadonnées supplémentaires
+            activate (bool): Activer immédiatement le modèle
+            copy (bool): Copier le bundle dans le registre (sinon, le chemin est référencé)
+        
+        Returns:
+            str: Version enregistrée, ou None en cas d'échec
+        """
+        model = MLModel()
+        if not model.load_bundle(bundle_path):
+            return None
+        
+        version = model.version
+        if self.is_registered(version):
+            logger.error(f"❌ Modèle {version} déjà enregistré: son bundle n'est pas réécrit")
+            return None
+        
+        if copy:
+            target = self.registry_dir / f"{version}.pkl"
+            if Path(bundle_path).resolve() != target.resolve():
+                shutil.copy2(bundle_path, target)
+            bundle_path = target
+        return self._add(version, model.algorithm, model.metrics, bundle_path, metadata, activate)
+    
+    def is_registered(self, version):
+        """Indique si une version figure déjà dans le registre"""
+        return self.db_manager.get_model_info(version) is not None
+    
+    def _add(self, version, algorithm, metrics, bundle_path, metadata, activate):
+        """Ajoute la ligne du modèle dans la table models"""
+        added = self.db_manager.add_model_info(
+            version,
+            algorithm,
+            metrics.get('accuracy', 0.0),
+            metrics.get('precision', 0.0),
+            metrics.get('recall', 0.0),
+            metrics.get('f1', 0.0),
+            metadata,
+            bundle_path
+        )
+        if not added:
+            return None
+        
+        if activate and not self.activate(version):
+            return None
+        return version
+    
+    def list_models(self):
+        """
+        Liste les modèles enregistrés
+        
+        Returns:
+            list: Lignes de la table models (métadonnées décodées), les plus récentes d'abord
+        """
+        models = self.db_manager.get_models()
+        for row in models:
+            row['metadata'] = json.loads(row['metadata']) if row['metadata'] else {}
+            row['bundle_exists'] = bool(row['bundle_path']) and Path(row['bundle_path']).exists()
+        return models
+    
+    def get_active(self):
+        """Retourne la ligne du modèle actif, ou None"""
+        return self.db_manager.get_active_model()
+    
+    def get_bundle_path(self, version):
+        """Chemin du bundle d'une version, s'il existe encore sur disque"""
+        row = self.db_manager.get_model_info(version)
+        if row is None or not row['bundle_path'] or not Path(row['bundle_path']).exists():
+            return None
+        return Path(row['bundle_path'])
+    
+    def activate(self, version):
+        """
+        Marque une version comme active
+        
+        Returns:
+            bool: Succès (le bundle doit exister)
+        """
+        if self.get_bundle_path(version) is None:
+            logger.error(f"❌ Activation impossible: bundle de {version} introuvable")
+            return False
+        
+        if not self.db_manager.set_active_model(version):
+            return False
+        logger.info(f"✅ Modèle {version} activé")
+        return True
+    
+    def rollback_target(self):
+        """
+        Version qui redeviendrait active après un retour arrière
+        
+        Returns:
+            str: Version précédente dont le bundle existe encore, ou None
+        """
+        history = self.db_manager.get_activation_history()
+        if not history:
+            return None
+        
+        current = history[0]['model_version']
+        for activation in history[1:]:
+            if (activation['model_version'] != current and activation['bundle_path']
+                    and Path(activation['bundle_path']).exists()):
+                return activation['model_version']
+        return None
+    
+    def rollback(self):
+        """
+        Réactive le modèle précédent ; des appels successifs remontent l'historique
+        
+        Returns:
+            str: Version réactivée, ou None s'il n'y a rien à annuler
+        """
+        history = self.db_manager.get_activation_history()
+        target = self.rollback_target()
+        if target is None:
+            logger.warning("⚠️ Aucun modèle précédent pour le retour arrière")
+            return None
+        
+        if not self.db_manager.set_active_model(target, record=False):
+            return None
+        
+        # Les activations annulées ne sont plus proposées au retour arrière suivant
+        for activation in history:
+            if activation['model_version'] == target:
+                break
+            self.db_manager.mark_activation_rolled_back(activation['id'])
+        
+        logger.info(f"⏪ Retour arrière: {history[0]['model_version']} -> {target}")
+        return target
+    
+    def gc(self, keep=None):
+        """
+        Supprime les anciens modèles et leurs bundles
+        
+        Le modèle actif, les plus récents et ceux encore accessibles par
+        retour arrière sont conservés.
+        
+        Args:
+            keep (int): Nombre de modèles récents conservés (par défaut, REGISTRY_CONFIG)
+        
+        Returns:
+            list: Versions supprimées
+        """
+        keep = keep if keep is not None else REGISTRY_CONFIG['keep_models']
+        models = self.db_manager.get_models()
+        history = self.db_manager.get_activation_history()
+        
+        protected = {row['version'] for row in models[:keep]}
+        protected.update(row['version'] for row in models if row['is_active'])
+        protected.update(
+            activation['model_version']
+            for activation in history[:REGISTRY_CONFIG['rollback_depth'] + 1]
+        )
+        
+        removed = []
+        for row in models:
+            if row['version'] in protected:
+                continue
+            
+            path = Path(row['bundle_path']) if row['bundle_path'] else None
+            # Seuls les bundles copiés dans le registre sont supprimés du disque
+            if (path is not None and path.exists()
+                    and path.resolve().parent == self.registry_dir.resolve()):
+                path.unlink()
+            if self.db_manager.delete_model_info(row['version']):
+                removed.append(row['version'])
+        
+        if removed:
+            logger.info(f"🧹 {len(removed)} anciens modèles supprimés du registre")
+        return removed
@@ -0,0 +1,351 @@
+# services/near_duplicate.py
+"""
+Détection des quasi-doublons (variantes de campagnes) par MinHash + LSH
+"""
+import logging
+import re
+import threading
+import zlib
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from models.prediction_result import PredictionResult
+from config.settings import NEAR_DUPLICATE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Plus grand nombre premier < 2^32 : a, b, h < 2^32, donc a * h + b < 2^64
+HASH_PRIME = (1 << 32) - 5
+
+def campaign_text(message):
+    """
+    Normalise un message pour rapprocher les variantes d'une campagne
+    
+    Les URLs, adresses email et nombres sont remplacés par des jetons :
+    deux envois qui ne diffèrent que par le lien ou le numéro se ressemblent.
+    """
+    text = message.lower()
+    text = re.sub(r'http\S+|www\S+', ' url ', text)
+    text = re.sub(r'\S+@\S+', ' email ', text)
+    text = re.sub(r'\d+', '0', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class NearDuplicateIndex:
+    """
+    Index LSH en mémoire des messages récemment scorés
+    
+    Chaque entrée garde la version du modèle qui a produit son verdict : un
+    verdict n'est réutilisé que pour cette version (après un rechargement ou
+    une mise à jour en ligne, la variante est scorée à nouveau), alors que
+    les campagnes sont rapprochées quelle que soit la version.
+    """
+    
+    def __init__(self, capacity=None, num_bands=None, rows_per_band=None,
+                 shingle_size=None, similarity_threshold=None, seed=42):
+        """
+        Initialise un index vide
+        
+        Args:
+            capacity (int): Nombre maximal de messages gardés (les plus anciens sont évincés)
+            num_bands (int): Nombre de bandes LSH
+            rows_per_band (int): Valeurs MinHash par bande
+            shingle_size (int): Taille des n-grammes de caractères
+            similarity_threshold (float): Jaccard estimé minimal pour réutiliser un verdict
+            seed (int): Graine des permutations (fixe pour la persistance)
+        """
+        self.capacity = capacity or NEAR_DUPLICATE_CONFIG['capacity']
+        self.num_bands = num_bands or NEAR_DUPLICATE_CONFIG['num_bands']
+        self.rows_per_band = rows_per_band or NEAR_DUPLICATE_CONFIG['rows_per_band']
+        self.shingle_size = shingle_size or NEAR_DUPLICATE_CONFIG['shingle_size']
+        self.similarity_threshold = (similarity_threshold or
+                                     NEAR_DUPLICATE_CONFIG['similarity_threshold'])
+        self.num_perm = self.num_bands * self.rows_per_band
+        
+        rng = np.random.default_rng(seed)
+        self._perm_a = rng.integers(1, HASH_PRIME, self.num_perm, dtype=np.uint64)
+        self._perm_b = rng.integers(0, HASH_PRIME, self.num_perm, dtype=np.uint64)
+        self._band_mix = rng.integers(1, 1 << 63, self.rows_per_band, dtype=np.uint64) | np.uint64(1)
+        
+        self._lock = threading.Lock()
+        self._allocate()
+        self.stats = {'lookups': 0, 'hits': 0, 'inserts': 0}
+    
+    def _allocate(self):
+        """Alloue le tampon circulaire et les tables de bandes"""
+        self.signatures = np.zeros((self.capacity, self.num_perm), dtype=np.uint32)
+        self.band_keys = np.zeros((self.capacity, self.num_bands), dtype=np.uint64)
+        self.labels = np.zeros(self.capacity, dtype=np.int8)
+        self.spam_probabilities = np.zeros(self.capacity, dtype=np.float32)
+        self.clusters = np.full(self.capacity, -1, dtype=np.int64)
+        # Version du modèle de chaque entrée, codée par son indice dans self.versions
+        self.version_codes = np.zeros(self.capacity, dtype=np.int32)
+        self.versions = []
+        self.size = 0
+        self.next_slot = 0
+        self.next_cluster = 0
+        self.cluster_sizes = Counter()
+        self.band_tables = [dict() for _ in range(self.num_bands)]
+    
+    def signature(self, message):
+        """
+        Signature MinHash des n-grammes de caractères du message
+        
+        Returns:
+            np.ndarray: num_perm valeurs uint32
+        """
+        text = campaign_text(message)
+        k = self.shingle_size
+        shingles = {text[i:i + k] for i in range(max(len(text) - k + 1, 1))}
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        # Permutations universelles (a * h + b) mod p, exactes en uint64
+        permuted = (np.outer(self._perm_a, hashes) + self._perm_b[:, None]) % np.uint64(HASH_PRIME)
+        return permuted.min(axis=1).astype(np.uint32)
+    
+    def _band_keys(self, signature):
+        """Une clé 64 bits par bande"""
+        bands = signature.reshape(self.num_bands, self.rows_per_band).astype(np.uint64)
+        return (bands * self._band_mix).sum(axis=1, dtype=np.uint64)
+    
+    def _version_code(self, model_version, create=False):
+        """Code d'une version de modèle (None si elle n'a encore aucune entrée)"""
+        try:
+            return self.versions.index(model_version)
+        except ValueError:
+            if not create:
+                return None
+            self.versions.append(model_version)
+            return len(self.versions) - 1
+    
+    def _best_match(self, signature, band_keys, version_code=None):
+        """
+        Slot le plus similaire parmi les candidats LSH, et sa similarité
+        
+        Args:
+            version_code (int): Ne considérer que les entrées de cette version
+        """
+        candidates = {table[key] for table, key in zip(self.band_tables, band_keys.tolist())
+                      if key in table}
+        if not candidates:
+            return None, 0.0
+        
+        slots = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        if version_code is not None:
+            slots = slots[self.version_codes[slots] == version_code]
+            if not len(slots):
+                return None, 0.0
+        similarities = (self.signatures[slots] == signature).mean(axis=1)
+        best = int(similarities.argmax())
+        return int(slots[best]), float(similarities[best])
+    
+    def lookup(self, message, model_version, record=True):
+        """
+        Cherche un message récent quasi identique, scoré par cette version du modèle
+        
+        Args:
+            message (str): Message brut
+            model_version (str): Version du modèle courant
+            record (bool): Indexer la variante trouvée dans la campagne de son voisin
+        
+        Returns:
+            PredictionResult: Résultat au format de MLModel.predict, ou None
+        """
+        self.stats['lookups'] += 1
+        version_code = self._version_code(model_version)
+        if version_code is None:
+            return None
+        signature = self.signature(message)
+        band_keys = self._band_keys(signature)
+        slot, similarity = self._best_match(signature, band_keys, version_code)
+        
+        if slot is None or similarity < self.similarity_threshold:
+            return None
+        
+        self.stats['hits'] += 1
+        label = int(self.labels[slot])
+        spam_probability = float(self.spam_probabilities[slot])
+        cluster = int(self.clusters[slot])
+        if record:
+            with self._lock:
+                self._store(signature, band_keys, label, spam_probability, cluster, version_code)
+        
+        return PredictionResult(
+            label, 1.0 - spam_probability, spam_probability, model_version,
+            original_message=message,
+            cleaned_message=None,
+            tier='near_duplicate',
+            similarity=similarity,
+            cluster_id=cluster
+        )
+    
+    def add(self, message, label, spam_probability, model_version):
+        """
+        Indexe un message scoré ; il rejoint la campagne de son plus proche voisin
+        
+        Args:
+            message (str): Message brut
+            label (int): Verdict du modèle
+            spam_probability (float): Probabilité spam
+            model_version (str): Version du modèle qui a produit le verdict
+        
+        Returns:
+            int: Identifiant de la campagne (cluster)
+        """
+        signature = self.signature(message)
+        band_keys = self._band_keys(signature)
+        
+        with self._lock:
+            match, similarity = self._best_match(signature, band_keys)
+            if match is not None and similarity >= self.similarity_threshold:
+                cluster = int(self.clusters[match])
+            else:
+                cluster = self.next_cluster
+                self.next_cluster += 1
+            
+            self._store(signature, band_keys, label, spam_probability, cluster,
+                        self._version_code(model_version, create=True))
+            return cluster
+    
+    def _store(self, signature, band_keys, label, spam_probability, cluster, version_code):
+        """Écrit une entrée dans le prochain slot du tampon (verrou requis)"""
+        slot = self.next_slot
+        if self.size == self.capacity:
+            self._evict(slot)
+        else:
+            self.size += 1
+        
+        self.signatures[slot] = signature
+        self.band_keys[slot] = band_keys
+        self.labels[slot] = label
+        self.spam_probabilities[slot] = spam_probability
+        self.clusters[slot] = cluster
+        self.version_codes[slot] = version_code
+        self.cluster_sizes[cluster] += 1
+        
+        for table, key in zip(self.band_tables, band_keys.tolist()):
+            table[key] = slot
+        
+        self.next_slot = (slot + 1) % self.capacity
+        self.stats['inserts'] += 1
+    
+    def _evict(self, slot):
+        """Retire l'entrée d'un slot avant réutilisation"""
+        for table, key in zip(self.band_tables, self.band_keys[slot].tolist()):
+            if table.get(key) == slot:
+                del table[key]
+        
+        cluster = int(self.clusters[slot])
+        self.cluster_sizes[cluster] -= 1
+        if self.cluster_sizes[cluster] <= 0:
+            del self.cluster_sizes[cluster]
+    
+    def correct(self, message, label):
+        """
+        Corrige le verdict de la campagne d'un message signalé comme erroné
+        
+        Returns:
+            int: Nombre d'entrées corrigées
+        """
+        signature = self.signature(message)
+        slot, similarity = self._best_match(signature, self._band_keys(signature))
+        if slot is None or similarity < self.similarity_threshold:
+            return 0
+        
+        with self._lock:
+            members = self.clusters[:self.size] == self.clusters[slot]
+            self.labels[:self.size][members] = label
+            self.spam_probabilities[:self.size][members] = float(label)
+            return int(members.sum())
+    
+    def get_cluster_count(self, min_size=2):
+        """Nombre de campagnes (clusters d'au moins min_size messages récents)"""
+        return sum(1 for size in self.cluster_sizes.values() if size >= min_size)
+    
+    def get_stats(self):
+        """
+        Retourne les métriques de l'index
+        
+        Returns:
+            dict: Taux de réutilisation, taille, nombre de campagnes
+        """
+        lookups = self.stats['lookups']
+        return {
+            **self.stats,
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+            'indexed_messages': self.size,
+            'capacity': self.capacity,
+            'campaigns': self.get_cluster_count()
+        }
+    
+    def save(self, path=None):
+        """Persiste l'index (à côté de la base de données)"""
+        path = Path(path or NEAR_DUPLICATE_CONFIG['index_path'])
+        try:
+            with self._lock:
+                with open(path, 'wb') as f:
+                    np.savez(
+                        f,
+                        signatures=self.signatures[:self.size],
+                        labels=self.labels[:self.size],
+                        spam_probabilities=self.spam_probabilities[:self.size],
+                        clusters=self.clusters[:self.size],
+                        version_codes=self.version_codes[:self.size],
+                        versions=np.array(self.versions, dtype=str),
+                        meta=np.array([self.next_slot, self.next_cluster, self.num_bands,
+                                       self.rows_per_band, self.shingle_size, HASH_PRIME])
+                    )
+            logger.info(f"💾 Index des quasi-doublons sauvegardé ({self.size} messages)")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Erreur sauvegarde index quasi-doublons: {e}")
+            return False
+    
+    def load(self, path=None):
+        """Recharge un index persisté ; les tables de bandes sont reconstruites"""
+        path = Path(path or NEAR_DUPLICATE_CONFIG['index_path'])
+        if not path.exists():
+            return False
+        
+        try:
+            data = np.load(path)
+            # Les index antérieurs au changement de hachage n'ont pas de premier
+            next_slot, next_cluster, *params = data['meta'].tolist()
+            if params != [self.num_bands, self.rows_per_band, self.shingle_size, HASH_PRIME]:
+                logger.warning("⚠️ Index des quasi-doublons ignoré: paramètres LSH différents")
+                return False
+            
+            size = min(len(data['labels']), self.capacity)
+            with self._lock:
+                self._allocate()
+                self.signatures[:size] = data['signatures'][:size]
+                self.labels[:size] = data['labels'][:size]
+                self.spam_probabilities[:size] = data['spam_probabilities'][:size]
+                self.clusters[:size] = data['clusters'][:size]
+                if 'versions' in data:
+                    self.version_codes[:size] = data['version_codes'][:size]
+                    self.versions = data['versions'].tolist()
+                else:
+                    # Index antérieur aux versions : campagnes conservées, verdicts jamais réutilisés
+                    self.versions = [None]
+                self.size = size
+                self.next_slot = next_slot % self.capacity if size == self.capacity else size
+                self.next_cluster = next_cluster
+                
+                for slot in range(size):
+                    keys = self._band_keys(self.signatures[slot])
+                    self.band_keys[slot] = keys
+                    for table, key in zip(self.band_tables, keys.tolist()):
+                        table[key] = slot
+                self.cluster_sizes = Counter(self.clusters[:size].tolist())
+            
+            logger.info(f"✅ Index des quasi-doublons chargé ({size} messages)")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Erreur chargement index quasi-doublons: {e}")
+            return False
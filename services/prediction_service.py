@@ -3,39 +3,104 @@
 Service de prédiction
 """
 import logging
+import threading
+import time
 from datetime import datetime
-from models.ml_model import MLModel
+from pathlib import Path
+from models.ml_model import MLModel, feature_fingerprint
+from models.cascade import ModelCascade
+from models.model_cache import ModelCache
 from database.db_manager import DatabaseManager
-from config.settings import APP_INFO
+from .prefilter import KnownMessageFilter
+from .near_duplicate import NearDuplicateIndex
+from .verdict_cache import VerdictCache
+from .micro_batcher import MicroBatcher
+from .shadow import ShadowScorer
+from .model_registry import ModelRegistry
+from .retrain_job import RetrainJob
+from config.settings import (
+    MODELS_DIR, ONLINE_LEARNING_CONFIG, CASCADE_CONFIG, HOT_RELOAD_CONFIG,
+    PREFILTER_CONFIG, NEAR_DUPLICATE_CONFIG, SHADOW_CONFIG, VERDICT_CACHE_CONFIG
+)
 
 logger = logging.getLogger(__name__)
 
+LEGACY_MODEL_PATH = MODELS_DIR / "spam_detector.pkl"
+
 class PredictionService:
     """Service pour gérer les prédictions"""
     
     def __init__(self):
         """Initialise le service de prédiction"""
-        self.ml_model = MLModel()
         self.db_manager = DatabaseManager()
-        self.predictions_cache = []
+        self.registry = ModelRegistry(self.db_manager)
+        self.verdict_cache = VerdictCache() if VERDICT_CACHE_CONFIG['enabled'] else None
+        self.cascade = None
+        self.cascade_secondary_path = None
+        self.prefilter = None
+        self.near_duplicates = None
+        self.shadow = None
+        self.retrain_job = None
+        self.batcher = None
+        
+        # Modèles par client / langue, chargés à la première utilisation
+        self.model_cache = ModelCache()
+        
+        # Apprentissage en ligne : corrections en attente et déjà appliquées
+        self.pending_feedback = []
+        self.applied_feedback = []
+        
+        # Rechargement à chaud
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self._watcher_stop = threading.Event()
         
         # Charger le modèle
-        if not self.ml_model.load_model():
+        self.ml_model, self.model_source = self._load_model()
+        if self.ml_model is None:
             logger.error("❌ Impossible de charger le modèle ML")
             raise Exception("Modèle ML non disponible")
+        self._source_mtime = self._mtime(self.model_source)
+        
+        if CASCADE_CONFIG['enabled']:
+            self.enable_cascade()
+        
+        if PREFILTER_CONFIG['enabled']:
+            self.prefilter = KnownMessageFilter()
+            self.prefilter.rebuild(self.db_manager)
+        
+        if NEAR_DUPLICATE_CONFIG['enabled']:
+            self.near_duplicates = NearDuplicateIndex()
+            self.near_duplicates.load()
+        
+        if HOT_RELOAD_CONFIG['watch_enabled']:
+            self.start_model_watcher()
+        
+        if SHADOW_CONFIG['enabled']:
+            self.start_shadow()
+        
+        # Reprendre les corrections non sauvegardées lors de la dernière session
+        self.pending_feedback = self.db_manager.get_pending_feedback(
+            limit=ONLINE_LEARNING_CONFIG['max_pending']
+        )
+        if self.pending_feedback and ONLINE_LEARNING_CONFIG['enabled']:
+            logger.info(f"ℹ️ {len(self.pending_feedback)} corrections en attente")
+            self.apply_feedback()
         
         logger.info("✅ PredictionService initialisé")
     
-    def predict(self, message, save_to_db=True):
+    def predict(self, message, save_to_db=True, tenant=None):
         """
         Effectue une prédiction
         
         Args:
             message (str): Message à analyser
             save_to_db (bool): Sauvegarder dans la DB
-            
+            tenant (str): Client ou langue dont le modèle doit être utilisé
+                          (par défaut, le modèle principal)
+        
         Returns:
-            dict: Résultat de la prédiction
+            PredictionResult: Résultat de la prédiction
         """
         try:
             # Valider le message
@@ -43,8 +108,44 @@ class PredictionService:
                 logger.warning("⚠️ Message vide")
                 return None
             
-            # Prédiction
-            result = self.ml_model.predict(message)
+            # Message déjà connu : verdict stocké, sans passer par le modèle
+            result = None
+            vectorized = None
+            model_version = self.ml_model.version
+            if self.prefilter is not None:
+                result = self.prefilter.lookup(message, model_version)
+            
+            # Modèle dédié au client : l'index des quasi-doublons et le mode
+            # shadow ne concernent que le modèle principal
+            tenant_model = None
+            if result is None and tenant is not None:
+                tenant_model = self.model_cache.get(tenant)
+                if tenant_model is None:
+                    logger.warning(f"⚠️ Modèle '{tenant}' indisponible, modèle principal utilisé")
+                else:
+                    result = tenant_model.predict(message)
+                    if result is not None:
+                        result['tenant'] = tenant
+            
+            # Verdict récent du modèle principal : cache, puis variante d'un
+            # message récent (même campagne)
+            cached = False
+            if result is None and tenant_model is None:
+                result, cached = self._recent_verdict(message, model_version)
+            
+            # Prédiction (cascade si activée). La référence est lue une seule
+            # fois : un rechargement concurrent n'affecte pas cette prédiction.
+            if result is None and tenant_model is None:
+                predictor = self.cascade or self.ml_model
+                shadow = self.shadow
+                if shadow is None:
+                    result = predictor.predict(message)
+                else:
+                    start = time.perf_counter()
+                    result, vectorized = predictor.predict(message, return_vector=True)
+                    primary_latency_ms = (time.perf_counter() - start) * 1000
+                if result is not None:
+                    self._remember(message, model_version, result)
             
             if result is None:
                 logger.error("❌ Prédiction échouée")
@@ -53,26 +154,30 @@ class PredictionService:
             # Enrichir le résultat
             result['timestamp'] = datetime.now().isoformat()
             result['original_message'] = message
-            result['model_version'] = APP_INFO['version']
             
             # Sauvegarder dans la DB
             if save_to_db:
-                self.db_manager.add_prediction(
+                if result['cleaned_message'] is None:
+                    result['cleaned_message'] = self.ml_model.text_processor.clean_text(message)
+                result['id'] = self.db_manager.add_prediction(
                     message=message,
                     cleaned_message=result['cleaned_message'],
                     prediction=result['prediction'],
                     confidence=result['confidence'],
                     ham_prob=result['probabilities']['ham'],
                     spam_prob=result['probabilities']['spam'],
-                    model_version=APP_INFO['version']
+                    model_version=result['model_version'],
+                    cleaner_version=self.ml_model.text_processor.fingerprint
                 )
             
-            # Cache
-            self.predictions_cache.append(result)
-            if len(self.predictions_cache) > 100:
-                self.predictions_cache.pop(0)
+            # Le challenger score le même message en arrière-plan, à partir
+            # du texte nettoyé et de la ligne TF-IDF déjà calculés
+            if vectorized is not None:
+                vectorizer = getattr(predictor, 'primary', predictor).vectorizer
+                shadow.submit(result, vectorized, vectorizer, primary_latency_ms)
             
-            logger.info(f"✅ Prédiction: {'SPAM' if result['is_spam'] else 'HAM'}")
+            logger.info(f"✅ Prédiction: {'SPAM' if result['is_spam'] else 'HAM'}"
+                        f"{' (cache)' if cached else ''}")
             return result
             
         except Exception as e:
@@ -91,15 +196,155 @@ class PredictionService:
         Returns:
             list: Liste de résultats
         """
-        results = []
-        for msg in messages:
-            result = self.predict(msg, save_to_db)
-            if result:
-                results.append(result)
+        results = [result for result in self.predict_many(messages, save_to_db) if result]
         
         logger.info(f"✅ Batch de {len(results)} prédictions effectuées")
         return results
     
+    def predict_many(self, messages, save_to_db=True):
+        """
+        Prédictions pour plusieurs messages, avec le modèle principal
+        
+        Mêmes étapes que predict (préfiltre, cache, quasi-doublons), mais les
+        messages restants sont nettoyés, vectorisés et scorés en un seul
+        passage, et l'historique est écrit en une transaction.
+        
+        Args:
+            messages (list): Liste de messages
+            save_to_db (bool | list): Sauvegarder dans la DB (un booléen par message possible)
+        
+        Returns:
+            list: Un résultat par message, dans l'ordre (None si la prédiction échoue)
+        """
+        if isinstance(save_to_db, bool):
+            save_to_db = [save_to_db] * len(messages)
+        results = [None] * len(messages)
+        
+        try:
+            # Références lues une seule fois pour tout le lot
+            model_version = self.ml_model.version
+            predictor = self.cascade or self.ml_model
+            shadow = self.shadow
+            
+            pending = []
+            for i, message in enumerate(messages):
+                if not message or not message.strip():
+                    continue
+                result = (self.prefilter.lookup(message, model_version)
+                          if self.prefilter is not None else None)
+                if result is None:
+                    result, _ = self._recent_verdict(message, model_version)
+                if result is None:
+                    pending.append(i)
+                results[i] = result
+            
+            vectors = [None] * len(messages)
+            if pending:
+                batch = [messages[i] for i in pending]
+                start = time.perf_counter()
+                if shadow is None:
+                    scored, scored_vectors = predictor.predict_batch(batch), [None] * len(batch)
+                else:
+                    scored, scored_vectors = predictor.predict_batch(batch, return_vectors=True)
+                primary_latency_ms = (time.perf_counter() - start) * 1000 / len(pending)
+                for i, result, vectorized in zip(pending, scored, scored_vectors):
+                    if result is not None:
+                        self._remember(messages[i], model_version, result)
+                    results[i] = result
+                    vectors[i] = vectorized
+            
+            timestamp = datetime.now().isoformat()
+            rows, saved = [], []
+            for i, (message, result) in enumerate(zip(messages, results)):
+                if result is None:
+                    continue
+                result['timestamp'] = timestamp
+                result['original_message'] = message
+                if save_to_db[i]:
+                    rows.append(self._history_row(message, result))
+                    saved.append(result)
+            for result, prediction_id in zip(saved, self.db_manager.add_predictions(rows)):
+                result['id'] = prediction_id
+            
+            if shadow is not None:
+                vectorizer = getattr(predictor, 'primary', predictor).vectorizer
+                for result, vectorized in zip(results, vectors):
+                    if vectorized is not None:
+                        shadow.submit(result, vectorized, vectorizer, primary_latency_ms)
+            
+            return results
+        
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de la prédiction par lot: {e}")
+            self.db_manager.log_error('prediction_error', str(e))
+            return [None] * len(messages)
+    
+    async def predict_async(self, message, save_to_db=True, tenant=None):
+        """
+        Prédiction asynchrone, regroupée en micro-lots avec les requêtes concurrentes
+        
+        Les messages reçus pendant une courte fenêtre (adaptée à la charge)
+        sont scorés ensemble par predict_many, sur un thread de travail ;
+        la boucle asyncio n'est jamais bloquée.
+        
+        Args:
+            message (str): Message à analyser
+            save_to_db (bool): Sauvegarder dans la DB
+            tenant (str): Client ou langue (prédiction individuelle, hors lot)
+        
+        Returns:
+            PredictionResult: Résultat de la prédiction
+        """
+        if self.batcher is None:
+            self.batcher = MicroBatcher(self._predict_requests)
+        if tenant is not None:
+            return await self.batcher.run(self.predict, message, save_to_db, tenant)
+        return await self.batcher.submit((message, save_to_db))
+    
+    def _predict_requests(self, requests):
+        """Traite un micro-lot de requêtes (message, save_to_db) de predict_async"""
+        messages, save_to_db = zip(*requests)
+        return self.predict_many(list(messages), list(save_to_db))
+    
+    def get_batching_stats(self):
+        """Retourne la taille moyenne des micro-lots et la fenêtre d'attente actuelle"""
+        if self.batcher is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.batcher.get_stats()}
+    
+    def _recent_verdict(self, message, model_version):
+        """
+        Verdict déjà connu pour le modèle principal : cache des verdicts, puis
+        variante d'un message récent (même campagne)
+        
+        Returns:
+            tuple: (PredictionResult ou None, vient du cache)
+        """
+        if self.verdict_cache is not None:
+            result = self.verdict_cache.get(message, model_version)
+            if result is not None:
+                return result, True
+        if self.near_duplicates is not None:
+            return self.near_duplicates.lookup(message, model_version), False
+        return None, False
+    
+    def _remember(self, message, model_version, result):
+        """Indexe un verdict du modèle principal (quasi-doublons et cache)"""
+        if self.near_duplicates is not None:
+            result['cluster_id'] = self.near_duplicates.add(
+                message, result['prediction'], result['probabilities']['spam'], model_version
+            )
+        if self.verdict_cache is not None:
+            self.verdict_cache.put(message, model_version, result)
+    
+    def _history_row(self, message, result):
+        """Ligne de la table predictions pour un résultat"""
+        if result['cleaned_message'] is None:
+            result['cleaned_message'] = self.ml_model.text_processor.clean_text(message)
+        return (message, result['cleaned_message'], result['prediction'], result['confidence'],
+                result['probabilities']['ham'], result['probabilities']['spam'],
+                result['model_version'], self.ml_model.text_processor.fingerprint)
+    
     def get_recent_predictions(self, limit=10):
         """
         Récupère les prédictions récentes
@@ -112,6 +357,524 @@ class PredictionService:
         """
         return self.db_manager.get_predictions(limit=limit)
     
+    def _build_cascade(self, primary, secondary_model_path=None, uncertainty_band=None):
+        """Construit une cascade autour du modèle primaire donné"""
+        secondary = MLModel(CASCADE_CONFIG['secondary_algorithm'])
+        model_path = secondary_model_path or CASCADE_CONFIG['secondary_model_path']
+        if not secondary.load_bundle(model_path):
+            return None
+        
+        # Le secondaire score les lignes vectorisées par le primaire : il doit
+        # avoir été entraîné sur le même vocabulaire et les mêmes poids IDF
+        # (voir python train.py --cascade-secondary)
+        if feature_fingerprint(secondary.vectorizer) != feature_fingerprint(primary.vectorizer):
+            logger.warning(f"⚠️ Modèle secondaire incompatible: {model_path} n'a pas été "
+                           f"entraîné avec le vectorizer du modèle {primary.version}")
+            return None
+        secondary.vectorizer = primary.vectorizer
+        
+        return ModelCascade(
+            primary,
+            secondary,
+            uncertainty_band or CASCADE_CONFIG['uncertainty_band']
+        )
+    
+    def enable_cascade(self, secondary_model_path=None, uncertainty_band=None):
+        """
+        Active le mode cascade : Naive Bayes score tout, le modèle secondaire
+        ne traite que les messages dans la bande d'incertitude
+        
+        Args:
+            secondary_model_path (str): Bundle du modèle secondaire (même vectorizer que le primaire)
+            uncertainty_band (tuple): Bornes de probabilité spam (basse, haute)
+        
+        Returns:
+            bool: Succès de l'activation
+        """
+        cascade = self._build_cascade(self.ml_model, secondary_model_path, uncertainty_band)
+        if cascade is None:
+            logger.warning("⚠️ Cascade désactivée: modèle secondaire indisponible")
+            return False
+        
+        self.cascade = cascade
+        self.cascade_secondary_path = secondary_model_path
+        self._clear_verdict_cache()
+        return True
+    
+    def disable_cascade(self):
+        """Désactive le mode cascade"""
+        self.cascade = None
+        self._clear_verdict_cache()
+    
+    def _clear_verdict_cache(self):
+        """Vide le cache des verdicts (ils dépendent du modèle et de la cascade)"""
+        if self.verdict_cache is not None:
+            self.verdict_cache.clear()
+    
+    def get_cascade_stats(self):
+        """Retourne le taux d'escalade et la latence par tier"""
+        if self.cascade is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.cascade.get_stats()}
+    
+    def _load_model(self, bundle_path=None):
+        """
+        Charge un nouveau MLModel
+        
+        Sans chemin explicite, le modèle actif du registre est utilisé,
+        sinon le bundle configuré s'il existe, sinon la paire historique
+        spam_detector.pkl / vectorizer.pkl.
+        
+        Returns:
+            tuple: (MLModel ou None, chemin source)
+        """
+        model = MLModel()
+        
+        if bundle_path is None:
+            active = self.registry.get_active()
+            if active is not None:
+                bundle_path = self.registry.get_bundle_path(active['version'])
+                if bundle_path is None:
+                    logger.warning(f"⚠️ Bundle du modèle actif {active['version']} introuvable")
+        
+        if bundle_path is None:
+            default_bundle = Path(HOT_RELOAD_CONFIG['bundle_path'])
+            if default_bundle.exists():
+                bundle_path = default_bundle
+        
+        if bundle_path is None or Path(bundle_path) == LEGACY_MODEL_PATH:
+            loaded, source = model.load_model(), LEGACY_MODEL_PATH
+        else:
+            loaded, source = model.load_bundle(bundle_path), Path(bundle_path)
+        
+        return (model, source) if loaded else (None, source)
+    
+    @staticmethod
+    def _mtime(path):
+        """Date de modification d'un fichier, ou None s'il n'existe pas"""
+        try:
+            return Path(path).stat().st_mtime_ns
+        except (OSError, TypeError):
+            return None
+    
+    def _warm_up(self, model):
+        """Exécute quelques prédictions pour préchauffer un modèle"""
+        for message in HOT_RELOAD_CONFIG['warmup_messages']:
+            if model.predict(message) is None:
+                return False
+        return True
+    
+    def _reload(self, bundle_path=None):
+        """Charge, préchauffe et substitue le modèle (appelé hors thread UI)"""
+        with self._reload_lock:
+            new_model, source = self._load_model(bundle_path)
+            if new_model is None:
+                logger.error(f"❌ Rechargement annulé: modèle illisible ({source})")
+                return False
+            
+            if not self._warm_up(new_model):
+                logger.error("❌ Rechargement annulé: échec du préchauffage")
+                return False
+            
+            new_cascade = None
+            if self.cascade is not None:
+                new_cascade = self._build_cascade(
+                    new_model, self.cascade_secondary_path, self.cascade.uncertainty_band
+                )
+            
+            # Substitution atomique : les prédictions en cours gardent
+            # leur référence vers l'ancien modèle
+            old_version = self.ml_model.version
+            self.ml_model = new_model
+            self.cascade = new_cascade
+            self.model_source = source
+            self._source_mtime = self._mtime(source)
+            
+            # Les corrections appliquées à l'ancien modèle mais non
+            # sauvegardées sont rejouées sur le nouveau
+            replay = self.applied_feedback + self.pending_feedback
+            self.pending_feedback, self.applied_feedback = [], []
+            self._queue_feedback(replay)
+            
+            # Les verdicts de l'ancien modèle ne seraient plus jamais lus
+            self._clear_verdict_cache()
+            
+            logger.info(f"🔄 Modèle rechargé: {old_version} -> {new_model.version}")
+            return True
+    
+    def reload_model(self, bundle_path=None, background=True):
+        """
+        Recharge le modèle sans interrompre le service
+        
+        Args:
+            bundle_path (str): Bundle à charger (par défaut, la source configurée)
+            background (bool): Charger dans un thread séparé
+        
+        Returns:
+            bool: Rechargement lancé (background) ou réussi (synchrone)
+        """
+        if not background:
+            return self._reload(bundle_path)
+        
+        threading.Thread(
+            target=self._reload,
+            args=(bundle_path,),
+            name="model-reload",
+            daemon=True
+        ).start()
+        return True
+    
+    def activate_model(self, version):
+        """
+        Active une version du registre : elle est chargée et préchauffée
+        avant d'être marquée active
+        
+        Args:
+            version (str): Version enregistrée
+        
+        Returns:
+            bool: Le modèle sert désormais les prédictions
+        """
+        bundle_path = self.registry.get_bundle_path(version)
+        if bundle_path is None:
+            logger.error(f"❌ Modèle {version} introuvable dans le registre")
+            return False
+        
+        if not self._reload(bundle_path):
+            return False
+        return self.registry.activate(version)
+    
+    def rollback_model(self):
+        """
+        Revient au modèle actif précédent
+        
+        Returns:
+            str: Version réactivée, ou None
+        """
+        target = self.registry.rollback_target()
+        if target is None:
+            logger.warning("⚠️ Aucun modèle précédent pour le retour arrière")
+            return None
+        
+        if not self._reload(self.registry.get_bundle_path(target)):
+            return None
+        return self.registry.rollback()
+    
+    def start_model_watcher(self, bundle_path=None, interval=None):
+        """
+        Surveille le fichier du modèle et le recharge quand il change
+        
+        Args:
+            bundle_path (str): Fichier à surveiller (par défaut, la source actuelle)
+            interval (float): Période de scrutation en secondes
+        """
+        if self._watcher is not None and self._watcher.is_alive():
+            return False
+        
+        self._watcher_stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch_loop,
+            args=(Path(bundle_path) if bundle_path else None,
+                  interval or HOT_RELOAD_CONFIG['poll_interval']),
+            name="model-watcher",
+            daemon=True
+        )
+        self._watcher.start()
+        logger.info("👀 Surveillance du modèle activée")
+        return True
+    
+    def stop_model_watcher(self):
+        """Arrête la surveillance du modèle"""
+        self._watcher_stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+    
+    def _watch_loop(self, bundle_path, interval):
+        """Boucle de scrutation du fichier du modèle"""
+        last_seen = self._mtime(bundle_path) if bundle_path else None
+        
+        while not self._watcher_stop.wait(interval):
+            watched = bundle_path or self.model_source
+            current = self._mtime(watched)
+            known = self._source_mtime if watched == self.model_source else last_seen
+            
+            if current is None or current == known:
+                continue
+            
+            last_seen = current
+            logger.info(f"🔔 Nouveau modèle détecté: {watched}")
+            self._reload(watched)
+    
+    def rebuild_prefilter(self):
+        """Reconstruit le préfiltre depuis le dataset et l'historique"""
+        if self.prefilter is None:
+            self.prefilter = KnownMessageFilter()
+        return self.prefilter.rebuild(self.db_manager)
+    
+    def get_prefilter_stats(self):
+        """Retourne le taux de succès du préfiltre"""
+        if self.prefilter is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.prefilter.get_stats()}
+    
+    def start_shadow(self, bundle_path=None):
+        """
+        Active le mode shadow : un modèle candidat score le trafic réel
+        en arrière-plan, sans effet sur les verdicts ni sur la latence
+        
+        Args:
+            bundle_path (str): Bundle du challenger (par défaut, SHADOW_CONFIG)
+        
+        Returns:
+            bool: Succès de l'activation
+        """
+        bundle_path = Path(bundle_path or SHADOW_CONFIG['bundle_path'])
+        if not bundle_path.exists():
+            logger.warning(f"⚠️ Mode shadow désactivé: challenger introuvable ({bundle_path})")
+            return False
+        
+        # Validation dans ce processus ; le challenger est rechargé par le
+        # processus de scoring
+        challenger = MLModel()
+        if not challenger.load_bundle(bundle_path) or not self._warm_up(challenger):
+            logger.error(f"❌ Mode shadow désactivé: challenger illisible ({bundle_path})")
+            return False
+        
+        self.stop_shadow()
+        shadow = ShadowScorer(bundle_path, challenger.version, self.db_manager.db_path)
+        shadow.start()
+        self.shadow = shadow
+        return True
+    
+    def stop_shadow(self):
+        """Désactive le mode shadow (les messages en file sont encore scorés)"""
+        shadow, self.shadow = self.shadow, None
+        if shadow is not None:
+            shadow.stop()
+    
+    def get_shadow_report(self, challenger_version=None):
+        """
+        Compare le challenger au modèle principal (accord, écarts, latence)
+        
+        Args:
+            challenger_version (str): Version à analyser (par défaut, toutes)
+        
+        Returns:
+            dict: État du scorer et comparaisons enregistrées
+        """
+        report = {'enabled': self.shadow is not None}
+        if self.shadow is not None:
+            report.update(self.shadow.get_stats())
+        report['comparisons'] = self.db_manager.get_shadow_report(challenger_version)
+        return report
+    
+    def get_model_cache_stats(self):
+        """Retourne les chargements, succès et évictions du cache de modèles"""
+        return self.model_cache.get_stats()
+    
+    def get_verdict_cache_stats(self):
+        """Retourne les succès, échecs et évictions du cache des verdicts"""
+        if self.verdict_cache is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.verdict_cache.get_stats()}
+    
+    def get_near_duplicate_stats(self):
+        """Retourne le taux de réutilisation et le nombre de campagnes détectées"""
+        if self.near_duplicates is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.near_duplicates.get_stats()}
+    
+    def submit_feedback(self, prediction_id, correct_label=None):
+        """
+        Signale une prédiction erronée
+        
+        Args:
+            prediction_id (int): Identifiant de la prédiction en base
+            correct_label (int): Label correct (par défaut, l'inverse de la prédiction)
+        
+        Returns:
+            bool: Succès de l'enregistrement
+        """
+        try:
+            prediction = self.db_manager.get_prediction(prediction_id)
+            if prediction is None:
+                logger.warning(f"⚠️ Prédiction {prediction_id} introuvable")
+                return False
+            
+            if correct_label is None:
+                correct_label = 1 - int(prediction['prediction'])
+            
+            feedback_id = self.db_manager.add_feedback(prediction_id, int(correct_label))
+            if feedback_id is None:
+                return False
+            
+            # Un message rejoué doit désormais recevoir le label corrigé
+            if self.prefilter is not None:
+                self.prefilter.add(prediction['message'], correct_label)
+            
+            # Toute la campagne du message hérite de la correction
+            if self.near_duplicates is not None:
+                self.near_duplicates.correct(prediction['message'], int(correct_label))
+            
+            self._queue_feedback([{
+                'id': feedback_id,
+                'prediction_id': prediction_id,
+                'correct_label': int(correct_label),
+                'message': prediction['message'],
+                'cleaned_message': prediction['cleaned_message']
+            }])
+            
+            if (ONLINE_LEARNING_CONFIG['enabled'] and
+                    len(self.pending_feedback) >= ONLINE_LEARNING_CONFIG['batch_size']):
+                self.apply_feedback()
+            
+            return True
+        
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de l'enregistrement de la correction: {e}")
+            self.db_manager.log_error('feedback_error', str(e))
+            return False
+    
+    def _queue_feedback(self, rows):
+        """
+        Ajoute des corrections à la file en mémoire
+        
+        La file est bornée par ONLINE_LEARNING_CONFIG['max_pending'] (modèle
+        sans partial_fit notamment) : les plus anciennes en sortent, mais
+        restent en base jusqu'au prochain réentraînement.
+        """
+        self.pending_feedback.extend(rows)
+        overflow = len(self.pending_feedback) - ONLINE_LEARNING_CONFIG['max_pending']
+        if overflow > 0:
+            del self.pending_feedback[:overflow]
+            logger.info(f"ℹ️ {overflow} corrections anciennes laissées en base "
+                        "(file d'apprentissage en ligne pleine)")
+    
+    def apply_feedback(self):
+        """
+        Applique les corrections en attente au modèle via partial_fit
+        
+        Returns:
+            int: Nombre de corrections appliquées
+        """
+        model = self.ml_model
+        if not self.pending_feedback or not model.supports_partial_fit():
+            return 0
+        
+        batch = self.pending_feedback
+        texts = [
+            row['cleaned_message'] or model.text_processor.clean_text(row['message'])
+            for row in batch
+        ]
+        labels = [row['correct_label'] for row in batch]
+        
+        if not model.partial_fit(texts, labels, already_cleaned=True):
+            return 0
+        
+        self.pending_feedback = []
+        self.applied_feedback.extend(batch)
+        
+        if model.online_updates % ONLINE_LEARNING_CONFIG['checkpoint_every'] == 0:
+            self.checkpoint_model()
+        
+        return len(batch)
+    
+    def checkpoint_model(self):
+        """
+        Enregistre le modèle mis à jour comme nouvelle version active du
+        registre et marque les corrections intégrées
+        
+        Le bundle chargé n'est jamais réécrit : s'il appartient au registre,
+        le modèle d'avant les corrections reste accessible par retour arrière.
+        """
+        if not self.applied_feedback:
+            return False
+        
+        with self._reload_lock:
+            # Après un retour arrière, les corrections repartent du même
+            # numéro de mise à jour : la nouvelle branche reçoit un suffixe
+            base_version, branch = self.ml_model.base_version, 1
+            while self.registry.is_registered(self.ml_model.version):
+                branch += 1
+                self.ml_model.base_version = f"{base_version}.{branch}"
+            
+            metadata = {'online_learning': {'feedback': len(self.applied_feedback)}}
+            version = self.registry.register(self.ml_model, metadata, activate=True)
+            if version is None:
+                return False
+            
+            # Le service suit désormais le bundle enregistré ; notre propre
+            # sauvegarde ne doit pas déclencher de rechargement
+            self.model_source = self.registry.get_bundle_path(version)
+            self._source_mtime = self._mtime(self.model_source)
+        
+        self.db_manager.mark_feedback_applied([row['id'] for row in self.applied_feedback])
+        logger.info(f"💾 Checkpoint du modèle {version} ({len(self.applied_feedback)} corrections)")
+        self.applied_feedback = []
+        return True
+    
+    def get_feedback_stats(self):
+        """Retourne l'état de l'apprentissage en ligne"""
+        return {
+            'pending': len(self.pending_feedback),
+            'applied_since_checkpoint': len(self.applied_feedback),
+            'online_updates': self.ml_model.online_updates,
+            'supports_partial_fit': self.ml_model.supports_partial_fit()
+        }
+    
+    def start_retraining(self, **options):
+        """
+        Lance un réentraînement en arrière-plan (un seul à la fois)
+        
+        Args:
+            **options: Voir RetrainJob (algorithm, use_csv, min_confidence, hot_swap)
+        
+        Returns:
+            RetrainJob: Job à interroger avec poll(), ou None si un job est déjà en cours
+        """
+        if self.retrain_job is not None and not self.retrain_job.done:
+            logger.warning("⚠️ Un réentraînement est déjà en cours")
+            return None
+        self.retrain_job = RetrainJob(self, **options).start()
+        return self.retrain_job
+    
+    def shutdown(self):
+        """Arrête la surveillance, applique et sauvegarde les corrections restantes"""
+        if self.retrain_job is not None and not self.retrain_job.done:
+            self.retrain_job.cancel()
+        if self.batcher is not None:
+            self.batcher.close()
+        self.stop_model_watcher()
+        self.stop_shadow()
+        if ONLINE_LEARNING_CONFIG['enabled']:
+            self.apply_feedback()
+        self.checkpoint_model()
+        if self.near_duplicates is not None:
+            self.near_duplicates.save()
+    
+    def explain(self, message, k=None):
+        """
+        Explique le verdict du modèle actuel pour un message
+        
+        Args:
+            message (str): Message brut
+            k (int): Nombre de tokens par sens
+        
+        Returns:
+            dict: Top-k tokens vers spam et vers ham, et version du modèle qui
+                  explique (model_version), ou None en cas d'erreur
+        """
+        model = self.ml_model
+        try:
+            explanation = model.explain(message, k)
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de l'explication: {e}")
+            return None
+        if explanation is not None:
+            explanation['model_version'] = model.version
+        return explanation
+    
     def get_model_info(self):
         """Retourne les informations du modèle"""
         return self.ml_model.get_model_info()
\ No newline at end of file
@@ -0,0 +1,169 @@
+# services/prefilter.py
+"""
+Préfiltre des messages déjà connus (dataset, historique, corrections)
+"""
+import hashlib
+import logging
+import re
+import time
+import unicodedata
+from datetime import datetime
+
+import pandas as pd
+
+from utils.bloom_filter import BloomFilter
+from models.prediction_result import PredictionResult
+from config.settings import PREFILTER_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Priorité des sources : une correction utilisateur l'emporte sur le
+# label du dataset, qui l'emporte sur une prédiction du modèle
+SOURCE_PRIORITY = {'history': 0, 'dataset': 1, 'feedback': 2}
+
+def normalize_message(message):
+    """Forme normalisée d'un message (casse, Unicode, espaces)"""
+    message = unicodedata.normalize('NFKC', message).lower()
+    return re.sub(r'\s+', ' ', message).strip()
+
+def message_digest(message):
+    """Empreinte de 16 octets du message normalisé"""
+    return hashlib.blake2b(normalize_message(message).encode('utf-8'), digest_size=16).digest()
+
+
+class KnownMessageFilter:
+    """Retourne immédiatement le verdict d'un message déjà étiqueté"""
+    
+    def __init__(self, capacity=None, error_rate=None):
+        """
+        Initialise un préfiltre vide
+        
+        Args:
+            capacity (int): Capacité du filtre de Bloom
+            error_rate (float): Taux de faux positifs visé
+        """
+        self.capacity = capacity or PREFILTER_CONFIG['bloom_capacity']
+        self.error_rate = error_rate or PREFILTER_CONFIG['bloom_error_rate']
+        
+        # (filtre de Bloom, table exacte empreinte -> (label, proba spam, source))
+        self._index = (BloomFilter(self.capacity, self.error_rate), {})
+        self.last_rebuild = None
+        self.reset_stats()
+    
+    def reset_stats(self):
+        """Réinitialise les compteurs"""
+        self.stats = {
+            'lookups': 0,
+            'bloom_rejects': 0,
+            'hits': 0,
+            'false_positives': 0
+        }
+    
+    @staticmethod
+    def _insert(index, digest, label, spam_probability, source):
+        """Insère une entrée en respectant la priorité des sources"""
+        bloom, table = index
+        current = table.get(digest)
+        if current is not None and SOURCE_PRIORITY[current[2]] > SOURCE_PRIORITY[source]:
+            return
+        if current is None:
+            bloom.add(digest)
+        table[digest] = (label, spam_probability, source)
+    
+    def rebuild(self, db_manager=None, dataset_path=None):
+        """
+        Reconstruit le préfiltre depuis le dataset et l'historique
+        
+        La nouvelle structure est construite à part puis substituée d'un bloc.
+        
+        Args:
+            db_manager (DatabaseManager): Source de l'historique des prédictions
+            dataset_path (str): CSV étiqueté (colonnes v1 = label, v2 = message)
+        
+        Returns:
+            int: Nombre de messages connus
+        """
+        start = time.perf_counter()
+        index = (BloomFilter(self.capacity, self.error_rate), {})
+        dataset_path = dataset_path or PREFILTER_CONFIG['dataset_path']
+        
+        try:
+            df = pd.read_csv(dataset_path, encoding='latin-1', usecols=['v1', 'v2'])
+            for label, message in zip(df['v1'], df['v2']):
+                spam = 1 if label == 'spam' else 0
+                self._insert(index, message_digest(message), spam, float(spam), 'dataset')
+        except Exception as e:
+            logger.warning(f"⚠️ Dataset ignoré par le préfiltre: {e}")
+        
+        if db_manager is not None:
+            for row in db_manager.iter_labeled_messages():
+                if row['correct_label'] is not None:
+                    label = int(row['correct_label'])
+                    self._insert(index, message_digest(row['message']), label,
+                                 float(label), 'feedback')
+                else:
+                    self._insert(index, message_digest(row['message']), int(row['prediction']),
+                                 float(row['spam_probability']), 'history')
+        
+        self._index = index
+        self.last_rebuild = datetime.now().isoformat()
+        logger.info(f"✅ Préfiltre reconstruit: {len(index[1])} messages connus "
+                    f"en {time.perf_counter() - start:.2f}s")
+        return len(index[1])
+    
+    def add(self, message, label, source='feedback'):
+        """Ajoute ou corrige un message connu"""
+        self._insert(self._index, message_digest(message), int(label), float(label), source)
+    
+    def lookup(self, message, model_version):
+        """
+        Cherche le verdict connu d'un message
+        
+        La source du verdict (dataset, historique, correction) est indiquée
+        par le tier ; la version est celle du modèle servi au même moment.
+        
+        Args:
+            message (str): Message brut
+            model_version (str): Version du modèle courant
+        
+        Returns:
+            PredictionResult: Résultat au format de MLModel.predict, ou None si inconnu
+        """
+        bloom, table = self._index
+        digest = message_digest(message)
+        self.stats['lookups'] += 1
+        
+        if digest not in bloom:
+            self.stats['bloom_rejects'] += 1
+            return None
+        
+        entry = table.get(digest)
+        if entry is None:
+            self.stats['false_positives'] += 1
+            return None
+        
+        self.stats['hits'] += 1
+        label, spam_probability, source = entry
+        return PredictionResult(
+            label, 1.0 - spam_probability, spam_probability, model_version,
+            original_message=message,
+            cleaned_message=None,
+            tier=f"prefilter-{source}"
+        )
+    
+    def get_stats(self):
+        """
+        Retourne les métriques du préfiltre
+        
+        Returns:
+            dict: Taux de succès, rejets du filtre de Bloom, taille mémoire
+        """
+        bloom, table = self._index
+        lookups = self.stats['lookups']
+        return {
+            **self.stats,
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+            'known_messages': len(table),
+            'bloom_bytes': bloom.nbytes,
+            'last_rebuild': self.last_rebuild
+        }
@@ -0,0 +1,258 @@
+# services/retrain_job.py
+"""
+Réentraînement en arrière-plan, dans un processus séparé
+
+Le processus de travail charge les exemples (training.history), entraîne,
+évalue et écrit un bundle ; il envoie sa progression (étape, pourcentage)
+dans une file. L'interface interroge le job avec poll() (via after()),
+sans jamais attendre : ni la boucle Tk ni les prédictions ne sont bloquées.
+Le bundle produit est enregistré dans le registre puis, si demandé,
+substitué à chaud au modèle du PredictionService.
+"""
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from config.settings import MODEL_CONFIG, RETRAIN_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Part de la progression atteinte à la fin de chaque étape
+STAGES = {'load': 50, 'train': 90, 'save': 100}
+
+class RetrainCancelled(Exception):
+    """Annulation demandée par l'interface"""
+
+
+def run_retraining(options, progress, cancel):
+    """
+    Corps du processus de travail
+    
+    Args:
+        options (dict): algorithm, use_csv, min_confidence, db_path, bundle_path
+        progress (multiprocessing.Queue): Messages de progression et résultat final
+        cancel (multiprocessing.Event): Annulation demandée
+    """
+    from sklearn.model_selection import train_test_split
+    
+    from database.db_manager import DatabaseManager
+    from models.ml_model import MLModel
+    from training.history import HistoryDataSource
+    
+    def report(stage, percent, message=''):
+        if cancel.is_set():
+            raise RetrainCancelled()
+        progress.put({'status': 'running', 'stage': stage, 'percent': percent, 'message': message})
+    
+    try:
+        report('load', 0, "Chargement des exemples")
+        source = HistoryDataSource(DatabaseManager(options['db_path']),
+                                   use_csv=options['use_csv'],
+                                   min_confidence=options['min_confidence'])
+        expected = max(source.estimate_rows(), 1)
+        texts, labels = [], []
+        for batch_texts, batch_labels, name in source.iter_batches():
+            texts.extend(batch_texts)
+            labels.extend(batch_labels.tolist())
+            read = sum(source.stats['read'].values())
+            report('load', min(read / expected, 1) * STAGES['load'],
+                   f"{len(texts)} exemples ({name})")
+        
+        if len(set(labels)) < 2:
+            raise ValueError("Il faut des exemples des deux classes")
+        
+        report('train', STAGES['load'], f"Entraînement sur {len(texts)} exemples")
+        X_train, X_test, y_train, y_test = train_test_split(
+            texts, labels,
+            test_size=MODEL_CONFIG['test_size'],
+            random_state=MODEL_CONFIG['random_state'],
+            stratify=labels
+        )
+        model = MLModel(options['algorithm'])
+        if not model.train(X_train, y_train, X_test, y_test):
+            raise RuntimeError("Échec de l'entraînement")
+        
+        report('save', STAGES['train'], "Écriture du bundle")
+        metadata = {'retrain': {key: source.stats[key] for key in ('read', 'kept', 'duplicates')}}
+        if not model.save_bundle(options['bundle_path'], metadata):
+            raise RuntimeError("Échec de l'écriture du bundle")
+        
+        progress.put({'status': 'trained', 'stage': 'save', 'percent': STAGES['save'],
+                      'bundle_path': options['bundle_path'], 'version': model.version,
+                      'metrics': model.metrics, 'metadata': metadata})
+    except RetrainCancelled:
+        progress.put({'status': 'cancelled'})
+    except Exception as e:
+        progress.put({'status': 'error', 'error': str(e)})
+
+
+class RetrainJob:
+    """Un réentraînement lancé depuis l'interface"""
+    
+    def __init__(self, prediction_service=None, registry=None, algorithm=None,
+                 use_csv=None, min_confidence=None, hot_swap=None):
+        """
+        Prépare le job (les valeurs absentes viennent de RETRAIN_CONFIG / MODEL_CONFIG)
+        
+        Args:
+            prediction_service (PredictionService): Service dont le modèle est remplacé
+            registry (ModelRegistry): Registre où le bundle est enregistré
+            algorithm (str): Clé de MLModel.ALGORITHMS
+            use_csv (bool): Fusionner le jeu de données avec l'historique
+            min_confidence (float): Confiance minimale d'un verdict non corrigé
+            hot_swap (bool): Activer le nouveau modèle dans prediction_service
+        """
+        config = RETRAIN_CONFIG
+        self.prediction_service = prediction_service
+        self.registry = registry or getattr(prediction_service, 'registry', None)
+        self.hot_swap = config['hot_swap'] if hot_swap is None else hot_swap
+        
+        output_dir = Path(config['output_dir'])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        db_manager = getattr(prediction_service, 'db_manager', None)
+        self.options = {
+            'algorithm': algorithm or config['algorithm'] or MODEL_CONFIG['algorithm'],
+            'use_csv': config['use_csv'] if use_csv is None else use_csv,
+            'min_confidence': min_confidence,
+            'db_path': str(db_manager.db_path) if db_manager is not None else None,
+            'bundle_path': str(output_dir / f"retrain_{datetime.now():%Y%m%d%H%M%S}.pkl")
+        }
+        
+        context = multiprocessing.get_context('spawn')
+        self._progress = context.Queue()
+        self._cancel = context.Event()
+        self._process = context.Process(
+            target=run_retraining,
+            args=(self.options, self._progress, self._cancel),
+            name="retrain",
+            daemon=True
+        )
+        self._finisher = None
+        self._started_at = None
+        self._cancel_at = None
+        self.state = {'status': 'pending', 'stage': None, 'percent': 0.0, 'message': '',
+                      'elapsed_s': 0.0, 'eta_s': None}
+    
+    def start(self):
+        """Lance le processus de travail"""
+        self._started_at = time.monotonic()
+        self._process.start()
+        self.state['status'] = 'running'
+        logger.info(f"🔁 Réentraînement lancé ({self.options['algorithm']}, pid {self._process.pid})")
+        return self
+    
+    @property
+    def done(self):
+        return self.state['status'] in ('finished', 'cancelled', 'error')
+    
+    def poll(self):
+        """
+        Lit la progression sans bloquer (à appeler depuis after())
+        
+        Returns:
+            dict: status (running, registering, finished, cancelled, error), stage,
+                  percent, message, elapsed_s, eta_s, et version / metrics à la fin
+        """
+        if self._started_at is None or self.done:
+            return self.state
+        
+        self._drain()
+        if self.state['status'] == 'running':
+            if not self._process.is_alive():
+                # Derniers messages écrits juste avant la fin du processus
+                self._drain()
+                if self.state['status'] == 'running':
+                    self._fail("Le processus de réentraînement s'est arrêté")
+            elif (self._cancel_at is not None
+                  and time.monotonic() - self._cancel_at > RETRAIN_CONFIG['cancel_grace_s']):
+                # Étape longue (entraînement) : l'annulation n'attend pas sa fin
+                self._process.terminate()
+                self._set_status('cancelled')
+        
+        elapsed = time.monotonic() - self._started_at
+        percent = self.state['percent']
+        self.state['elapsed_s'] = elapsed
+        self.state['eta_s'] = (elapsed * (100 - percent) / percent
+                               if self.state['status'] == 'running' and percent > 0 else None)
+        return self.state
+    
+    def _drain(self):
+        """Traite les messages reçus depuis le dernier poll"""
+        while self.state['status'] == 'running':
+            try:
+                message = self._progress.get_nowait()
+            except queue.Empty:
+                break
+            self._handle(message)
+    
+    def _handle(self, message):
+        status = message.pop('status')
+        self.state.update(message)
+        if status == 'running':
+            return
+        if status == 'trained':
+            # Enregistrement et substitution hors du thread de l'interface
+            self.state['status'] = 'registering'
+            self.state['message'] = "Enregistrement du modèle"
+            self._finisher = threading.Thread(target=self._finish, name="retrain-finish",
+                                              daemon=True)
+            self._finisher.start()
+        elif status == 'error':
+            self._fail(message['error'])
+        else:
+            self._set_status(status)
+    
+    def _finish(self):
+        """Enregistre le bundle produit et, si demandé, l'active à chaud"""
+        try:
+            bundle_path = self.state['bundle_path']
+            version = self.state['version']
+            if self.registry is not None:
+                version = self.registry.register_bundle(bundle_path, self.state.get('metadata'))
+                if version is None:
+                    raise RuntimeError("Échec de l'enregistrement dans le registre")
+            
+            activated = False
+            if self.hot_swap and self.prediction_service is not None:
+                activated = (self.prediction_service.activate_model(version)
+                             if self.registry is not None
+                             else self.prediction_service.reload_model(bundle_path, background=False))
+                if not activated:
+                    raise RuntimeError("Échec de l'activation du nouveau modèle")
+            
+            self.state.update({'version': version, 'activated': activated})
+            self._set_status('finished')
+            logger.info(f"✅ Réentraînement terminé : modèle {version}"
+                        f"{' activé' if activated else ''}")
+        except Exception as e:
+            self._fail(str(e))
+    
+    def cancel(self):
+        """Demande l'annulation (effective au prochain poll)"""
+        if self.done or self.state['status'] == 'registering':
+            return False
+        self._cancel.set()
+        self._cancel_at = time.monotonic()
+        self.state['message'] = "Annulation..."
+        logger.info("⏹️ Annulation du réentraînement demandée")
+        return True
+    
+    def _set_status(self, status):
+        self.state['status'] = status
+        if status == 'cancelled':
+            self.state['message'] = "Réentraînement annulé"
+            logger.info("⏹️ Réentraînement annulé")
+    
+    def _fail(self, error):
+        self.state.update({'status': 'error', 'error': error, 'message': error})
+        logger.error(f"❌ Erreur réentraînement: {error}")
+    
+    def join(self, timeout=None):
+        """Attend la fin du processus (et de l'enregistrement)"""
+        self._process.join(timeout)
+        if self._finisher is not None:
+            self._finisher.join(timeout)
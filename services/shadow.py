@@ -0,0 +1,176 @@
+# services/shadow.py
+"""
+Mode shadow : un modèle challenger score le trafic réel en arrière-plan
+
+Le challenger tourne dans un processus séparé, à priorité abaissée : il ne
+partage pas le GIL du processus de l'interface et la latence des
+prédictions servies à l'utilisateur reste inchangée.
+"""
+import logging
+import multiprocessing
+import os
+import queue
+import time
+
+import numpy as np
+
+from config.settings import SHADOW_CONFIG
+from models.ml_model import feature_fingerprint
+
+logger = logging.getLogger(__name__)
+
+def _shadow_worker(bundle_path, db_path, items, stop, counters, batch_size):
+    """Boucle du processus challenger : score les messages par lots"""
+    # Imports locaux : le processus est démarré en mode spawn
+    from models.ml_model import MLModel
+    from database.db_manager import DatabaseManager
+    
+    if hasattr(os, 'nice'):
+        os.nice(10)
+    
+    challenger = MLModel()
+    if not challenger.load_bundle(bundle_path):
+        counters['errors'].value += 1
+        return
+    
+    version = challenger.version
+    own_fingerprint = feature_fingerprint(challenger.vectorizer)
+    db_manager = DatabaseManager(db_path)
+    
+    while not stop.is_set() or not items.empty():
+        try:
+            batch = [items.get(timeout=0.5)]
+        except queue.Empty:
+            continue
+        
+        while len(batch) < batch_size:
+            try:
+                batch.append(items.get_nowait())
+            except queue.Empty:
+                break
+        
+        rows = []
+        try:
+            for (prediction_id, primary_version, primary_prediction, primary_spam,
+                 primary_latency, cleaned, vectorized, fingerprint) in batch:
+                # La ligne TF-IDF du modèle principal est réutilisée si le
+                # challenger a le même vocabulaire et les mêmes IDF
+                start = time.perf_counter()
+                if vectorized is None or fingerprint != own_fingerprint:
+                    vectorized = challenger.vectorizer.transform([cleaned])
+                probabilities = challenger.model.predict_proba(vectorized)[0]
+                latency_ms = (time.perf_counter() - start) * 1000
+                
+                rows.append((
+                    prediction_id, primary_version, version, primary_prediction, primary_spam,
+                    primary_latency, int(np.argmax(probabilities)), float(probabilities[1]),
+                    latency_ms
+                ))
+            db_manager.add_shadow_predictions(rows)
+            counters['scored'].value += len(rows)
+        except Exception as e:
+            counters['errors'].value += 1
+            logger.error(f"❌ Erreur scoring shadow: {e}")
+
+
+class ShadowScorer:
+    """Score les messages du modèle principal avec un challenger, hors du chemin de requête"""
+    
+    def __init__(self, bundle_path, challenger_version, db_path=None,
+                 queue_size=None, batch_size=None):
+        """
+        Initialise le scorer (le processus est démarré par start)
+        
+        Args:
+            bundle_path (str): Bundle du modèle candidat, chargé par le processus
+            challenger_version (str): Version du candidat (pour les rapports)
+            db_path (str): Base où écrire les verdicts
+            queue_size (int): Taille maximale de la file ; au-delà, les messages sont ignorés
+            batch_size (int): Messages scorés et écrits par lot
+        """
+        self.bundle_path = str(bundle_path)
+        self.challenger_version = challenger_version
+        self.db_path = str(db_path) if db_path else None
+        self.batch_size = batch_size or SHADOW_CONFIG['batch_size']
+        
+        self._context = multiprocessing.get_context('spawn')
+        self._queue = self._context.Queue(maxsize=queue_size or SHADOW_CONFIG['queue_size'])
+        # Ne jamais bloquer la fermeture de l'application sur la file
+        self._queue.cancel_join_thread()
+        self._stop = self._context.Event()
+        self._counters = {
+            'scored': self._context.Value('i', 0),
+            'errors': self._context.Value('i', 0)
+        }
+        self._process = None
+        # id(vectorizer) -> (vectorizer, empreinte)
+        self._fingerprints = {}
+        self.stats = {'submitted': 0, 'dropped': 0}
+    
+    def start(self):
+        """Démarre le processus de scoring"""
+        self._stop.clear()
+        self._process = self._context.Process(
+            target=_shadow_worker,
+            args=(self.bundle_path, self.db_path, self._queue, self._stop,
+                  self._counters, self.batch_size),
+            name="shadow-scorer",
+            daemon=True
+        )
+        self._process.start()
+        logger.info(f"👥 Mode shadow activé (challenger {self.challenger_version})")
+    
+    def stop(self, timeout=10):
+        """Arrête le processus après avoir traité la file"""
+        self._stop.set()
+        if self._process is not None:
+            self._process.join(timeout=timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+    
+    def _fingerprint(self, vectorizer):
+        """Empreinte d'un vectorizer, calculée une seule fois par instance"""
+        cached = self._fingerprints.get(id(vectorizer))
+        if cached is None or cached[0] is not vectorizer:
+            cached = (vectorizer, feature_fingerprint(vectorizer))
+            self._fingerprints[id(vectorizer)] = cached
+        return cached[1]
+    
+    def submit(self, result, vectorized, vectorizer, primary_latency_ms=None):
+        """
+        Met en file un message déjà scoré par le modèle principal
+        
+        Ne bloque jamais : si la file est pleine, le message est ignoré.
+        
+        Args:
+            result (dict): Résultat du modèle principal (avec cleaned_message)
+            vectorized: Ligne TF-IDF calculée par le modèle principal, ou None
+            vectorizer: Vectorizer qui a produit cette ligne
+            primary_latency_ms (float): Latence du modèle principal
+        """
+        item = (
+            result.get('id'),
+            result['model_version'],
+            result['prediction'],
+            result['probabilities']['spam'],
+            primary_latency_ms,
+            result['cleaned_message'],
+            vectorized,
+            self._fingerprint(vectorizer)
+        )
+        try:
+            self._queue.put_nowait(item)
+            self.stats['submitted'] += 1
+        except queue.Full:
+            self.stats['dropped'] += 1
+    
+    def get_stats(self):
+        """Retourne les compteurs du scorer"""
+        return {
+            **self.stats,
+            'scored': self._counters['scored'].value,
+            'errors': self._counters['errors'].value,
+            'challenger_version': self.challenger_version,
+            'running': self._process is not None and self._process.is_alive()
+        }
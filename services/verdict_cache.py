@@ -0,0 +1,134 @@
+# services/verdict_cache.py
+"""
+Cache des verdicts du modèle principal pour les messages répétés
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from config.settings import VERDICT_CACHE_CONFIG
+from .prefilter import message_digest
+
+class VerdictCache:
+    """
+    Verdicts récents indexés par (empreinte du message normalisé, version du modèle)
+    
+    La version fait partie de la clé : un verdict d'un autre modèle (rechargé,
+    ou mis à jour en ligne) n'est jamais retourné. Les entrées expirent après
+    ttl_seconds et les moins récemment utilisées sont évincées au-delà de
+    max_entries.
+    """
+    
+    def __init__(self, max_entries=None, ttl_seconds=None):
+        """
+        Initialise un cache vide
+        
+        Args:
+            max_entries (int): Nombre maximal de verdicts conservés
+            ttl_seconds (float): Durée de vie d'un verdict (None : illimitée)
+        """
+        self.max_entries = max_entries or VERDICT_CACHE_CONFIG['max_entries']
+        self.ttl = ttl_seconds if ttl_seconds is not None else VERDICT_CACHE_CONFIG['ttl_seconds']
+        
+        # (empreinte, version) -> (PredictionResult, date d'expiration), du moins au plus récent
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.reset_stats()
+    
+    def reset_stats(self):
+        """Réinitialise les compteurs"""
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0
+        }
+    
+    def get(self, message, model_version):
+        """
+        Retourne le verdict en cache pour ce message et cette version
+        
+        Args:
+            message (str): Message brut
+            model_version (str): Version du modèle courant
+        
+        Returns:
+            PredictionResult: Copie du verdict (sans id ni horodatage, et sans
+                              explication si elle n'avait pas été calculée), ou None
+        """
+        key = (message_digest(message), model_version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            
+            result, expires_at = entry
+            if expires_at is not None and time.monotonic() > expires_at:
+                del self._entries[key]
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+        
+        # Chaque appelant reçoit sa propre copie (id, horodatage, message)
+        return result.copy()
+    
+    def put(self, message, model_version, result):
+        """
+        Met en cache le verdict d'un message
+        
+        Args:
+            message (str): Message brut
+            model_version (str): Version du modèle principal (celle passée à get)
+            result (PredictionResult): Verdict du modèle
+        """
+        key = (message_digest(message), model_version)
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        cached = result.copy()
+        cached.id = cached.timestamp = None
+        # Ne retenir ni la matrice TF-IDF de tout le lot ni le modèle
+        cached.detach()
+        
+        with self._lock:
+            self._entries[key] = (cached, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+    
+    def clear(self):
+        """
+        Vide le cache (rechargement du modèle, changement de cascade)
+        
+        Returns:
+            int: Nombre de verdicts retirés
+        """
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            self.stats['invalidations'] += removed
+            return removed
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def get_stats(self):
+        """
+        Retourne les métriques du cache
+        
+        Returns:
+            dict: Succès, échecs, évictions, expirations, taux de succès et taille
+        """
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl
+            }
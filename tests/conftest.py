@@ -0,0 +1,85 @@
+# tests/conftest.py
+"""
+Fixtures communes : base SQLite et chemins de travail isolés dans tmp_path
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import settings
+from database.db_manager import DatabaseManager
+from models.ml_model import MLModel
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Base de données vide"""
+    return DatabaseManager(tmp_path / "test.db")
+
+
+def add_prediction(db, message, prediction=1, confidence=0.9):
+    """Enregistre une prédiction minimale et retourne son identifiant"""
+    return db.add_prediction(
+        message=message,
+        cleaned_message=message.lower(),
+        prediction=prediction,
+        confidence=confidence,
+        ham_prob=1 - confidence if prediction else confidence,
+        spam_prob=confidence if prediction else 1 - confidence,
+        model_version='test'
+    )
+
+
+def history_rows(count, prefix="message existant"):
+    """Lignes pour add_predictions"""
+    return [(f"{prefix} {i}", f"{prefix} {i}", i % 2, 0.8, 0.2, 0.8, 'test', None)
+            for i in range(count)]
+
+
+@pytest.fixture(scope='session')
+def corpus():
+    """Premiers messages du jeu de données : (messages bruts, labels)"""
+    df = pd.read_csv(settings.DATA_DIR / "spam.csv", encoding='latin-1', nrows=800)
+    return list(df['v2']), (df['v1'] == 'spam').astype(int).to_numpy()
+
+
+def train_model(corpus, algorithm='naive_bayes', max_features=500, version=None):
+    """MLModel entraîné sur le corpus de test"""
+    messages, labels = corpus
+    model = MLModel(algorithm, max_features=max_features)
+    assert model.train(model.text_processor.clean_batch(messages), labels)
+    if version is not None:
+        model.base_version = version
+    return model
+
+
+@pytest.fixture
+def isolated(tmp_path, monkeypatch):
+    """Redirige base, bundles, registre, index et rapports vers tmp_path ; préfiltre, shadow et surveillance coupés"""
+    monkeypatch.setitem(settings.DATABASE_CONFIG, 'db_path', tmp_path / "app.db")
+    monkeypatch.setitem(settings.HOT_RELOAD_CONFIG, 'bundle_path', tmp_path / "bundle.pkl")
+    monkeypatch.setitem(settings.HOT_RELOAD_CONFIG, 'watch_enabled', False)
+    monkeypatch.setitem(settings.REGISTRY_CONFIG, 'registry_dir', tmp_path / "registry")
+    monkeypatch.setitem(settings.MODEL_CACHE_CONFIG, 'bundle_dir', tmp_path / "tenants")
+    monkeypatch.setitem(settings.NEAR_DUPLICATE_CONFIG, 'index_path', tmp_path / "near_duplicates.npz")
+    monkeypatch.setitem(settings.EVALUATION_CONFIG, 'output_dir', tmp_path / "evaluation")
+    monkeypatch.setitem(settings.CASCADE_CONFIG, 'secondary_model_path', tmp_path / "secondary.pkl")
+    monkeypatch.setitem(settings.CASCADE_CONFIG, 'enabled', False)
+    monkeypatch.setitem(settings.PREFILTER_CONFIG, 'enabled', False)
+    monkeypatch.setitem(settings.SHADOW_CONFIG, 'enabled', False)
+    return tmp_path
+
+
+@pytest.fixture
+def service(isolated, corpus):
+    """PredictionService sur un modèle Naive Bayes de test (bundle par défaut)"""
+    from services.prediction_service import PredictionService
+    
+    train_model(corpus, version='test-1').save_bundle(isolated / "bundle.pkl")
+    service = PredictionService()
+    yield service
+    service.shutdown()
@@ -0,0 +1,21 @@
+# tests/test_cascade.py
+from conftest import train_model
+from train import train_cascade_secondary
+
+
+def test_cascade_accepts_secondary_trained_on_primary_vectorizer(service, corpus, isolated):
+    messages, labels = corpus
+    path = train_cascade_secondary(messages, labels, primary=service.ml_model,
+                                   output_path=isolated / "secondary.pkl")
+    
+    assert service.enable_cascade(path)
+    assert service.cascade.secondary.vectorizer is service.ml_model.vectorizer
+    assert service.predict("WIN a FREE prize now, call 0800", save_to_db=False) is not None
+
+
+def test_cascade_rejects_secondary_with_another_vectorizer(service, corpus, isolated):
+    other = train_model(corpus, algorithm='logistic_regression', max_features=300)
+    other.save_bundle(isolated / "secondary.pkl")
+    
+    assert not service.enable_cascade(isolated / "secondary.pkl")
+    assert service.cascade is None
@@ -0,0 +1,72 @@
+# tests/test_db_manager.py
+from conftest import add_prediction, history_rows
+
+
+def test_add_prediction_returns_its_own_id(db):
+    # Historique écrit en un lot : les identifiants des prédictions et de la
+    # table statistics ne progressent plus au même rythme
+    db.add_predictions(history_rows(5))
+    
+    for i in range(3):
+        message = f"nouveau message {i}"
+        prediction_id = add_prediction(db, message)
+        assert db.get_prediction(prediction_id)['message'] == message
+
+
+def test_add_predictions_returns_ids_in_order(db):
+    add_prediction(db, "message existant")
+    rows = history_rows(4, prefix="lot")
+    
+    ids = db.add_predictions(rows)
+    
+    assert [db.get_prediction(i)['message'] for i in ids] == [row[0] for row in rows]
+
+
+def test_feedback_points_to_the_corrected_message(db):
+    db.add_predictions(history_rows(5))
+    prediction_id = add_prediction(db, "message corrigé", prediction=1)
+    
+    db.add_feedback(prediction_id, 0)
+    
+    [feedback] = db.get_pending_feedback()
+    assert feedback['prediction_id'] == prediction_id
+    assert feedback['message'] == "message corrigé"
+    assert feedback['correct_label'] == 0
+
+
+def test_manager_can_be_shared_between_threads(db):
+    import threading
+    
+    db.add_predictions(history_rows(5))
+    errors, written = [], {}
+    
+    def worker(name):
+        try:
+            for i in range(50):
+                assert len(db.get_predictions(limit=5)) == 5
+                message = f"{name} {i}"
+                written[add_prediction(db, message)] = message
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=worker, args=(f"thread {n}",)) for n in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    assert len(written) == 100
+    assert all(db.get_prediction(i)['message'] == message for i, message in written.items())
+
+
+def test_active_model_keeps_its_activation_history(db, tmp_path):
+    for version in ('v1', 'v2'):
+        db.add_model_info(version, 'naive_bayes', 0.9, 0.9, 0.9, 0.9, None, tmp_path / version)
+        db.set_active_model(version)
+    
+    assert not db.delete_model_info('v2')
+    assert [row['model_version'] for row in db.get_activation_history()] == ['v2', 'v1']
+    
+    assert db.delete_model_info('v1')
+    assert [row['model_version'] for row in db.get_activation_history()] == ['v2']
@@ -0,0 +1,74 @@
+# tests/test_evaluation.py
+import json
+import sys
+
+import numpy as np
+import pytest
+
+from config.settings import EVALUATION_CONFIG
+from training.evaluation import build_evaluation, write_evaluation
+
+
+def scored_sample(size=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    y_true = rng.integers(0, 2, size)
+    spam_scores = np.clip(y_true * 0.6 + rng.random(size) * 0.5, 0, 1)
+    return y_true, spam_scores
+
+
+def test_metrics_and_thinned_curves(monkeypatch):
+    monkeypatch.setitem(EVALUATION_CONFIG, 'curve_points', 50)
+    y_true = [0, 0, 1, 1, 1]
+    y_pred = [0, 1, 1, 1, 0]
+    
+    evaluation = build_evaluation(y_true, y_pred, timings={'train_s': 1.5}, name="NB")
+    assert evaluation['confusion_matrix'] == [[1, 1], [1, 2]]
+    assert evaluation['metrics']['precision'] == pytest.approx(2 / 3)
+    assert evaluation['metrics']['recall'] == pytest.approx(2 / 3)
+    assert 'curves' not in evaluation
+    
+    y_true, spam_scores = scored_sample()
+    evaluation = build_evaluation(y_true, spam_scores > 0.5, spam_scores)
+    roc = evaluation['curves']['roc']
+    assert len(roc['fpr']) == len(roc['tpr']) <= 50
+    # Les extrémités des courbes sont conservées
+    assert (roc['fpr'][0], roc['tpr'][0], roc['fpr'][-1], roc['tpr'][-1]) == (0, 0, 1, 1)
+    assert 0.5 < evaluation['metrics']['roc_auc'] <= 1
+
+
+def test_report_is_written_without_figures(isolated):
+    y_true, spam_scores = scored_sample()
+    evaluation = build_evaluation(y_true, spam_scores > 0.5, spam_scores, name="Naive Bayes")
+    
+    paths = write_evaluation(evaluation, render=False)
+    
+    assert list(paths) == ['report']
+    assert paths['report'] == isolated / "evaluation" / "Naive_Bayes_evaluation.json"
+    report = json.loads(paths['report'].read_text(encoding='utf-8'))
+    assert report['figures'] == {}
+    assert report['metrics'] == pytest.approx(evaluation['metrics'])
+
+
+def test_figures_are_rendered_as_png_files(isolated):
+    pytest.importorskip('matplotlib')
+    y_true, spam_scores = scored_sample()
+    evaluation = build_evaluation(y_true, spam_scores > 0.5, spam_scores, name="svm")
+    
+    paths = write_evaluation(evaluation, isolated / "figures", render=True)
+    
+    assert set(paths) == {'report', 'confusion_matrix', 'precision_recall', 'roc'}
+    for name in ('confusion_matrix', 'precision_recall', 'roc'):
+        assert paths[name].read_bytes()[:8] == b'\x89PNG\r\n\x1a\n'
+    report = json.loads(paths['report'].read_text(encoding='utf-8'))
+    assert report['figures']['roc'] == str(paths['roc'])
+    assert 'render_s' in report['timings']
+
+
+def test_missing_matplotlib_only_skips_the_figures(isolated, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'matplotlib', None)
+    evaluation = build_evaluation([0, 1], [0, 1], [0.2, 0.8], name="lr")
+    
+    paths = write_evaluation(evaluation, render=True)
+    
+    assert list(paths) == ['report']
+    assert paths['report'].exists()
@@ -0,0 +1,56 @@
+# tests/test_history.py
+from conftest import add_prediction
+
+from training.history import HistoryDataSource
+
+
+def labels_by_text(source):
+    texts, labels = source.load()
+    return dict(zip(texts, labels))
+
+
+def test_feedback_wins_over_dataset_and_history(db, tmp_path):
+    csv_path = tmp_path / "dataset.csv"
+    csv_path.write_text("label,message\nspam,Claim your prize now\nham,See you at lunch\n",
+                        encoding='latin-1')
+    # Verdict confiant mais faux, corrigé par l'utilisateur
+    corrected = add_prediction(db, "Claim your prize now", prediction=1, confidence=0.99)
+    db.add_feedback(corrected, 0)
+    # Verdict non corrigé, en désaccord avec le jeu de données
+    add_prediction(db, "See you at lunch", prediction=1, confidence=0.99)
+    
+    source = HistoryDataSource(db, csv_path=csv_path, min_confidence=0.9)
+    labels = labels_by_text(source)
+    
+    processor = source.text_processor
+    assert labels[processor.clean_text("Claim your prize now")] == 0
+    assert labels[processor.clean_text("See you at lunch")] == 0
+    assert source.stats['duplicates'] == 2
+
+
+def test_newest_correction_of_a_message_wins(db):
+    first = add_prediction(db, "Call me back", prediction=1)
+    second = add_prediction(db, "Call me back", prediction=1)
+    db.add_feedback(first, 1)
+    # Le message est corrigé à nouveau plus tard, sur sa seconde prédiction
+    db.add_feedback(second, 0)
+    
+    source = HistoryDataSource(db, use_csv=False)
+    labels = labels_by_text(source)
+    
+    assert list(labels.values()) == [0]
+
+
+def test_stored_cleaned_text_is_reused_until_the_cleaner_version_changes(db, monkeypatch):
+    from models import text_processor
+    
+    processor = text_processor.TextProcessor()
+    fingerprint = processor.fingerprint
+    db.add_prediction(message="Call me back later", cleaned_message="texte stocké",
+                      prediction=0, confidence=0.99, ham_prob=0.99, spam_prob=0.01,
+                      model_version='test', cleaner_version=fingerprint)
+    assert list(labels_by_text(HistoryDataSource(db, use_csv=False))) == ["texte stocké"]
+    
+    monkeypatch.setattr(text_processor, 'CLEANER_VERSION', text_processor.CLEANER_VERSION + 1)
+    
+    assert list(labels_by_text(HistoryDataSource(db, use_csv=False))) == [processor.clean_text("Call me back later")]
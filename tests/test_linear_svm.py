@@ -0,0 +1,46 @@
+# tests/test_linear_svm.py
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import brier_score_loss
+from sklearn.svm import LinearSVC
+
+from conftest import train_model
+from models.linear_svm import CalibratedLinearSVC
+from models.text_processor import TextProcessor
+
+
+def test_probabilities_are_calibrated_on_held_out_messages(corpus):
+    messages, labels = corpus
+    cleaned = TextProcessor().clean_batch(messages)
+    vectorizer = TfidfVectorizer(max_features=500).fit(cleaned[:600])
+    X_train, X_test = vectorizer.transform(cleaned[:600]), vectorizer.transform(cleaned[600:])
+    y_test = labels[600:]
+    
+    svm = CalibratedLinearSVC().fit(X_train, labels[:600])
+    proba = svm.predict_proba(X_test)
+    
+    np.testing.assert_allclose(proba.sum(axis=1), 1.0)
+    assert (svm.predict(X_test) == (proba[:, 1] >= 0.5)).all()
+    # La calibration conserve l'ordre des scores du SVM
+    order = np.argsort(svm.decision_function(X_test))
+    assert (np.diff(proba[order, 1]) >= 0).all()
+    # ... et corrige leur échelle : proportion de spam et score de Brier
+    assert abs(proba[:, 1].mean() - y_test.mean()) < 0.03
+    raw = 1.0 / (1.0 + np.exp(-svm.decision_function(X_test)))
+    assert brier_score_loss(y_test, proba[:, 1]) < brier_score_loss(y_test, raw)
+
+
+def test_warm_start_converges_to_the_liblinear_solution(corpus):
+    model = train_model(corpus, 'svm')
+    X = model.vectorizer.transform(model.text_processor.clean_batch(corpus[0]))
+    labels = corpus[1]
+    svm = model.model
+    svm.set_params(warm_start=True)
+    # Point de départ : solution sur une partie des données seulement
+    svm.fit(X[:400], labels[:400])
+    
+    svm.fit(X, labels)
+    
+    reference = LinearSVC(C=svm.C, dual='auto').fit(X, labels)
+    np.testing.assert_allclose(svm.coef_, reference.coef_, atol=5e-3)
+    np.testing.assert_allclose(svm.intercept_, reference.intercept_, atol=5e-3)
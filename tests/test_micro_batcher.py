@@ -0,0 +1,93 @@
+# tests/test_micro_batcher.py
+import asyncio
+
+import pytest
+
+from services.micro_batcher import MicroBatcher
+
+
+class RecordingHandler:
+    """Handler qui garde les lots reçus et peut échouer sur un élément donné"""
+    
+    def __init__(self, fail_on=None):
+        self.batches = []
+        self.fail_on = fail_on
+    
+    def __call__(self, items):
+        self.batches.append(list(items))
+        if self.fail_on in items:
+            raise ValueError(f"élément refusé: {self.fail_on}")
+        return [item * 10 for item in items]
+
+
+def gather(batcher, items):
+    async def main():
+        try:
+            return await asyncio.gather(*(batcher.submit(item) for item in items),
+                                        return_exceptions=True)
+        finally:
+            batcher.close()
+    return asyncio.run(main())
+
+
+def test_concurrent_requests_are_batched_and_answered_in_order():
+    handler = RecordingHandler()
+    batcher = MicroBatcher(handler, max_batch_size=4, max_wait_ms=10)
+    
+    results = gather(batcher, range(10))
+    
+    assert results == [item * 10 for item in range(10)]
+    # Les requêtes arrivées pendant un lot partent ensemble, dans l'ordre d'arrivée
+    assert handler.batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    stats = batcher.get_stats()
+    assert (stats['requests'], stats['batches'], stats['full_batches']) == (10, 3, 2)
+    assert stats['avg_batch_size'] == pytest.approx(10 / 3)
+
+
+def test_isolated_request_is_sent_without_waiting():
+    handler = RecordingHandler()
+    batcher = MicroBatcher(handler, max_batch_size=64, max_wait_ms=1000)
+    
+    async def main():
+        try:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            result = await batcher.submit(7)
+            return result, loop.time() - start
+        finally:
+            batcher.close()
+    result, elapsed = asyncio.run(main())
+    
+    assert result == 70
+    assert handler.batches == [[7]]
+    assert elapsed < 0.5
+
+
+def test_handler_error_fails_only_its_batch():
+    handler = RecordingHandler(fail_on=1)
+    batcher = MicroBatcher(handler, max_batch_size=2, max_wait_ms=10)
+    
+    results = gather(batcher, range(4))
+    
+    assert [type(result) for result in results[:2]] == [ValueError, ValueError]
+    assert results[2:] == [20, 30]
+    assert batcher.get_stats()['errors'] == 1
+
+
+def test_predict_async_matches_predict_and_keeps_the_request_order(service, corpus):
+    messages = corpus[0][:40]
+    expected = [result['prediction'] for result in service.ml_model.predict_batch(messages)]
+    
+    async def main():
+        return await asyncio.gather(*(service.predict_async(message, save_to_db=i % 2 == 0)
+                                      for i, message in enumerate(messages)))
+    results = asyncio.run(main())
+    
+    assert [result['original_message'] for result in results] == messages
+    assert [result['prediction'] for result in results] == expected
+    saved = [result['id'] for result in results[::2]]
+    assert all(saved) and saved == sorted(saved)
+    assert all(result.get('id') is None for result in results[1::2])
+    stats = service.get_batching_stats()
+    assert stats['requests'] == len(messages)
+    assert stats['batches'] < len(messages)
@@ -0,0 +1,64 @@
+# tests/test_ml_model.py
+import pytest
+from sklearn.metrics import f1_score
+
+from config.settings import MODEL_CONFIG
+from models.ml_model import MLModel
+
+
+def check_f1(model, texts, labels):
+    return f1_score(labels, model.model.predict(model.vectorizer.transform(texts)))
+
+
+def test_weighted_replay_keeps_held_out_f1(corpus, monkeypatch):
+    # Réservoir bien plus petit que l'archive ; contrôle désactivé : seule
+    # la mise à jour incrémentale est évaluée
+    monkeypatch.setitem(MODEL_CONFIG, 'replay_size', 50)
+    monkeypatch.setitem(MODEL_CONFIG, 'warm_f1_tolerance', float('inf'))
+    messages, labels = corpus
+    model = MLModel('logistic_regression', max_features=500)
+    texts = model.text_processor.clean_batch(messages)
+    X_check, y_check = texts[700:], labels[700:]
+    assert model.train(texts[:500], labels[:500])
+    before = check_f1(model, X_check, y_check)
+    
+    assert model.train(texts[:700], labels[:700], X_check, y_check, warm_start=True)
+    
+    assert model.trained_samples == 700
+    assert check_f1(model, X_check, y_check) >= before - 0.01
+
+
+@pytest.mark.parametrize('algorithm', ['logistic_regression', 'svm'])
+def test_warm_start_updates_linear_models_without_a_full_refit(corpus, monkeypatch, algorithm):
+    messages, labels = corpus
+    model = MLModel(algorithm, max_features=500)
+    texts = model.text_processor.clean_batch(messages)
+    assert model.train(texts[:600], labels[:600])
+    previous = model.model
+    
+    def full_refit(*args):
+        raise AssertionError("réentraînement complet")
+    monkeypatch.setattr(model, '_cold_fit', full_refit)
+    
+    assert model.train(texts, labels, warm_start=True)
+    
+    assert model.model is not previous
+    assert model.model.get_params()['warm_start']
+    assert model.trained_samples == len(labels)
+
+
+def test_warm_start_refits_the_archive_when_check_f1_drops(corpus, monkeypatch):
+    # Toute mise à jour est jugée en baisse
+    monkeypatch.setitem(MODEL_CONFIG, 'warm_f1_tolerance', -1.0)
+    messages, labels = corpus
+    model = MLModel('svm', max_features=500)
+    texts = model.text_processor.clean_batch(messages)
+    assert model.train(texts[:600], labels[:600])
+    refits = []
+    cold_fit = model._cold_fit
+    monkeypatch.setattr(model, '_cold_fit', lambda *args: refits.append(len(args[1])) or cold_fit(*args))
+    
+    assert model.train(texts, labels, warm_start=True)
+    
+    assert refits == [len(labels)]
+    assert not model.model.warm_start
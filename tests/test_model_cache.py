@@ -0,0 +1,73 @@
+# tests/test_model_cache.py
+import threading
+import time
+
+from conftest import train_model
+
+from models.model_cache import ModelCache
+
+KB = 1024
+
+
+class SizedModel:
+    """Modèle factice dont l'empreinte mémoire est fixée"""
+    
+    def __init__(self, model_id, size):
+        self.model_id = model_id
+        self.size = size
+    
+    def memory_footprint(self):
+        return self.size
+
+
+def test_least_recently_used_models_are_evicted_beyond_the_byte_budget():
+    sizes = {'a': 400 * KB, 'b': 400 * KB, 'c': 300 * KB, 'huge': 2048 * KB}
+    cache = ModelCache(memory_budget_mb=1, loader=lambda i: SizedModel(i, sizes[i]))
+    
+    cache.get('a')
+    cache.get('b')
+    cache.get('a')
+    cache.get('c')
+    # b, le moins récemment utilisé, fait place à c ; a reste résident
+    assert ('a' in cache, 'b' in cache, 'c' in cache) == (True, False, True)
+    assert cache.resident_bytes == 700 * KB
+    
+    # Un modèle plus gros que le budget est servi seul
+    assert cache.get('huge').model_id == 'huge'
+    assert [i for i in sizes if i in cache] == ['huge']
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 4, 3)
+
+
+def test_concurrent_requests_share_a_single_load():
+    release = threading.Event()
+    calls = []
+    
+    def loader(model_id):
+        calls.append(model_id)
+        release.wait(timeout=5)
+        return SizedModel(model_id, KB)
+    
+    cache = ModelCache(memory_budget_mb=1, loader=loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('fr')))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while cache.get_stats()['shared_loads'] < 3:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+    
+    assert calls == ['fr']
+    assert len(results) == 4 and all(model is results[0] for model in results)
+
+
+def test_bundles_are_loaded_from_the_tenant_directory(corpus, tmp_path):
+    train_model(corpus, version='tenant-fr').save_bundle(tmp_path / "fr.pkl")
+    cache = ModelCache(bundle_dir=tmp_path)
+    
+    assert cache.get('fr').version == 'tenant-fr'
+    assert cache.get('de') is None
+    assert cache.get_stats()['load_errors'] == 1
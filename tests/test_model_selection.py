@@ -0,0 +1,63 @@
+# tests/test_model_selection.py
+import json
+
+import numpy as np
+import scipy.sparse as sp
+
+import train
+from config import settings
+from training.shared_matrix import load_csr, share_csr
+
+
+def backed_by_file(array):
+    """Vrai si le tableau est une vue (sans copie) d'un fichier mappé"""
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, 'base', None)
+    return False
+
+
+def test_shared_matrix_is_reopened_read_only_without_copy(tmp_path):
+    matrix = sp.random(50, 30, density=0.1, format='csr', random_state=0)
+    
+    shared = load_csr(share_csr(matrix, tmp_path / "features", 'X_train'))
+    
+    assert (shared != matrix).nnz == 0
+    for part in (shared.data, shared.indices, shared.indptr):
+        assert backed_by_file(part)
+        assert not part.flags.writeable
+
+
+def test_sla_violations_ignore_missing_measures():
+    candidate = {'latency_p99_ms': 8.0, 'rss_mb': None, 'artifact_mb': 1.0}
+    sla = {'latency_p99_ms': 5.0, 'rss_mb': 100, 'artifact_mb': 20}
+    
+    assert train.sla_violations(candidate, sla) == ["latency_p99_ms=8.00 > 5.0"]
+
+
+def test_candidates_are_trained_in_parallel_and_measured_serially(corpus, isolated, monkeypatch):
+    monkeypatch.setitem(settings.MODEL_SELECTION_CONFIG, 'workers', 2)
+    monkeypatch.setitem(settings.MODEL_SELECTION_CONFIG, 'latency_samples', 20)
+    monkeypatch.setitem(settings.MODEL_SELECTION_CONFIG, 'report_path', isolated / "selection.json")
+    monkeypatch.setattr(train, 'MODELS_DIR', isolated)
+    messages, labels = corpus
+    sla = {'latency_p99_ms': None, 'rss_mb': None, 'artifact_mb': 20}
+    
+    results = train.compare_models(messages[:600], messages[600:], labels[:600], labels[600:],
+                                   max_features_grid=[300], sla=sla)
+    
+    names = {f"{algorithm}@300" for algorithm in train.MLModel.ALGORITHMS}
+    assert set(results) == names | {'best'}
+    assert results['best'] in names
+    report = json.loads((isolated / "selection.json").read_text(encoding='utf-8'))
+    assert report['workers'] == 2
+    for name in names:
+        candidate = report['candidates'][name]
+        assert candidate['accuracy'] > 0.8
+        assert candidate['latency_p99_ms'] >= candidate['latency_p50_ms'] > 0
+        assert candidate['sla_violations'] == []
+    
+    best = train.MLModel()
+    assert best.load_bundle(isolated / "spam_detector_best.pkl")
+    assert best.algorithm == results['best'].split('@')[0]
@@ -0,0 +1,58 @@
+# tests/test_near_duplicate.py
+from services.near_duplicate import NearDuplicateIndex
+
+CAMPAIGN = "URGENT! Your account 12345 has been suspended, verify at http://a.example now"
+VARIANT = "URGENT! Your account 67890 has been suspended, verify at http://b.example now"
+
+
+def test_verdict_is_only_reused_for_the_same_model_version():
+    index = NearDuplicateIndex(capacity=100)
+    cluster = index.add(CAMPAIGN, 1, 0.97, 'v1')
+    
+    hit = index.lookup(VARIANT, 'v1')
+    assert hit is not None and hit['cluster_id'] == cluster
+    assert (hit['model_version'], hit['tier']) == ('v1', 'near_duplicate')
+    assert index.lookup(VARIANT, 'v2') is None
+    
+    # Rescoré par le nouveau modèle, le message reste dans sa campagne
+    assert index.add(VARIANT, 0, 0.4, 'v2') == cluster
+    assert index.lookup(CAMPAIGN, 'v2')['prediction'] == 0
+
+
+def test_versions_survive_save_and_load(tmp_path):
+    index = NearDuplicateIndex(capacity=100)
+    index.add(CAMPAIGN, 1, 0.97, 'v1')
+    index.save(tmp_path / "index.npz")
+    
+    restored = NearDuplicateIndex(capacity=100)
+    assert restored.load(tmp_path / "index.npz")
+    assert restored.lookup(VARIANT, 'v1') is not None
+    assert restored.lookup(VARIANT, 'v2') is None
+
+
+def test_signature_matches_exact_integer_hashing():
+    import zlib
+    from services.near_duplicate import HASH_PRIME, campaign_text
+    
+    index = NearDuplicateIndex(capacity=10)
+    text = campaign_text(CAMPAIGN)
+    k = index.shingle_size
+    hashes = [zlib.crc32(text[i:i + k].encode('utf-8')) for i in range(len(text) - k + 1)]
+    
+    expected = [min((a * h + b) % HASH_PRIME for h in hashes)
+                for a, b in zip(index._perm_a.tolist(), index._perm_b.tolist())]
+    assert index.signature(CAMPAIGN).tolist() == expected
+
+
+def test_index_saved_with_another_hash_is_ignored(tmp_path):
+    import numpy as np
+    
+    index = NearDuplicateIndex(capacity=100)
+    index.add(CAMPAIGN, 1, 0.97, 'v1')
+    index.save(tmp_path / "index.npz")
+    # Index écrit avant le changement de hachage : pas de premier dans meta
+    data = dict(np.load(tmp_path / "index.npz"))
+    data['meta'] = data['meta'][:5]
+    np.savez(tmp_path / "index.npz", **data)
+    
+    assert not NearDuplicateIndex(capacity=100).load(tmp_path / "index.npz")
@@ -0,0 +1,53 @@
+# tests/test_pipeline.py
+import pandas as pd
+import pytest
+
+from config import settings
+from training.pipeline import STAGES, TrainingPipeline
+
+
+@pytest.fixture
+def dataset(isolated, monkeypatch):
+    """Extrait de data/spam.csv, sans rendu des figures d'évaluation"""
+    monkeypatch.setitem(settings.EVALUATION_CONFIG, 'render_plots', False)
+    path = isolated / "spam.csv"
+    pd.read_csv(settings.DATA_DIR / "spam.csv", encoding='latin-1', nrows=600).to_csv(
+        path, index=False, encoding='latin-1')
+    return path
+
+
+def run(dataset, force=(), **params):
+    """Exécute le pipeline ; retourne aussi les étapes recalculées"""
+    params = {'max_features': 300, **params}
+    pipeline = TrainingPipeline(data_path=dataset, cache_dir=dataset.parent / "cache",
+                                bundle_path=dataset.parent / "pipeline.pkl", **params)
+    report = pipeline.run(force=force)
+    return pipeline, [stage for stage in STAGES if report[stage]['status'] == 'run']
+
+
+def test_unchanged_run_is_served_from_the_cache(dataset):
+    first, executed = run(dataset)
+    assert executed == list(STAGES)
+    
+    second, executed = run(dataset)
+    assert executed == []
+    assert second.build_model().version == first.output('export')['version']
+
+
+def test_changed_parameters_only_rerun_the_stages_that_depend_on_them(dataset):
+    run(dataset)
+    
+    assert run(dataset, algorithm='logistic_regression')[1] == ['fit', 'evaluate', 'export']
+    assert run(dataset, max_features=200)[1] == ['vectorize', 'fit', 'evaluate', 'export']
+    assert run(dataset, force=('split',))[1] == ['split', 'vectorize', 'fit', 'evaluate', 'export']
+
+
+def test_new_data_or_overwritten_bundle_invalidates_the_cache(dataset):
+    run(dataset)
+    # Bundle écrasé par une exécution avec un autre algorithme : réexporté
+    run(dataset, algorithm='logistic_regression')
+    assert run(dataset)[1] == ['export']
+    
+    with open(dataset, 'a', encoding='latin-1') as f:
+        f.write("spam,Claim your free prize now,,,\n")
+    assert run(dataset)[1] == list(STAGES)
@@ -0,0 +1,71 @@
+# tests/test_prediction_result.py
+import pytest
+
+from conftest import train_model
+
+from models.prediction_result import PredictionResult
+
+MESSAGE = "Free entry in a weekly competition, text WIN to 80086 now"
+
+
+class CountingProcessor:
+    """TextProcessor factice qui compte ses appels"""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def clean_text(self, message):
+        self.calls.append('clean_text')
+        return message.lower()
+    
+    def extract_features(self, message):
+        self.calls.append('extract_features')
+        return {'char_count': len(message)}
+
+
+def test_lazy_fields_are_computed_once_on_first_access():
+    processor = CountingProcessor()
+    result = PredictionResult.from_probabilities([0.2, 0.8], 'v1', original_message=MESSAGE,
+                                                 processor=processor)
+    
+    assert result.to_dict(include_lazy=False) == {
+        'prediction': 1, 'is_spam': True, 'confidence': 0.8,
+        'probabilities': {'ham': 0.2, 'spam': 0.8}, 'model_version': 'v1',
+        'original_message': MESSAGE
+    }
+    assert processor.calls == []
+    
+    assert result['cleaned_message'] == result['cleaned_message'] == MESSAGE.lower()
+    assert result.get('features') == {'char_count': len(MESSAGE)}
+    assert processor.calls == ['clean_text', 'extract_features']
+
+
+def test_explanation_is_computed_from_the_kept_tfidf_row_then_released(corpus):
+    model = train_model(corpus)
+    
+    result = model.predict(MESSAGE)
+    
+    assert result._vectors is not None
+    assert result['explanation'] == model.explain(MESSAGE)
+    assert result._vectors is None and result._explainer is None
+    
+    detached = model.predict(MESSAGE)
+    detached.detach()
+    assert detached['explanation'] is None
+
+
+def test_result_behaves_like_the_former_result_dict():
+    result = PredictionResult(0, 0.9, 0.1, 'v1', tier='primary', campaign='promo')
+    result['id'] = 7
+    
+    assert not hasattr(result, '__dict__')
+    assert result['confidence'] == 0.9 and not result['is_spam']
+    assert result['campaign'] == 'promo' and 'campaign' in result
+    assert 'tenant' not in result and result.get('tenant', 'default') == 'default'
+    assert list(result)[-2:] == ['id', 'campaign']
+    with pytest.raises(KeyError):
+        result['unknown']
+    
+    clone = result.copy()
+    clone['campaign'] = 'other'
+    assert result['campaign'] == 'promo'
@@ -0,0 +1,157 @@
+# tests/test_prediction_service.py
+import asyncio
+
+
+def test_prediction_id_points_to_its_row(service):
+    for i in range(3):
+        service.predict(f"premier message {i}")
+    
+    result = service.predict("Hey, are we still meeting for lunch tomorrow?")
+    
+    row = service.db_manager.get_prediction(result['id'])
+    assert row['message'] == "Hey, are we still meeting for lunch tomorrow?"
+    assert row['prediction'] == result['prediction']
+
+
+def test_predict_async_saves_from_the_worker_thread(service):
+    messages = [f"message numéro {i} pour le lot" for i in range(20)]
+    
+    async def run():
+        return await asyncio.gather(*(service.predict_async(m) for m in messages))
+    
+    results = asyncio.run(run())
+    
+    # Le thread principal lit pendant que le thread des micro-lots a écrit
+    assert [service.db_manager.get_prediction(r['id'])['message'] for r in results] == messages
+
+
+def test_reload_invalidates_cached_and_near_duplicate_verdicts(service, corpus, isolated):
+    from conftest import train_model
+    
+    campaign = "URGENT! Your account 12345 has been suspended, verify at http://a.example now"
+    variant = "URGENT! Your account 67890 has been suspended, verify at http://b.example now"
+    service.predict(campaign, save_to_db=False)
+    assert service.predict(variant, save_to_db=False)['tier'] == 'near_duplicate'
+    assert len(service.verdict_cache) == 1
+    
+    train_model(corpus, version='test-2').save_bundle(isolated / "bundle-2.pkl")
+    assert service.reload_model(isolated / "bundle-2.pkl", background=False)
+    
+    assert len(service.verdict_cache) == 0
+    result = service.predict(variant, save_to_db=False)
+    assert result['tier'] != 'near_duplicate'
+    assert result['model_version'] == 'test-2'
+
+
+def test_online_update_bypasses_verdicts_of_the_previous_version(service):
+    message = "Free entry in a weekly competition, text WIN to 80086 now"
+    first = service.predict(message)
+    assert service.predict(message, save_to_db=False)['model_version'] == first['model_version']
+    
+    service.submit_feedback(first['id'])
+    service.apply_feedback()
+    
+    assert service.ml_model.online_updates == 1
+    assert service.predict(message, save_to_db=False)['model_version'] == service.ml_model.version
+
+
+def test_checkpoint_registers_a_new_version(service, isolated):
+    from services.prediction_service import PredictionService
+    
+    source = isolated / "bundle.pkl"
+    original = source.read_bytes()
+    first = service.predict("Free entry in a weekly competition, text WIN to 80086 now")
+    service.submit_feedback(first['id'])
+    service.apply_feedback()
+    
+    assert service.checkpoint_model()
+    
+    version = service.ml_model.version
+    assert version == 'test-1+u1'
+    assert source.read_bytes() == original
+    assert service.registry.get_active()['version'] == version
+    assert service.model_source == service.registry.get_bundle_path(version)
+    assert service.db_manager.get_pending_feedback() == []
+    
+    restarted = PredictionService()
+    try:
+        assert restarted.ml_model.version == version
+    finally:
+        restarted.shutdown()
+
+
+def test_checkpoint_after_rollback_does_not_overwrite_the_undone_version(service):
+    message = "Free entry in a weekly competition, text WIN to 80086 now"
+    assert service.registry.register_bundle(service.model_source, activate=True) == 'test-1'
+    
+    service.submit_feedback(service.predict(message)['id'])
+    service.apply_feedback()
+    assert service.checkpoint_model()
+    undone = service.registry.get_bundle_path('test-1+u1')
+    undone_bytes = undone.read_bytes()
+    
+    assert service.rollback_model() == 'test-1'
+    service.submit_feedback(service.predict(message)['id'], correct_label=0)
+    service.apply_feedback()
+    assert service.checkpoint_model()
+    
+    assert service.ml_model.version == 'test-1.2+u1'
+    assert service.registry.get_active()['version'] == 'test-1.2+u1'
+    assert undone.read_bytes() == undone_bytes
+    # Un bundle déjà enregistré n'est jamais réécrit
+    assert service.registry.register(service.ml_model) is None
+
+
+def test_known_message_is_saved_with_the_serving_model_version(service, tmp_path):
+    from services.prefilter import KnownMessageFilter
+    
+    csv_path = tmp_path / "dataset.csv"
+    csv_path.write_text("v1,v2\nspam,Claim your prize now\n", encoding='latin-1')
+    service.prefilter = KnownMessageFilter(capacity=100)
+    service.prefilter.rebuild(dataset_path=csv_path)
+    
+    result = service.predict("claim your  prize now")
+    
+    assert result['tier'] == 'prefilter-dataset'
+    assert result['model_version'] == service.ml_model.version
+    assert service.db_manager.get_prediction(result['id'])['model_version'] == 'test-1'
+
+
+def test_feedback_queue_is_bounded_when_the_model_cannot_learn_online(isolated, corpus, monkeypatch):
+    from conftest import train_model
+    from config import settings
+    from services.prediction_service import PredictionService
+    
+    monkeypatch.setitem(settings.ONLINE_LEARNING_CONFIG, 'max_pending', 3)
+    train_model(corpus, 'logistic_regression', version='lr-1').save_bundle(isolated / "bundle.pkl")
+    service = PredictionService()
+    try:
+        ids = [service.predict(message)['id'] for message in corpus[0][:12]]
+        for prediction_id in ids:
+            assert service.submit_feedback(prediction_id)
+        
+        assert [row['prediction_id'] for row in service.pending_feedback] == ids[-3:]
+        # Les corrections sorties de la file restent en base pour le réentraînement
+        assert len(service.db_manager.get_pending_feedback()) == 12
+    finally:
+        service.shutdown()
+    
+    restarted = PredictionService()
+    try:
+        assert [row['prediction_id'] for row in restarted.pending_feedback] == ids[-3:]
+    finally:
+        restarted.shutdown()
+
+
+def test_explanation_names_the_model_that_produced_it(service, corpus, isolated):
+    from conftest import train_model
+    
+    message = "Free entry in a weekly competition, text WIN to 80086 now"
+    stored = service.predict(message)
+    train_model(corpus, version='test-2').save_bundle(isolated / "bundle-2.pkl")
+    assert service.reload_model(isolated / "bundle-2.pkl", background=False)
+    
+    explanation = service.explain(message)
+    
+    assert explanation['spam']
+    assert explanation['model_version'] == 'test-2' != stored['model_version']
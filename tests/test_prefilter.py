@@ -0,0 +1,49 @@
+# tests/test_prefilter.py
+from conftest import add_prediction
+
+from services.prefilter import KnownMessageFilter, message_digest
+
+
+def known_filter(db, tmp_path):
+    csv_path = tmp_path / "dataset.csv"
+    csv_path.write_text("v1,v2\nspam,Claim your prize now\nham,See you at lunch\n",
+                        encoding='latin-1')
+    prefilter = KnownMessageFilter(capacity=100)
+    prefilter.rebuild(db, dataset_path=csv_path)
+    return prefilter
+
+
+def test_known_message_hits_and_unknown_message_is_rejected_by_the_bloom_filter(db, tmp_path):
+    prefilter = known_filter(db, tmp_path)
+    
+    hit = prefilter.lookup("  CLAIM your prize\tnow ", 'v1')
+    assert (hit['prediction'], hit['tier'], hit['model_version']) == (1, 'prefilter-dataset', 'v1')
+    assert prefilter.lookup("Are you coming tonight?", 'v1') is None
+    
+    stats = prefilter.get_stats()
+    assert (stats['lookups'], stats['hits'], stats['bloom_rejects']) == (2, 1, 1)
+    assert stats['known_messages'] == 2
+
+
+def test_bloom_false_positive_is_caught_by_the_digest_table(db, tmp_path):
+    prefilter = known_filter(db, tmp_path)
+    bloom, _ = prefilter._index
+    bloom.add(message_digest("Are you coming tonight?"))
+    
+    assert prefilter.lookup("Are you coming tonight?", 'v1') is None
+    assert prefilter.get_stats()['false_positives'] == 1
+
+
+def test_feedback_overrides_dataset_and_history_verdicts(db, tmp_path):
+    corrected = add_prediction(db, "See you at lunch", prediction=1)
+    add_prediction(db, "Win a free cruise", prediction=1, confidence=0.8)
+    db.add_feedback(corrected, 1)
+    prefilter = known_filter(db, tmp_path)
+    
+    assert prefilter.lookup("see you at lunch", 'v1')['tier'] == 'prefilter-feedback'
+    history = prefilter.lookup("Win a free cruise", 'v1')
+    assert history['tier'] == 'prefilter-history'
+    assert history['probabilities']['spam'] == 0.8
+    
+    prefilter.add("Claim your prize now", 0)
+    assert prefilter.lookup("Claim your prize now", 'v1')['prediction'] == 0
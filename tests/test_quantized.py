@@ -0,0 +1,37 @@
+# tests/test_quantized.py
+import numpy as np
+import pytest
+
+from conftest import train_model
+from models.ml_model import MLModel
+
+
+@pytest.mark.parametrize('dtype', ['float16', 'int8'])
+@pytest.mark.parametrize('algorithm', ['naive_bayes', 'logistic_regression', 'svm'])
+def test_exported_bundle_agrees_with_the_full_precision_model(corpus, tmp_path, algorithm, dtype):
+    model = train_model(corpus, algorithm)
+    assert model.export_quantized(tmp_path / "quantized.pkl", dtype)
+    
+    quantized = MLModel()
+    assert quantized.load_bundle(tmp_path / "quantized.pkl")
+    expected = model.predict_batch(corpus[0])
+    results = quantized.predict_batch(corpus[0])
+    
+    assert quantized.version == f"{model.version}-{dtype}"
+    assert [r['prediction'] for r in results] == [r['prediction'] for r in expected]
+    spam = np.array([r['probabilities']['spam'] for r in results])
+    np.testing.assert_allclose(spam, [r['probabilities']['spam'] for r in expected], atol=0.01)
+    assert quantized.memory_footprint() < model.memory_footprint()
+
+
+def test_vectorizer_without_idf_is_quantized_as_it_transforms(corpus):
+    model = train_model(corpus)
+    # vectorizer.pkl historique : picklé sans idf_, il n'applique aucun IDF
+    del model.vectorizer._tfidf.idf_
+    cleaned = model.text_processor.clean_batch(corpus[0][:100])
+    
+    quantized = model.quantize('float16')
+    
+    expected = model.vectorizer.transform(cleaned).toarray()
+    assert np.allclose(quantized.vectorizer.transform(cleaned).toarray(), expected, atol=1e-6)
+    assert quantized.vectorizer.nbytes == 0
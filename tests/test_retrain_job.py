@@ -0,0 +1,96 @@
+# tests/test_retrain_job.py
+import queue
+import threading
+import time
+
+import pytest
+
+from config import settings
+from services.retrain_job import STAGES, run_retraining
+
+
+@pytest.fixture
+def history(service, corpus):
+    """Historique de verdicts confiants, sur lequel le service se réentraîne"""
+    messages, labels = corpus
+    service.db_manager.add_predictions([
+        (message, message.lower(), int(label), 0.99, 0.01 if label else 0.99,
+         0.99 if label else 0.01, 'test-1', None)
+        for message, label in zip(messages, labels)
+    ])
+    return service
+
+
+def options(service, tmp_path):
+    return {'algorithm': 'naive_bayes', 'use_csv': False, 'min_confidence': 0.9,
+            'db_path': str(service.db_manager.db_path), 'bundle_path': str(tmp_path / "retrained.pkl")}
+
+
+def drain(progress):
+    messages = []
+    while True:
+        try:
+            messages.append(progress.get_nowait())
+        except queue.Empty:
+            return messages
+
+
+def wait(job, timeout=60):
+    deadline = time.monotonic() + timeout
+    while job.poll()['status'] not in ('finished', 'cancelled', 'error'):
+        assert time.monotonic() < deadline, job.state
+        time.sleep(0.05)
+    job.join(timeout)
+    return job.state
+
+
+def test_worker_reports_progress_then_the_trained_bundle(history, tmp_path):
+    progress = queue.Queue()
+    
+    run_retraining(options(history, tmp_path), progress, threading.Event())
+    
+    *running, result = drain(progress)
+    assert {message['status'] for message in running} == {'running'}
+    percents = [message['percent'] for message in running]
+    assert percents == sorted(percents) and percents[-1] == STAGES['train']
+    assert result['status'] == 'trained'
+    assert sum(result['metadata']['retrain']['kept'].values()) > 0
+    assert (tmp_path / "retrained.pkl").exists()
+
+
+def test_worker_stops_at_the_next_step_once_cancelled(history, tmp_path):
+    progress, cancel = queue.Queue(), threading.Event()
+    cancel.set()
+    
+    run_retraining(options(history, tmp_path), progress, cancel)
+    
+    assert drain(progress) == [{'status': 'cancelled'}]
+    assert not (tmp_path / "retrained.pkl").exists()
+
+
+def test_retrained_model_is_registered_and_served(history, isolated, monkeypatch):
+    monkeypatch.setitem(settings.RETRAIN_CONFIG, 'output_dir', isolated / "retrained")
+    
+    job = history.start_retraining(algorithm='naive_bayes', use_csv=False)
+    assert history.start_retraining() is None
+    state = wait(job)
+    
+    assert state['status'] == 'finished', state
+    assert state['activated']
+    assert history.registry.is_registered(state['version'])
+    assert history.predict("See you at lunch")['model_version'] == state['version']
+
+
+def test_cancelled_job_leaves_the_served_model_in_place(history, isolated, monkeypatch):
+    monkeypatch.setitem(settings.RETRAIN_CONFIG, 'output_dir', isolated / "retrained")
+    
+    job = history.start_retraining(algorithm='naive_bayes', use_csv=False)
+    assert job.cancel()
+    # L'annulation est seulement demandée : l'état change au prochain poll
+    assert job.state['status'] == 'running'
+    state = wait(job)
+    
+    assert state['status'] == 'cancelled'
+    assert not job.cancel()
+    assert history.predict("See you at lunch")['model_version'].startswith('test-1')
+    assert list((isolated / "retrained").glob("*.pkl")) == []
@@ -0,0 +1,50 @@
+# tests/test_scalability.py
+import pytest
+
+from benchmarks.scalability import geometric_sizes, growth_exponent, load_rows, render, run_isolated
+
+
+def test_sizes_are_geometric_and_include_both_bounds():
+    assert geometric_sizes(1000, 1_000_000, 2) == [1000, 3200, 10000, 31600, 100000, 316200, 1000000]
+    # Les petites tailles ne sont pas arrondies à zéro
+    assert geometric_sizes(50, 5000, 1) == [50, 500, 5000]
+
+
+def test_growth_exponent_is_the_log_log_slope():
+    linear = [{'size': size, 'train_s': size / 1000} for size in (1000, 10000, 100000)]
+    quadratic = [{'size': size, 'train_s': (size / 1000) ** 2} for size in (1000, 10000)]
+    
+    assert growth_exponent(linear, 'train_s') == pytest.approx(1.0)
+    assert growth_exponent(quadratic, 'train_s') == pytest.approx(2.0)
+    # Mesures indisponibles (None, 0) ignorées
+    assert growth_exponent(linear[:1] + [{'size': 5000, 'train_s': None}], 'train_s') is None
+
+
+def test_file_rows_keep_a_fixed_holdout_before_the_training_rows(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("label,message\n" + "".join(
+        f"{'spam' if i % 3 == 0 else 'ham'},message {i}\n" for i in range(50)
+    ), encoding='latin-1')
+    
+    X_train, y_train, X_test, y_test = load_rows(30, 10, path)
+    
+    assert X_test == [f"message {i}" for i in range(10)]
+    assert X_train == [f"message {i}" for i in range(10, 40)]
+    assert y_train.tolist() == [int(i % 3 == 0) for i in range(10, 40)]
+    assert load_rows(20, 10, path)[2] == X_test
+    with pytest.raises(ValueError):
+        load_rows(45, 10, path)
+
+
+def test_measure_runs_in_a_fresh_process_and_is_plotted(tmp_path):
+    point = run_isolated('naive_bayes', 500, 1000, 300, None, 5)
+    
+    assert (point['algorithm'], point['max_features'], point['size']) == ('naive_bayes', 500, 1000)
+    assert point['rss_mb'] >= point['rss_data_mb'] > 0
+    assert point['artifact_mb'] > 0
+    assert point['f1'] > 0.5
+    
+    report = {'series': {'naive_bayes@500': {'points': [point, {**point, 'size': 2000}]}}}
+    figure = render(report, tmp_path / "scalability.png")
+    if figure is not None:
+        assert figure.read_bytes()[:4] == b'\x89PNG'
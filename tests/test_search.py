@@ -0,0 +1,50 @@
+# tests/test_search.py
+import pytest
+
+from training.search import HyperparameterSearch, candidate_grid
+
+
+def new_search(corpus, cache_dir, messages=None, **params):
+    candidates = candidate_grid(['naive_bayes'], {'naive_bayes': {'alpha': [0.1, 1.0]}}, [200, 400])
+    return HyperparameterSearch(messages or corpus[0], corpus[1], candidates, cv_folds=3,
+                                scoring='f1', halving_factor=2, min_samples=100, workers=1,
+                                cache_dir=cache_dir, test_size=0.25, random_state=0, **params)
+
+
+def test_successive_halving_keeps_the_best_configurations(corpus, tmp_path):
+    search = new_search(corpus, tmp_path / "cache")
+    
+    best = search.run()
+    
+    # 600 messages d'apprentissage, 400 par fold : 4 configurations, puis 2, puis 1
+    assert [(r['candidates'], r['samples']) for r in search.rounds] == [(4, 100), (2, 200), (1, 400)]
+    for previous, current in zip(search.rounds, search.rounds[1:]):
+        survivors = {entry['name'] for entry in previous['results'][:current['candidates']]}
+        assert {entry['name'] for entry in current['results']} == survivors
+    assert best == search.rounds[-1]['results'][0]
+    assert search.report()['fits'] == (4 + 2 + 1) * 3
+    
+    model = search.refit()
+    assert model.algorithm == 'naive_bayes'
+    assert model.model.alpha == best['params']['alpha']
+    assert len(model.vectorizer.vocabulary_) == best['max_features']
+    assert model.metrics['accuracy'] > 0.9
+
+
+def test_fold_matrices_are_reused_until_the_data_changes(corpus, tmp_path):
+    first = new_search(corpus, tmp_path / "cache")
+    first.run()
+    assert first.cache_hits == 0
+    
+    again = new_search(corpus, tmp_path / "cache")
+    assert again.run() == first.best
+    assert again.cache_hits == 2
+    
+    changed = new_search(corpus, tmp_path / "cache", messages=[m + " prize" for m in corpus[0]])
+    changed.run()
+    assert changed.cache_hits == 0
+
+
+def test_unknown_scoring_fails_before_any_work(corpus, tmp_path):
+    with pytest.raises(ValueError):
+        HyperparameterSearch(corpus[0], corpus[1], scoring='not-a-scorer', cache_dir=tmp_path)
@@ -0,0 +1,55 @@
+# tests/test_shadow.py
+from conftest import add_prediction, history_rows, train_model
+
+
+def shadow_row(prediction_id, primary_prediction, prediction):
+    return (prediction_id, 'primary-1', 'challenger-1', primary_prediction,
+            0.9 if primary_prediction else 0.1, 1.0, prediction,
+            0.9 if prediction else 0.1, 2.0)
+
+
+def test_report_uses_the_feedback_of_the_scored_message(db):
+    db.add_predictions(history_rows(5))
+    corrected = add_prediction(db, "message corrigé", prediction=1)
+    other = add_prediction(db, "autre message", prediction=1)
+    # Correction du message corrigé : le principal s'est trompé, pas le challenger
+    db.add_feedback(corrected, 0)
+
+    db.add_shadow_predictions([shadow_row(corrected, 1, 0), shadow_row(other, 1, 1)])
+
+    [report] = db.get_shadow_report('challenger-1')
+    assert report['total'] == 2
+    assert report['labeled'] == 1
+    assert report['primary_accuracy'] == 0.0
+    assert report['challenger_accuracy'] == 1.0
+
+
+def test_shadow_rows_point_to_the_served_predictions(service, corpus, isolated):
+    challenger_path = isolated / "challenger.pkl"
+    train_model(corpus, 'logistic_regression', version='challenger-1').save_bundle(challenger_path)
+    service.db_manager.add_predictions(history_rows(5))
+    messages = corpus[0][:6]
+
+    assert service.start_shadow(challenger_path)
+    results = [service.predict(message) for message in messages[:3]]
+    results += service.predict_batch(messages[3:])
+    service.stop_shadow()
+
+    db = service.db_manager
+    db.connect()
+    try:
+        db.cursor.execute('''
+            SELECT s.prediction_id, s.primary_prediction, s.primary_version,
+                   p.message, p.prediction, p.model_version
+            FROM shadow_predictions s JOIN predictions p ON p.id = s.prediction_id
+        ''')
+        rows = {row['prediction_id']: row for row in db.cursor.fetchall()}
+    finally:
+        db.close()
+
+    assert sorted(rows) == sorted(result['id'] for result in results)
+    for result in results:
+        row = rows[result['id']]
+        assert row['message'] == result['original_message']
+        assert row['primary_prediction'] == row['prediction'] == result['prediction']
+        assert row['primary_version'] == row['model_version'] == result['model_version']
@@ -0,0 +1,62 @@
+# tests/test_streaming.py
+import json
+
+import numpy as np
+import pytest
+
+from models.ml_model import MLModel
+from training.streaming import StreamingTrainer, iter_chunks
+
+
+@pytest.fixture
+def stream_csv(corpus, tmp_path):
+    """Corpus de test au format de data/spam.csv, plus une ligne au label inconnu"""
+    import pandas as pd
+    
+    messages, labels = corpus
+    frame = pd.DataFrame({'v1': np.where(labels == 1, 'spam', 'ham'), 'v2': messages})
+    frame.loc[len(frame)] = ['???', "ligne sans label"]
+    path = tmp_path / "stream.csv"
+    frame.to_csv(path, index=False, encoding='latin-1')
+    return path
+
+
+@pytest.mark.parametrize('algorithm', ['naive_bayes', 'svm'])
+def test_stream_is_learned_chunk_by_chunk_with_a_bounded_holdout(stream_csv, tmp_path, algorithm):
+    trainer = StreamingTrainer(algorithm, chunk_size=100, n_features=2 ** 12,
+                               holdout_size=150, random_state=0)
+    batches = []
+    fit = trainer.estimator.partial_fit
+    trainer.estimator.partial_fit = lambda X, y, **kw: batches.append(X.shape[0]) or fit(X, y, **kw)
+    
+    trainer.fit(stream_csv)
+    del trainer.estimator.partial_fit
+    
+    # 800 messages étiquetés en 9 blocs : chaque message est appris ou gardé pour l'évaluation
+    assert (trainer.seen, trainer.chunks) == (800, 9)
+    assert len(trainer.holdout_texts) == 150
+    assert trainer.trained == sum(batches) == 650
+    assert max(batches) <= 100
+    
+    model = trainer.to_model()
+    assert model.metrics['accuracy'] > 0.9
+    assert model.save_bundle(tmp_path / "streaming.pkl")
+    restored = MLModel()
+    assert restored.load_bundle(tmp_path / "streaming.pkl")
+    assert restored.predict("WINNER!! Claim your free prize, call 09061701461 now")['is_spam']
+
+
+def test_jsonl_and_csv_chunks_skip_unknown_labels(stream_csv, tmp_path):
+    jsonl = tmp_path / "stream.jsonl"
+    jsonl.write_text("\n".join(json.dumps(row) for row in [
+        {'label': 'spam', 'message': "Win cash now"},
+        {'label': 'unknown', 'message': "???"},
+        {'label': 0, 'message': "See you tonight"}
+    ]), encoding='utf-8')
+    
+    [(messages, labels)] = list(iter_chunks(jsonl, chunk_size=10))
+    assert messages == ["Win cash now", "See you tonight"]
+    assert labels.tolist() == [1, 0]
+    
+    sizes = [len(labels) for _, labels in iter_chunks(stream_csv, chunk_size=300)]
+    assert sizes == [300, 300, 200]
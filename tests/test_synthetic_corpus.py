@@ -0,0 +1,75 @@
+# tests/test_synthetic_corpus.py
+import sqlite3
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic_corpus import CorpusStatistics, SyntheticCorpus
+from training.streaming import iter_chunks
+
+
+@pytest.fixture(scope='module')
+def statistics(corpus):
+    return CorpusStatistics(*corpus)
+
+
+def generate(statistics, size=2000, **params):
+    params = {'chunk_size': 500, 'seed': 7, **params}
+    chunks = list(SyntheticCorpus(statistics, size, **params).iter_chunks())
+    messages = [message for chunk in chunks for message in chunk[0]]
+    labels = np.concatenate([chunk[1] for chunk in chunks])
+    timestamps = np.concatenate([chunk[2] for chunk in chunks])
+    return messages, labels, timestamps
+
+
+def test_same_seed_gives_the_same_corpus(statistics):
+    messages, labels, timestamps = generate(statistics)
+    
+    again = generate(statistics)
+    assert again[0] == messages
+    assert again[1].tolist() == labels.tolist()
+    assert again[2].tolist() == timestamps.tolist()
+    
+    assert generate(statistics, seed=8)[0] != messages
+
+
+def test_corpus_follows_the_requested_distribution(statistics):
+    messages, labels, timestamps = generate(statistics, 4000, spam_ratio=0.3, duplicate_rate=0.2,
+                                            near_duplicate_rate=0.0, start='2024-03-01', days=10)
+    
+    assert len(messages) == len(labels) == len(timestamps) == 4000
+    assert labels.mean() == pytest.approx(0.3, abs=0.03)
+    vocabulary = set(statistics.vocabulary)
+    assert all(set(message.split()) <= vocabulary for message in messages)
+    # Horodatages croissants, sur la période demandée
+    assert timestamps.tolist() == sorted(timestamps.tolist())
+    assert timestamps[0] >= '2024-03-01' and timestamps[-1] < '2024-03-11'
+    copies = sum(count - 1 for count in Counter(messages).values())
+    assert copies >= 0.15 * len(messages)
+
+
+def test_written_formats_hold_the_same_corpus(statistics, tmp_path):
+    corpus = SyntheticCorpus(statistics, 1200, chunk_size=500, seed=3)
+    messages, labels, _ = generate(statistics, 1200, seed=3)
+    
+    for fmt in ('csv', 'jsonl'):
+        result = corpus.write(tmp_path / f"corpus.{fmt}")
+        assert (result['format'], result['messages'], result['spam']) == (fmt, 1200, labels.sum())
+        [(read_messages, read_labels)] = list(iter_chunks(result['path'], chunk_size=5000))
+        assert read_labels.tolist() == labels.tolist()
+        if fmt == 'jsonl':
+            assert read_messages == messages
+    
+    corpus.write(tmp_path / "corpus.db")
+    conn = sqlite3.connect(tmp_path / "corpus.db")
+    try:
+        rows = conn.execute('SELECT message, prediction FROM predictions ORDER BY id').fetchall()
+    finally:
+        conn.close()
+    assert rows == list(zip(messages, labels.tolist()))
+
+
+def test_duplicate_rates_cannot_exceed_one(statistics):
+    with pytest.raises(ValueError):
+        SyntheticCorpus(statistics, 10, duplicate_rate=0.6, near_duplicate_rate=0.5)
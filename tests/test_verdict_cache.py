@@ -0,0 +1,26 @@
+# tests/test_verdict_cache.py
+from conftest import train_model
+
+from services.verdict_cache import VerdictCache
+
+
+def test_cached_verdict_keeps_neither_batch_matrix_nor_model(corpus):
+    model = train_model(corpus)
+    messages = corpus[0][:20]
+    results = model.predict_batch(messages)
+    explained = results[1].explanation
+    cache = VerdictCache(max_entries=10, ttl_seconds=None)
+    
+    for message, result in zip(messages[:2], results):
+        cache.put(message, model.version, result)
+    
+    for message, result in zip(messages[:2], results):
+        hit = cache.get(message, model.version)
+        assert hit._vectors is None and hit._explainer is None
+        assert hit['prediction'] == result['prediction']
+        assert hit['confidence'] == result['confidence']
+    # Une explication déjà calculée est conservée ; sinon, elle n'est pas recalculée
+    assert cache.get(messages[0], model.version)['explanation'] is None
+    assert cache.get(messages[1], model.version)['explanation'] == explained
+    # Le résultat de l'appelant est intact
+    assert results[0]._vectors is not None
@@ -1,17 +1,27 @@
+import json
+import multiprocessing
+import os
 import pickle
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
 import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import (
-    accuracy_score, 
-    precision_score, 
-    recall_score, 
-    f1_score,
-    confusion_matrix,
-    classification_report
+from sklearn.metrics import classification_report
+
+from config.settings import (
+    DATA_DIR, MODELS_DIR, MODEL_CONFIG, MODEL_SELECTION_CONFIG, CASCADE_CONFIG
 )
-import matplotlib.pyplot as plt
-import seaborn as sns
+from models.ml_model import MLModel
+from models.text_processor import TextProcessor
+from training.evaluation import build_evaluation, write_evaluation
+from training.shared_matrix import share_csr, load_csr
 
 class SpamDetector:
     def __init__(self, model_type='naive_bayes'):
@@ -25,11 +35,15 @@ class SpamDetector:
         else:
             self.model = LogisticRegression(max_iter=1000)
             self.model_name = "Logistic Regression"
+        self.timings = {}
+        self.evaluation = None
     
     def train(self, X_train, y_train):
         """Entraîne le modèle"""
         print(f"🚀 Entraînement du modèle {self.model_name}...")
+        start = time.perf_counter()
         self.model.fit(X_train, y_train)
+        self.timings['train_s'] = time.perf_counter() - start
         print("✅ Entraînement terminé!")
     
     def evaluate(self, X_test, y_test):
@@ -37,21 +51,27 @@ class SpamDetector:
         print(f"\n📊 Évaluation du modèle {self.model_name}...")
         
         # Prédictions
+        start = time.perf_counter()
         y_pred = self.model.predict(X_test)
+        self.timings['predict_s'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        spam_scores = self.model.predict_proba(X_test)[:, 1]
+        self.timings['predict_proba_s'] = time.perf_counter() - start
         
         # Métriques
-        accuracy = accuracy_score(y_test, y_pred)
-        precision = precision_score(y_test, y_pred)
-        recall = recall_score(y_test, y_pred)
-        f1 = f1_score(y_test, y_pred)
+        self.evaluation = build_evaluation(y_test, y_pred, spam_scores,
+                                           dict(self.timings), self.model_name)
+        metrics = self.evaluation['metrics']
         
         print(f"\n{'='*50}")
         print(f"📈 RÉSULTATS - {self.model_name}")
         print(f"{'='*50}")
-        print(f"🎯 Accuracy:  {accuracy*100:.2f}%")
-        print(f"🎯 Precision: {precision*100:.2f}%")
-        print(f"🎯 Recall:    {recall*100:.2f}%")
-        print(f"🎯 F1-Score:  {f1*100:.2f}%")
+        print(f"🎯 Accuracy:  {metrics['accuracy']*100:.2f}%")
+        print(f"🎯 Precision: {metrics['precision']*100:.2f}%")
+        print(f"🎯 Recall:    {metrics['recall']*100:.2f}%")
+        print(f"🎯 F1-Score:  {metrics['f1']*100:.2f}%")
+        print(f"🎯 ROC AUC:   {metrics['roc_auc']*100:.2f}%")
         print(f"{'='*50}\n")
         
         # Rapport détaillé
@@ -59,31 +79,22 @@ class SpamDetector:
         print(classification_report(y_test, y_pred, 
                                    target_names=['HAM', 'SPAM']))
         
-        # Matrice de confusion
-        self.plot_confusion_matrix(y_test, y_pred)
+        # Rapport JSON et figures (sans affichage)
+        self.write_report()
         
         return {
-            'accuracy': accuracy,
-            'precision': precision,
-            'recall': recall,
-            'f1': f1
+            'accuracy': metrics['accuracy'],
+            'precision': metrics['precision'],
+            'recall': metrics['recall'],
+            'f1': metrics['f1']
         }
     
-    def plot_confusion_matrix(self, y_test, y_pred):
-        """Affiche la matrice de confusion"""
-        cm = confusion_matrix(y_test, y_pred)
-        
-        plt.figure(figsize=(8, 6))
-        sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', 
-                    xticklabels=['HAM', 'SPAM'],
-                    yticklabels=['HAM', 'SPAM'])
-        plt.title(f'Matrice de Confusion - {self.model_name}')
-        plt.ylabel('Vraie classe')
-        plt.xlabel('Classe prédite')
-        plt.tight_layout()
-        plt.savefig(f'models/confusion_matrix_{self.model_name.replace(" ", "_")}.png')
-        print(f"✅ Matrice de confusion sauvegardée")
-        plt.show()
+    def write_report(self, output_dir=None):
+        """Écrit le rapport d'évaluation (JSON, matrice de confusion, courbes PR et ROC)"""
+        paths = write_evaluation(self.evaluation, output_dir)
+        for path in paths.values():
+            print(f"✅ {path}")
+        return paths
     
     def save_model(self, filename='models/spam_detector.pkl'):
         """Sauvegarde le modèle"""
@@ -92,44 +103,326 @@ class SpamDetector:
         print(f"✅ Modèle sauvegardé : {filename}")
 
 
-def compare_models(X_train, X_test, y_train, y_test):
-    """Compare Naive Bayes et Logistic Regression"""
-    print("\n" + "="*60)
-    print("🔬 COMPARAISON DES MODÈLES")
-    print("="*60 + "\n")
+def load_raw_split():
+    """Split train/test de preprocessing.py, sur les messages bruts"""
+    df = pd.read_csv(DATA_DIR / 'spam.csv', encoding='latin-1')
+    df = df[['v1', 'v2']]
+    df.columns = ['label', 'message']
     
-    results = {}
+    X_train, X_test, y_train, y_test = train_test_split(
+        df['message'], df['label'].map({'ham': 0, 'spam': 1}),
+        test_size=MODEL_CONFIG['test_size'],
+        random_state=MODEL_CONFIG['random_state'],
+        stratify=df['label']
+    )
+    return list(X_train), list(X_test), np.asarray(y_train), np.asarray(y_test)
+
+
+def train_cascade_secondary(X_train, y_train, primary=None, output_path=None):
+    """
+    Entraîne le modèle secondaire de la cascade sur le vectorizer du primaire
+    
+    La cascade passe au secondaire la ligne TF-IDF calculée par le primaire :
+    le bundle écrit contient ce même vectorizer, comparé à celui du primaire
+    au chargement (PredictionService.enable_cascade).
+    
+    Args:
+        X_train: Messages bruts
+        y_train: Labels (0 = ham, 1 = spam)
+        primary (MLModel): Modèle primaire (par défaut, spam_detector.pkl / vectorizer.pkl)
+        output_path (str): Bundle écrit (par défaut, CASCADE_CONFIG['secondary_model_path'])
+    
+    Returns:
+        Path: Bundle écrit, ou None en cas d'échec
+    """
+    if primary is None:
+        primary = MLModel()
+        if not primary.load_model():
+            return None
+    output_path = Path(output_path or CASCADE_CONFIG['secondary_model_path'])
+    
+    algorithm = CASCADE_CONFIG['secondary_algorithm']
+    y_train = np.asarray(y_train)
+    X_train_vec = primary.vectorizer.transform(primary.text_processor.clean_batch(X_train))
+    estimator = MLModel.ALGORITHMS[algorithm]()
+    estimator.fit(X_train_vec, y_train)
+    
+    secondary = MLModel(algorithm, max_features=primary.max_features)
+    secondary.set_trained(estimator, primary.vectorizer, X_train_vec, y_train)
+    if not secondary.save_bundle(output_path, {'cascade_primary': primary.version}):
+        return None
+    print(f"✅ Modèle secondaire de la cascade : {output_path}")
+    return output_path
+
+
+def _serving_rss(bundle_path):
+    """Mémoire (Mo) d'un processus neuf qui charge le bundle et prédit un message"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    
+    from models.ml_model import MLModel
+    model = MLModel()
+    if not model.load_bundle(bundle_path):
+        return None
+    model.predict("warm up")
+    
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Ko sous Linux, octets sous macOS
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def measure_rss(bundle_path):
+    """Exécute _serving_rss dans un processus séparé (mode spawn)"""
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1) as pool:
+        return pool.apply(_serving_rss, (str(bundle_path),))
+
+
+def train_candidate(algorithm, max_features, features, y_train, y_test, workdir):
+    """
+    Entraîne un candidat, évalue sa qualité et écrit son bundle
+    
+    Exécuté dans un processus du pool : les matrices TF-IDF sont relues en
+    mémoire partagée (fichiers mappés), seul le vectorizer est désérialisé.
     
-    # Naive Bayes
-    nb_detector = SpamDetector('naive_bayes')
-    nb_detector.train(X_train, y_train)
-    results['Naive Bayes'] = nb_detector.evaluate(X_test, y_test)
-    nb_detector.save_model('models/spam_detector_nb.pkl')
+    Args:
+        algorithm (str): Clé de MLModel.ALGORITHMS
+        max_features (int): Taille du vocabulaire
+        features (dict): Vectorizer picklé et matrices partagées (voir share_features)
+        y_train, y_test: Labels
+        workdir (str): Dossier où écrire le bundle du candidat
+    
+    Returns:
+        dict: Métriques, temps d'entraînement, taille et chemin du bundle
+    """
+    wall_start = time.perf_counter()
+    with open(features['vectorizer'], 'rb') as f:
+        vectorizer = pickle.load(f)
+    X_train_vec = load_csr(features['X_train'])
+    X_test_vec = load_csr(features['X_test'])
+    
+    estimator = MLModel.ALGORITHMS[algorithm]()
+    start = time.perf_counter()
+    estimator.fit(X_train_vec, y_train)
+    train_time = time.perf_counter() - start
+    
+    spam_scores = estimator.predict_proba(X_test_vec)[:, 1]
+    metrics = build_evaluation(y_test, (spam_scores > 0.5).astype(int), spam_scores)['metrics']
+    
+    model = MLModel(algorithm, max_features=max_features)
+    model.set_trained(estimator, vectorizer, X_train_vec, y_train, metrics)
+    bundle_path = Path(workdir) / f"{algorithm}_{max_features}.pkl"
+    model.save_bundle(bundle_path, {'max_features': max_features})
+    
+    return {
+        'algorithm': algorithm,
+        'max_features': max_features,
+        **metrics,
+        'train_time_s': train_time,
+        'artifact_mb': bundle_path.stat().st_size / 1024 / 1024,
+        'bundle_path': str(bundle_path),
+        'wall_time_s': time.perf_counter() - wall_start
+    }
+
+
+def measure_serving(bundle_path, X_test):
+    """
+    Mesure latence, débit et mémoire d'un bundle, tel qu'il serait servi
     
-    print("\n" + "-"*60 + "\n")
+    Appelé séquentiellement une fois le pool d'entraînement terminé : aucun
+    autre candidat ne s'exécute pendant la mesure.
     
-    # Logistic Regression
-    lr_detector = SpamDetector('logistic_regression')
-    lr_detector.train(X_train, y_train)
-    results['Logistic Regression'] = lr_detector.evaluate(X_test, y_test)
-    lr_detector.save_model('models/spam_detector_lr.pkl')
+    Args:
+        bundle_path (str): Bundle écrit par train_candidate
+        X_test (list): Messages bruts de test (latence et débit de bout en bout)
     
-    # Afficher la comparaison
+    Returns:
+        dict: latency_p50_ms, latency_p99_ms, throughput_msg_s, rss_mb
+    """
+    model = MLModel()
+    model.load_bundle(bundle_path)
+    
+    # Latence d'un message (nettoyage, vectorisation, prédiction, explication)
+    # (un premier passage non chronométré réchauffe les caches)
+    samples = X_test[:MODEL_SELECTION_CONFIG['latency_samples']]
+    for message in samples:
+        model.predict(message)
+    latencies = []
+    for message in samples:
+        start = time.perf_counter()
+        model.predict(message)
+        latencies.append((time.perf_counter() - start) * 1000)
+    
+    start = time.perf_counter()
+    model.predict_batch(X_test)
+    batch_time = time.perf_counter() - start
+    
+    return {
+        'latency_p50_ms': float(np.percentile(latencies, 50)),
+        'latency_p99_ms': float(np.percentile(latencies, 99)),
+        'throughput_msg_s': len(X_test) / batch_time if batch_time else None,
+        'rss_mb': measure_rss(bundle_path)
+    }
+
+
+def share_features(cleaned_train, cleaned_test, max_features, workdir):
+    """
+    Vectorise une fois pour une taille de vocabulaire et partage les matrices
+    
+    Returns:
+        dict: Chemin du vectorizer picklé et descriptions des matrices partagées
+    """
+    vectorizer = TfidfVectorizer(max_features=max_features)
+    X_train_vec = vectorizer.fit_transform(cleaned_train)
+    X_test_vec = vectorizer.transform(cleaned_test)
+    
+    directory = Path(workdir) / f"features_{max_features}"
+    features = {
+        'X_train': share_csr(X_train_vec, directory, 'X_train'),
+        'X_test': share_csr(X_test_vec, directory, 'X_test'),
+        'vectorizer': str(directory / 'vectorizer.pkl')
+    }
+    with open(features['vectorizer'], 'wb') as f:
+        pickle.dump(vectorizer, f)
+    return features
+
+
+def sla_violations(candidate, sla):
+    """Contraintes du SLA non respectées (les mesures indisponibles sont ignorées)"""
+    limits = {
+        'latency_p99_ms': sla.get('latency_p99_ms'),
+        'rss_mb': sla.get('rss_mb'),
+        'artifact_mb': sla.get('artifact_mb')
+    }
+    return [
+        f"{key}={candidate[key]:.2f} > {limit}"
+        for key, limit in limits.items()
+        if limit is not None and candidate[key] is not None and candidate[key] > limit
+    ]
+
+
+def compare_models(X_train, X_test, y_train, y_test, max_features_grid=None, sla=None):
+    """
+    Compare tous les algorithmes de MLModel sur une grille de max_features
+    
+    Les messages sont nettoyés et vectorisés une fois par taille de
+    vocabulaire ; les candidats sont entraînés en parallèle
+    (MODEL_SELECTION_CONFIG['workers'] processus) sur les mêmes matrices,
+    partagées en lecture seule par fichiers mappés en mémoire. Latence,
+    débit et mémoire sont mesurés ensuite, un candidat à la fois, pour
+    ne pas dépendre de la charge des autres processus.
+    
+    Le meilleur candidat (selon MODEL_SELECTION_CONFIG['selection_metric'])
+    est choisi parmi ceux qui respectent le SLA de latence et de mémoire ;
+    un rapport JSON est écrit dans MODEL_SELECTION_CONFIG['report_path'].
+    Les modèles servis (dont le secondaire de la cascade) ne sont pas modifiés.
+    
+    Args:
+        X_train, X_test: Messages bruts (voir load_raw_split)
+        y_train, y_test: Labels (0 = ham, 1 = spam)
+        max_features_grid (list): Tailles de vocabulaire testées
+        sla (dict): latency_p99_ms, rss_mb, artifact_mb
+    
+    Returns:
+        dict: Mesures par candidat, et 'best' (nom du candidat retenu ou None)
+    """
     print("\n" + "="*60)
-    print("🏆 COMPARAISON FINALE")
-    print("="*60)
+    print("🔬 COMPARAISON DES MODÈLES")
+    print("="*60 + "\n")
+    
+    grid = max_features_grid or MODEL_SELECTION_CONFIG['max_features_grid']
+    sla = sla or MODEL_SELECTION_CONFIG['sla']
+    metric = MODEL_SELECTION_CONFIG['selection_metric']
     
-    for model_name, metrics in results.items():
-        print(f"\n{model_name}:")
-        for metric, value in metrics.items():
-            print(f"  {metric.capitalize()}: {value*100:.2f}%")
+    workers = MODEL_SELECTION_CONFIG['workers'] or os.cpu_count()
+    y_train, y_test = np.asarray(y_train), np.asarray(y_test)
+    
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        # Nettoyage et vectorisation une seule fois, partagés par tous les candidats
+        wall_start = time.perf_counter()
+        processor = TextProcessor()
+        cleaned_train = processor.clean_batch(X_train)
+        cleaned_test = processor.clean_batch(X_test)
+        features = {
+            max_features: share_features(cleaned_train, cleaned_test, max_features, workdir)
+            for max_features in grid
+        }
+        prepare_time = time.perf_counter() - wall_start
+        
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = {
+                pool.submit(train_candidate, algorithm, max_features, features[max_features],
+                            y_train, y_test, workdir): f"{algorithm}@{max_features}"
+                for algorithm in MLModel.ALGORITHMS
+                for max_features in grid
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        train_wall_time = time.perf_counter() - wall_start
+        
+        # Mesures de service après l'arrêt du pool, candidat par candidat
+        results = {name: results[name] for name in futures.values()}
+        for name, candidate in results.items():
+            candidate.update(measure_serving(candidate['bundle_path'], X_test))
+            candidate['sla_violations'] = sla_violations(candidate, sla)
+            
+            rss = f"{candidate['rss_mb']:.0f} Mo" if candidate['rss_mb'] is not None else "n/a"
+            status = "✅" if not candidate['sla_violations'] else "⛔"
+            print(f"{status} {name:<28} acc={candidate['accuracy']*100:.2f}%  "
+                  f"f1={candidate['f1']*100:.2f}%  "
+                  f"p50={candidate['latency_p50_ms']:.2f} ms  "
+                  f"p99={candidate['latency_p99_ms']:.2f} ms  "
+                  f"{candidate['throughput_msg_s']:.0f} msg/s  "
+                  f"{candidate['artifact_mb']:.2f} Mo  RSS={rss}  "
+                  f"({candidate['wall_time_s']:.1f} s)")
+        
+        wall_time = time.perf_counter() - wall_start
+        
+        eligible = {name: c for name, c in results.items() if not c['sla_violations']}
+        best = max(eligible, key=lambda name: eligible[name][metric]) if eligible else None
+        
+        print("\n" + "="*60)
+        print("🏆 COMPARAISON FINALE")
+        print("="*60)
+        if best is None:
+            print("\n⚠️ Aucun modèle ne respecte le SLA")
+        else:
+            print(f"\n🥇 Meilleur modèle: {best} "
+                  f"({metric.capitalize()}: {results[best][metric]*100:.2f}%, "
+                  f"p99: {results[best]['latency_p99_ms']:.2f} ms)")
+            winner = MLModel()
+            winner.load_bundle(results[best]['bundle_path'])
+            winner.save_bundle(
+                MODELS_DIR / "spam_detector_best.pkl",
+                {'selected_by': metric, 'sla': sla, 'max_features': results[best]['max_features']}
+            )
+        
+        for candidate in results.values():
+            del candidate['bundle_path']
     
-    # Déterminer le meilleur modèle
-    best_model = max(results.items(), key=lambda x: x[1]['accuracy'])
-    print(f"\n🥇 Meilleur modèle: {best_model[0]} "
-          f"(Accuracy: {best_model[1]['accuracy']*100:.2f}%)")
+    report = {
+        'sla': sla,
+        'selection_metric': metric,
+        'train_size': len(y_train),
+        'test_size': len(y_test),
+        'best': best,
+        'workers': workers,
+        'prepare_time_s': prepare_time,
+        'train_wall_time_s': train_wall_time,
+        'wall_time_s': wall_time,
+        'sum_candidate_time_s': sum(c['wall_time_s'] for c in results.values()),
+        'candidates': results
+    }
+    report_path = MODEL_SELECTION_CONFIG['report_path']
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Rapport sauvegardé : {report_path}")
     
-    return results
+    return {**results, 'best': best}
 
 
 def main():
@@ -157,16 +450,24 @@ def main():
     detector.evaluate(X_test, y_test)
     detector.save_model()
     
-    # Option 2: Comparer les deux modèles (décommenter si souhaité)
-    # compare_models(X_train, X_test, y_train, y_test)
+    # Option 2: Comparer tous les algorithmes sous contrainte de SLA (décommenter si souhaité)
+    # compare_models(*load_raw_split())
     
     print("\n" + "="*60)
     print("✅ ENTRAÎNEMENT TERMINÉ AVEC SUCCÈS!")
     print("="*60)
     print("\n📁 Fichiers créés:")
     print("   - models/spam_detector.pkl")
-    print("   - models/confusion_matrix_Naive_Bayes.png")
+    print("   - reports/evaluation/Naive_Bayes_evaluation.json")
+    print("   - reports/evaluation/Naive_Bayes_*.png")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if '--cascade-secondary' in sys.argv:
+        # Modèle secondaire de la cascade, pour le modèle primaire par défaut
+        X_train, _, y_train, _ = load_raw_split()
+        if train_cascade_secondary(X_train, y_train) is None:
+            print("❌ Échec de l'entraînement du modèle secondaire")
+            sys.exit(1)
+    else:
+        main()
\ No newline at end of file
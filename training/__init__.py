@@ -0,0 +1,4 @@
+# training/__init__.py
+"""
+Entraînement hors ligne (python -m training.<nom>)
+"""
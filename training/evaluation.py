@@ -0,0 +1,190 @@
+# training/evaluation.py
+"""
+Rapport d'évaluation sans affichage : JSON et figures PNG
+
+Matrice de confusion, courbes précision/rappel et ROC, métriques par
+classe et durées. matplotlib n'est importé qu'au rendu des figures, avec
+le canevas Agg (aucun écran requis, aucune fenêtre bloquante) ; sans
+matplotlib, seul le JSON est écrit.
+"""
+import json
+import logging
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.metrics import (
+    accuracy_score,
+    average_precision_score,
+    classification_report,
+    confusion_matrix,
+    precision_recall_curve,
+    roc_auc_score,
+    roc_curve
+)
+
+from config.settings import EVALUATION_CONFIG
+
+logger = logging.getLogger(__name__)
+
+CLASS_NAMES = ['HAM', 'SPAM']
+
+def _thin(*arrays, points=None):
+    """Sous-échantillonne des courbes à au plus points valeurs (extrémités conservées)"""
+    points = points or EVALUATION_CONFIG['curve_points']
+    size = len(arrays[0])
+    if size <= points:
+        return [np.asarray(a).tolist() for a in arrays]
+    index = np.unique(np.linspace(0, size - 1, points).round().astype(int))
+    return [np.asarray(a)[index].tolist() for a in arrays]
+
+def build_evaluation(y_true, y_pred, spam_scores=None, timings=None, name=None):
+    """
+    Calcule le contenu du rapport d'évaluation
+    
+    Args:
+        y_true: Labels réels (0 = ham, 1 = spam)
+        y_pred: Labels prédits
+        spam_scores: Probabilités (ou scores) spam, pour les courbes
+        timings (dict): Durées en secondes (entraînement, prédiction...)
+        name (str): Nom du modèle évalué
+    
+    Returns:
+        dict: Rapport sérialisable en JSON
+    """
+    y_true = np.asarray(y_true, dtype=int)
+    y_pred = np.asarray(y_pred, dtype=int)
+    per_class = classification_report(y_true, y_pred, labels=[0, 1], target_names=CLASS_NAMES,
+                                      output_dict=True, zero_division=0)
+    spam = per_class['SPAM']
+    
+    evaluation = {
+        'name': name,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'samples': int(len(y_true)),
+        'metrics': {
+            'accuracy': accuracy_score(y_true, y_pred),
+            'precision': spam['precision'],
+            'recall': spam['recall'],
+            'f1': spam['f1-score']
+        },
+        'per_class': per_class,
+        'confusion_matrix': confusion_matrix(y_true, y_pred, labels=[0, 1]).tolist(),
+        'timings': timings or {}
+    }
+    
+    if spam_scores is not None and len(np.unique(y_true)) == 2:
+        spam_scores = np.asarray(spam_scores, dtype=float)
+        precision, recall, _ = precision_recall_curve(y_true, spam_scores)
+        fpr, tpr, _ = roc_curve(y_true, spam_scores)
+        precision, recall = _thin(precision, recall)
+        fpr, tpr = _thin(fpr, tpr)
+        evaluation['curves'] = {
+            'precision_recall': {'precision': precision, 'recall': recall},
+            'roc': {'fpr': fpr, 'tpr': tpr}
+        }
+        evaluation['metrics']['average_precision'] = average_precision_score(y_true, spam_scores)
+        evaluation['metrics']['roc_auc'] = roc_auc_score(y_true, spam_scores)
+    
+    return evaluation
+
+def _figure():
+    """Figure matplotlib rendue par Agg, sans pyplot (n'affecte pas le backend Tk de l'interface)"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    
+    figure = Figure(figsize=(6, 5), dpi=EVALUATION_CONFIG['dpi'])
+    FigureCanvasAgg(figure)
+    return figure, figure.add_subplot(111)
+
+def render_evaluation(evaluation, output_dir, prefix):
+    """
+    Écrit les figures PNG du rapport
+    
+    Returns:
+        dict: Chemins des figures écrites (vide si matplotlib est absent)
+    """
+    try:
+        import matplotlib  # noqa: F401
+    except ImportError:
+        logger.warning("⚠️ matplotlib non installé, figures non générées")
+        return {}
+    
+    title = evaluation.get('name') or 'Modèle'
+    paths = {}
+    
+    figure, ax = _figure()
+    matrix = np.asarray(evaluation['confusion_matrix'])
+    ax.imshow(matrix, cmap='Blues')
+    for (row, column), count in np.ndenumerate(matrix):
+        ax.text(column, row, str(count), ha='center', va='center',
+                color='white' if count > matrix.max() / 2 else 'black')
+    ax.set_xticks([0, 1], CLASS_NAMES)
+    ax.set_yticks([0, 1], CLASS_NAMES)
+    ax.set_xlabel('Classe prédite')
+    ax.set_ylabel('Vraie classe')
+    ax.set_title(f'Matrice de Confusion - {title}')
+    figure.tight_layout()
+    paths['confusion_matrix'] = output_dir / f"{prefix}_confusion_matrix.png"
+    figure.savefig(paths['confusion_matrix'])
+    
+    curves = evaluation.get('curves')
+    if curves:
+        metrics = evaluation['metrics']
+        
+        figure, ax = _figure()
+        pr = curves['precision_recall']
+        ax.plot(pr['recall'], pr['precision'])
+        ax.set_xlabel('Rappel')
+        ax.set_ylabel('Précision')
+        ax.set_title(f"Précision / Rappel - {title} (AP = {metrics['average_precision']:.3f})")
+        ax.grid(alpha=0.3)
+        figure.tight_layout()
+        paths['precision_recall'] = output_dir / f"{prefix}_precision_recall.png"
+        figure.savefig(paths['precision_recall'])
+        
+        figure, ax = _figure()
+        roc = curves['roc']
+        ax.plot(roc['fpr'], roc['tpr'])
+        ax.plot([0, 1], [0, 1], linestyle='--', color='grey')
+        ax.set_xlabel('Taux de faux positifs')
+        ax.set_ylabel('Taux de vrais positifs')
+        ax.set_title(f"ROC - {title} (AUC = {metrics['roc_auc']:.3f})")
+        ax.grid(alpha=0.3)
+        figure.tight_layout()
+        paths['roc'] = output_dir / f"{prefix}_roc.png"
+        figure.savefig(paths['roc'])
+    
+    return paths
+
+def write_evaluation(evaluation, output_dir=None, render=None):
+    """
+    Écrit le rapport JSON et, si demandé, les figures PNG
+    
+    Args:
+        evaluation (dict): Sortie de build_evaluation
+        output_dir (str): Dossier de sortie (par défaut, EVALUATION_CONFIG)
+        render (bool): Générer les figures (par défaut, EVALUATION_CONFIG)
+    
+    Returns:
+        dict: Chemins écrits ('report' et une entrée par figure)
+    """
+    output_dir = Path(output_dir or EVALUATION_CONFIG['output_dir'])
+    output_dir.mkdir(parents=True, exist_ok=True)
+    render = EVALUATION_CONFIG['render_plots'] if render is None else render
+    prefix = re.sub(r'\W+', '_', evaluation.get('name') or 'model').strip('_')
+    
+    paths = {}
+    if render:
+        start = time.perf_counter()
+        paths.update(render_evaluation(evaluation, output_dir, prefix))
+        evaluation['timings']['render_s'] = time.perf_counter() - start
+    
+    paths['report'] = output_dir / f"{prefix}_evaluation.json"
+    with open(paths['report'], 'w', encoding='utf-8') as f:
+        json.dump({**evaluation, 'figures': {k: str(v) for k, v in paths.items()
+                                             if k != 'report'}}, f, indent=2)
+    
+    logger.info(f"✅ Rapport d'évaluation écrit dans {output_dir}")
+    return paths
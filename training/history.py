@@ -0,0 +1,208 @@
+# training/history.py
+"""
+Données d'entraînement tirées de l'historique des prédictions
+
+Les exemples viennent, dans cet ordre, des messages corrigés par
+l'utilisateur (les plus récentes corrections d'abord), du jeu de données
+CSV (ou JSONL), puis des verdicts non corrigés assez confiants. La table predictions est lue par lots sur une connexion
+dédiée ; le texte nettoyé stocké est réutilisé quand son empreinte de
+nettoyage est celle du TextProcessor courant, sinon le message est
+nettoyé à nouveau.
+
+Les doublons (même message normalisé, voir services.prefilter) ne sont
+appris qu'une fois : le premier exemple rencontré l'emporte (une
+correction prime sur le jeu de données, qui prime sur un verdict du modèle). Les
+empreintes vues sont gardées dans un filtre de Bloom, de taille fixe
+quel que soit le volume ; un faux positif écarte un message unique, avec
+une probabilité bornée par dedup_error_rate.
+
+Usage : python -m training.history [--algorithm svm] [--no-csv] [--min-confidence 0.99]
+"""
+import argparse
+import logging
+import time
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from config.settings import MODEL_CONFIG, HISTORY_TRAINING_CONFIG
+from database.db_manager import DatabaseManager
+from models.ml_model import MLModel
+from models.text_processor import TextProcessor
+from services.prefilter import message_digest
+from utils.bloom_filter import BloomFilter
+from .streaming import iter_chunks
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryDataSource:
+    """Exemples dédupliqués du jeu de données et de l'historique des prédictions"""
+    
+    def __init__(self, db_manager=None, csv_path=None, use_csv=True, min_confidence=None,
+                 batch_size=None, dedup_capacity=None, dedup_error_rate=None):
+        """
+        Initialise la source (les valeurs absentes viennent de HISTORY_TRAINING_CONFIG)
+        
+        Args:
+            db_manager (DatabaseManager): Base des prédictions (None : base par défaut)
+            csv_path (str): Jeu de données fusionné avec l'historique
+            use_csv (bool): Inclure le jeu de données
+            min_confidence (float): Confiance minimale d'un verdict non corrigé
+            batch_size (int): Lignes lues (et nettoyées) par lot
+            dedup_capacity (int): Messages distincts attendus (taille du filtre de Bloom)
+            dedup_error_rate (float): Taux de faux positifs du filtre
+        """
+        config = HISTORY_TRAINING_CONFIG
+        self.db_manager = db_manager or DatabaseManager()
+        self.csv_path = (csv_path or config['csv_path']) if use_csv else None
+        self.min_confidence = config['min_confidence'] if min_confidence is None else min_confidence
+        self.batch_size = batch_size or config['batch_size']
+        self.dedup_capacity = dedup_capacity or config['dedup_capacity']
+        self.dedup_error_rate = dedup_error_rate or config['dedup_error_rate']
+        self.text_processor = TextProcessor()
+        self.stats = {}
+    
+    def estimate_rows(self):
+        """Lignes à lire, approximativement (lignes du fichier et prédictions) : pour la progression"""
+        rows = 0
+        if self.csv_path is not None:
+            with open(self.csv_path, 'rb') as f:
+                rows += sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1 << 20), b''))
+        return rows + (self.db_manager.get_global_stats().get('total_predictions') or 0)
+    
+    def iter_batches(self):
+        """
+        Parcourt les exemples dédupliqués, par lots
+        
+        Yields:
+            tuple: (textes nettoyés, labels np.ndarray, source)
+        """
+        seen = BloomFilter(self.dedup_capacity, self.dedup_error_rate)
+        self.stats = {
+            'read': {}, 'kept': {}, 'duplicates': 0,
+            'cleaned_reused': 0, 'cleaned': 0, 'dedup_bytes': seen.nbytes
+        }
+        
+        for source, rows in self._iter_sources():
+            messages, stored, labels = [], [], []
+            for message, cleaned, label in rows:
+                self.stats['read'][source] = self.stats['read'].get(source, 0) + 1
+                digest = message_digest(message)
+                if digest in seen:
+                    self.stats['duplicates'] += 1
+                    continue
+                seen.add(digest)
+                messages.append(message)
+                stored.append(cleaned)
+                labels.append(label)
+            
+            if not messages:
+                continue
+            # Nettoyage des seuls messages sans texte nettoyé réutilisable
+            missing = [i for i, cleaned in enumerate(stored) if cleaned is None]
+            for i, cleaned in zip(missing, self.text_processor.clean_batch([messages[i] for i in missing])):
+                stored[i] = cleaned
+            self.stats['cleaned'] += len(missing)
+            self.stats['cleaned_reused'] += len(stored) - len(missing)
+            self.stats['kept'][source] = self.stats['kept'].get(source, 0) + len(stored)
+            
+            yield stored, np.asarray(labels, dtype=int), source
+    
+    def _iter_sources(self):
+        """
+        Lots bruts de chaque source
+        
+        Yields:
+            tuple: (source, [(message, texte nettoyé réutilisable ou None, label)])
+        """
+        yield from self._iter_history('feedback', corrected=True)
+        
+        if self.csv_path is not None:
+            for messages, labels in iter_chunks(self.csv_path, self.batch_size):
+                yield 'dataset', [(message, None, label) for message, label in zip(messages, labels)]
+        
+        yield from self._iter_history('history', corrected=False)
+    
+    def _iter_history(self, source, corrected):
+        """Lots bruts de la table predictions (corrections ou verdicts non corrigés)"""
+        fingerprint = self.text_processor.fingerprint
+        batch = []
+        for row in self.db_manager.iter_training_rows(corrected, self.min_confidence,
+                                                      self.batch_size):
+            reusable = (row['cleaned_message'] is not None
+                        and row['cleaner_version'] == fingerprint)
+            batch.append((row['message'], row['cleaned_message'] if reusable else None,
+                          int(row['label'])))
+            if len(batch) >= self.batch_size:
+                yield source, batch
+                batch = []
+        if batch:
+            yield source, batch
+    
+    def load(self):
+        """
+        Charge tous les exemples en mémoire (pour MLModel.train)
+        
+        Returns:
+            tuple: (textes nettoyés, labels np.ndarray)
+        """
+        texts, labels = [], []
+        for batch_texts, batch_labels, _ in self.iter_batches():
+            texts.extend(batch_texts)
+            labels.append(batch_labels)
+        return texts, np.concatenate(labels) if labels else np.array([], dtype=int)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--algorithm', choices=list(MLModel.ALGORITHMS),
+                        default=MODEL_CONFIG['algorithm'])
+    parser.add_argument('--csv', help="Jeu de données (défaut: HISTORY_TRAINING_CONFIG['csv_path'])")
+    parser.add_argument('--no-csv', action='store_true', help="Historique seul")
+    parser.add_argument('--min-confidence', type=float)
+    parser.add_argument('--output', default=str(HISTORY_TRAINING_CONFIG['bundle_path']))
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
+    print("="*60)
+    print("🗃️ ENTRAÎNEMENT SUR L'HISTORIQUE")
+    print("="*60 + "\n")
+    
+    source = HistoryDataSource(csv_path=args.csv, use_csv=not args.no_csv,
+                               min_confidence=args.min_confidence)
+    start = time.perf_counter()
+    texts, labels = source.load()
+    load_time = time.perf_counter() - start
+    
+    stats = source.stats
+    for name, count in stats['read'].items():
+        print(f"📥 {name:<10} {count:>9} lus  {stats['kept'].get(name, 0):>9} retenus")
+    print(f"🧹 {stats['duplicates']} doublons écartés, {stats['cleaned_reused']} textes nettoyés "
+          f"réutilisés, {stats['cleaned']} nettoyés ({load_time:.1f} s)")
+    
+    if len(np.unique(labels)) < 2:
+        print("❌ Il faut des exemples des deux classes")
+        return
+    
+    X_train, X_test, y_train, y_test = train_test_split(
+        texts, labels,
+        test_size=MODEL_CONFIG['test_size'],
+        random_state=MODEL_CONFIG['random_state'],
+        stratify=labels
+    )
+    model = MLModel(args.algorithm)
+    if not model.train(X_train, y_train, X_test, y_test):
+        print("❌ Échec de l'entraînement")
+        return
+    
+    print(f"\n🎯 Accuracy: {model.metrics['accuracy']*100:.2f}%  F1: {model.metrics['f1']*100:.2f}%")
+    metadata = {'history': {key: stats[key] for key in ('read', 'kept', 'duplicates')},
+                'min_confidence': source.min_confidence}
+    if model.save_bundle(args.output, metadata):
+        print(f"✅ Bundle : {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+# training/pipeline.py
+"""
+Pipeline d'entraînement par étapes, avec cache sur disque
+
+Étapes : load -> clean -> split -> vectorize -> fit -> evaluate -> export.
+La sortie de chaque étape est mise en cache sous une clé qui dépend de la
+clé de l'étape précédente, de ses paramètres et du code qui la produit :
+changer d'algorithme ne relance ni le nettoyage ni la vectorisation.
+
+Usage : python -m training.pipeline [--algorithm svm] [--max-features 5000] [--force clean]
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import logging
+import pickle
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.model_selection import train_test_split
+
+from config.settings import MODEL_CONFIG, PIPELINE_CONFIG
+from models.ml_model import MLModel
+from models.text_processor import TextProcessor
+from .evaluation import build_evaluation, write_evaluation
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('load', 'clean', 'split', 'vectorize', 'fit', 'evaluate', 'export')
+
+def file_checksum(path, chunk_size=1 << 20):
+    """Empreinte SHA-1 du contenu d'un fichier"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def code_fingerprint(*objects):
+    """Empreinte du code source des fonctions ou classes données"""
+    digest = hashlib.sha1()
+    for obj in objects:
+        digest.update(inspect.getsource(obj).encode('utf-8'))
+    return digest.hexdigest()
+
+def stage_key(stage, upstream, params):
+    """Clé de cache d'une étape"""
+    payload = json.dumps(
+        {'stage': stage, 'upstream': upstream, 'params': params},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class TrainingPipeline:
+    """Exécute les étapes d'entraînement en réutilisant les sorties inchangées"""
+    
+    def __init__(self, data_path=None, algorithm=None, max_features=None,
+                 test_size=None, random_state=None, cache_dir=None, bundle_path=None):
+        """
+        Initialise le pipeline (les valeurs absentes viennent de MODEL_CONFIG / PIPELINE_CONFIG)
+        
+        Args:
+            data_path (str): Jeu de données (CSV au format de data/spam.csv)
+            algorithm (str): Clé de MLModel.ALGORITHMS
+            max_features (int): Taille du vocabulaire TF-IDF
+            test_size (float): Part du jeu de test
+            random_state (int): Graine du split
+            cache_dir (str): Dossier du cache des étapes
+            bundle_path (str): Bundle produit par l'étape export
+        """
+        self.data_path = Path(data_path or PIPELINE_CONFIG['data_path'])
+        self.algorithm = algorithm or MODEL_CONFIG['algorithm']
+        self.max_features = max_features or MODEL_CONFIG['max_features']
+        self.test_size = test_size or MODEL_CONFIG['test_size']
+        self.random_state = random_state if random_state is not None else MODEL_CONFIG['random_state']
+        self.cache_dir = Path(cache_dir or PIPELINE_CONFIG['cache_dir'])
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.bundle_path = Path(bundle_path or PIPELINE_CONFIG['bundle_path'])
+        
+        if self.algorithm not in MLModel.ALGORITHMS:
+            raise ValueError(f"Algorithme inconnu: {self.algorithm}")
+        
+        # Clés des étapes de la dernière exécution, et sorties déjà en mémoire
+        self.keys = {}
+        self.outputs = {}
+        # stage -> 'cache' ou 'run' (et durée), pour le rapport
+        self.report = {}
+    
+    def stage_params(self, stage):
+        """Paramètres et code dont dépend la sortie d'une étape"""
+        if stage == 'load':
+            return {'data': file_checksum(self.data_path), 'code': code_fingerprint(self._load)}
+        if stage == 'clean':
+            return {'code': code_fingerprint(TextProcessor, self._clean)}
+        if stage == 'split':
+            return {'test_size': self.test_size, 'random_state': self.random_state,
+                    'code': code_fingerprint(self._split)}
+        if stage == 'vectorize':
+            return {'max_features': self.max_features, 'sklearn': sklearn.__version__,
+                    'code': code_fingerprint(self._vectorize)}
+        if stage == 'fit':
+            estimator = self._new_estimator()
+            return {'algorithm': self.algorithm, 'estimator': type(estimator).__name__,
+                    'params': estimator.get_params(), 'sklearn': sklearn.__version__,
+                    'code': code_fingerprint(self._fit)}
+        if stage == 'evaluate':
+            return {'code': code_fingerprint(self._evaluate, build_evaluation)}
+        return {'bundle_path': str(self.bundle_path), 'code': code_fingerprint(self._export)}
+    
+    def cache_path(self, stage, key):
+        return self.cache_dir / f"{stage}-{key[:16]}.pkl"
+    
+    def run(self, until='export', force=()):
+        """
+        Exécute les étapes jusqu'à until (incluse)
+        
+        Les sorties en cache ne sont relues que si une étape suivante doit
+        être exécutée et en a besoin.
+        
+        Args:
+            until (str): Dernière étape à exécuter
+            force (iterable): Étapes à recalculer même si leur sortie est en cache
+                              (les étapes suivantes sont alors recalculées aussi)
+        
+        Returns:
+            dict: Rapport par étape (cache ou exécutée, durée, clé)
+        """
+        upstream = None
+        forced = False
+        for stage in STAGES[:STAGES.index(until) + 1]:
+            start = time.perf_counter()
+            key = stage_key(stage, upstream, self.stage_params(stage))
+            self.keys[stage] = key
+            upstream = key
+            
+            forced = forced or stage in force
+            path = self.cache_path(stage, key)
+            cached = not forced and self._is_cached(stage, path)
+            if cached:
+                logger.info(f"⏭️ Étape {stage} : sortie en cache")
+            else:
+                logger.info(f"▶️ Étape {stage}...")
+                output = getattr(self, f"_{stage}")()
+                self._write_cache(path, output)
+                self.outputs[stage] = output
+            
+            self.report[stage] = {
+                'status': 'cache' if cached else 'run',
+                'seconds': time.perf_counter() - start,
+                'key': key[:16]
+            }
+        
+        return self.report
+    
+    def _is_cached(self, stage, path):
+        """Indique si la sortie d'une étape est réutilisable"""
+        if not path.exists():
+            return False
+        if stage != 'export':
+            return True
+        
+        # Le bundle exporté a pu être écrasé depuis (autre algorithme...)
+        output = self._read_cache(path)
+        return (output is not None and self.bundle_path.exists()
+                and file_checksum(self.bundle_path) == output['checksum'])
+    
+    def output(self, stage):
+        """Sortie d'une étape de la dernière exécution (relue du cache si besoin)"""
+        if stage not in self.outputs:
+            if stage not in self.keys:
+                raise KeyError(f"Étape {stage} non exécutée")
+            output = self._read_cache(self.cache_path(stage, self.keys[stage]))
+            if output is None:
+                raise RuntimeError(f"Sortie de l'étape {stage} introuvable dans le cache")
+            self.outputs[stage] = output
+        return self.outputs[stage]
+    
+    def _read_cache(self, path):
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️ Cache illisible ({path.name}): {e}")
+            return None
+    
+    def _write_cache(self, path, output):
+        tmp_path = Path(f"{path}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(output, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(path)
+    
+    def clear_cache(self):
+        """Supprime toutes les sorties en cache"""
+        removed = 0
+        for path in self.cache_dir.glob('*.pkl'):
+            path.unlink()
+            removed += 1
+        logger.info(f"🧹 {removed} sorties d'étapes supprimées du cache")
+        return removed
+    
+    # Étapes
+    
+    def _new_estimator(self):
+        factory = MLModel.ALGORITHMS[self.algorithm]
+        return factory() if callable(factory) else factory
+    
+    def _load(self):
+        df = pd.read_csv(self.data_path, encoding='latin-1')
+        df = df[['v1', 'v2']]
+        df.columns = ['label', 'message']
+        return {
+            'messages': df['message'].tolist(),
+            'labels': df['label'].map({'ham': 0, 'spam': 1}).to_numpy()
+        }
+    
+    def _clean(self):
+        processor = TextProcessor()
+        return {'cleaned': processor.clean_batch(self.output('load')['messages'])}
+    
+    def _split(self):
+        labels = self.output('load')['labels']
+        train_idx, test_idx = train_test_split(
+            np.arange(len(labels)),
+            test_size=self.test_size,
+            random_state=self.random_state,
+            stratify=labels
+        )
+        return {
+            'train': train_idx,
+            'test': test_idx,
+            'y_train': labels[train_idx],
+            'y_test': labels[test_idx]
+        }
+    
+    def _vectorize(self):
+        cleaned = self.output('clean')['cleaned']
+        split = self.output('split')
+        vectorizer = TfidfVectorizer(max_features=self.max_features)
+        return {
+            'vectorizer': vectorizer,
+            'X_train': vectorizer.fit_transform([cleaned[i] for i in split['train']]),
+            'X_test': vectorizer.transform([cleaned[i] for i in split['test']])
+        }
+    
+    def _fit(self):
+        estimator = self._new_estimator()
+        estimator.fit(self.output('vectorize')['X_train'], self.output('split')['y_train'])
+        return {'estimator': estimator}
+    
+    def _evaluate(self):
+        y_test = self.output('split')['y_test']
+        X_test = self.output('vectorize')['X_test']
+        estimator = self.output('fit')['estimator']
+        
+        start = time.perf_counter()
+        spam_scores = estimator.predict_proba(X_test)[:, 1]
+        predict_s = time.perf_counter() - start
+        
+        timings = {f"{stage}_s": info['seconds'] for stage, info in self.report.items()}
+        timings['predict_proba_s'] = predict_s
+        evaluation = build_evaluation(y_test, (spam_scores > 0.5).astype(int), spam_scores,
+                                      timings, f"{self.algorithm}_{self.max_features}")
+        evaluation['figures'] = {
+            name: str(path) for name, path in write_evaluation(evaluation).items()
+        }
+        return evaluation
+    
+    def _export(self):
+        vectorized = self.output('vectorize')
+        model = MLModel(self.algorithm, max_features=self.max_features)
+        model.set_trained(
+            self.output('fit')['estimator'],
+            vectorized['vectorizer'],
+            vectorized['X_train'],
+            self.output('split')['y_train'],
+            self.output('evaluate')['metrics']
+        )
+        metadata = {'pipeline_keys': {stage: key[:16] for stage, key in self.keys.items()},
+                    'data_path': str(self.data_path)}
+        if not model.save_bundle(self.bundle_path, metadata):
+            raise RuntimeError(f"Échec de l'export du bundle {self.bundle_path}")
+        return {
+            'bundle_path': str(self.bundle_path),
+            'version': model.version,
+            'checksum': file_checksum(self.bundle_path)
+        }
+    
+    def build_model(self):
+        """
+        Modèle correspondant aux sorties du pipeline (après run)
+        
+        Returns:
+            MLModel: Modèle chargé depuis le bundle exporté
+        """
+        model = MLModel(self.algorithm)
+        return model if model.load_bundle(self.output('export')['bundle_path']) else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--data', help="Jeu de données (défaut: PIPELINE_CONFIG['data_path'])")
+    parser.add_argument('--algorithm', choices=list(MLModel.ALGORITHMS))
+    parser.add_argument('--max-features', type=int)
+    parser.add_argument('--until', choices=STAGES, default='export')
+    parser.add_argument('--force', nargs='+', choices=STAGES, default=(),
+                        help="Étapes à recalculer malgré le cache")
+    parser.add_argument('--output', help="Bundle exporté (défaut: PIPELINE_CONFIG['bundle_path'])")
+    parser.add_argument('--clear-cache', action='store_true')
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
+    print("="*60)
+    print("🏭 PIPELINE D'ENTRAÎNEMENT")
+    print("="*60 + "\n")
+    
+    pipeline = TrainingPipeline(
+        data_path=args.data,
+        algorithm=args.algorithm,
+        max_features=args.max_features,
+        bundle_path=args.output
+    )
+    if args.clear_cache:
+        pipeline.clear_cache()
+    
+    report = pipeline.run(until=args.until, force=args.force)
+    
+    print()
+    for stage, info in report.items():
+        status = "⏭️ cache" if info['status'] == 'cache' else "▶️ exécutée"
+        print(f"{stage:<10} {status:<12} {info['seconds']*1000:8.1f} ms  [{info['key']}]")
+    
+    if 'evaluate' in pipeline.keys:
+        metrics = pipeline.output('evaluate')['metrics']
+        print(f"\n🎯 Accuracy: {metrics['accuracy']*100:.2f}%  F1: {metrics['f1']*100:.2f}%")
+    if 'export' in pipeline.keys:
+        print(f"✅ Bundle : {pipeline.output('export')['bundle_path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+# training/search.py
+"""
+Recherche d'hyperparamètres par validation croisée, en parallèle
+
+Les grilles (alpha de Naive Bayes, C de la régression logistique et du
+SVM, max_features) viennent de SEARCH_CONFIG. Pour chaque taille de
+vocabulaire, le vectorizer de chaque fold est appris une seule fois ; les
+matrices sont écrites sur disque (training.shared_matrix) et relues en
+lecture seule par tous les processus et toutes les configurations, puis
+d'une recherche à l'autre tant que les données et les folds sont inchangés.
+
+Successive halving : chaque tour évalue les configurations restantes sur
+un échantillon croissant de chaque fold et n'en garde que 1 / facteur ;
+seules les meilleures voient les folds complets. La configuration gagnante
+est réentraînée sur tout le jeu d'apprentissage, évaluée sur le jeu de
+test et écrite dans le bundle, hyperparamètres compris.
+
+Usage : python -m training.search [--algorithms svm naive_bayes] [--scoring f1] [--workers 4]
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import sklearn
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import StratifiedKFold, train_test_split
+
+from config.settings import MODEL_CONFIG, SEARCH_CONFIG
+from models.ml_model import MLModel
+from models.text_processor import TextProcessor
+from .evaluation import build_evaluation
+from .pipeline import code_fingerprint
+from .shared_matrix import share_csr, load_csr
+from .streaming import iter_chunks
+
+logger = logging.getLogger(__name__)
+
+def load_dataset(path):
+    """
+    Charge un jeu de données complet (CSV ou JSONL, mêmes formats que training.streaming)
+    
+    Returns:
+        tuple: (messages, labels np.ndarray)
+    """
+    messages, labels = [], []
+    for chunk_messages, chunk_labels in iter_chunks(path, 50_000):
+        messages.extend(chunk_messages)
+        labels.append(chunk_labels)
+    return messages, np.concatenate(labels) if labels else np.array([], dtype=int)
+
+def candidate_grid(algorithms=None, param_grid=None, max_features_grid=None):
+    """
+    Produit cartésien des grilles
+    
+    Returns:
+        list: Configurations {'algorithm', 'max_features', 'params'}
+    """
+    param_grid = param_grid or SEARCH_CONFIG['param_grid']
+    max_features_grid = max_features_grid or SEARCH_CONFIG['max_features_grid']
+    candidates = []
+    for algorithm in algorithms or param_grid:
+        grid = param_grid.get(algorithm, {})
+        names = sorted(grid)
+        for values in itertools.product(*(grid[name] for name in names)):
+            for max_features in max_features_grid:
+                candidates.append({
+                    'algorithm': algorithm,
+                    'max_features': max_features,
+                    'params': dict(zip(names, values))
+                })
+    return candidates
+
+def candidate_name(candidate):
+    params = ','.join(f"{name}={value}" for name, value in sorted(candidate['params'].items()))
+    return f"{candidate['algorithm']}@{candidate['max_features']}[{params}]"
+
+def new_estimator(candidate):
+    """Estimateur non entraîné d'une configuration"""
+    return MLModel.ALGORITHMS[candidate['algorithm']]().set_params(**candidate['params'])
+
+def score_fold(candidate, fold, n_samples, scoring):
+    """
+    Entraîne une configuration sur les n_samples premiers exemples d'un fold
+    et la note sur la partie validation (exécuté dans un processus du pool)
+    
+    Returns:
+        float: Score de validation
+    """
+    X_train = load_csr(fold['X_train'])[:n_samples]
+    y_train = np.load(fold['y_train'], mmap_mode='r')[:n_samples]
+    estimator = new_estimator(candidate).fit(X_train, np.asarray(y_train))
+    return float(get_scorer(scoring)(estimator, load_csr(fold['X_val']), np.load(fold['y_val'])))
+
+
+class HyperparameterSearch:
+    """Validation croisée sur une grille, avec folds en cache et successive halving"""
+    
+    def __init__(self, messages, labels, candidates=None, cv_folds=None, scoring=None,
+                 halving_factor=None, min_samples=None, workers=None, cache_dir=None,
+                 test_size=None, random_state=None):
+        """
+        Initialise la recherche (les valeurs absentes viennent de SEARCH_CONFIG / MODEL_CONFIG)
+        
+        Args:
+            messages (list): Messages bruts
+            labels: Labels (0 = ham, 1 = spam)
+            candidates (list): Configurations (par défaut, candidate_grid())
+            cv_folds (int): Nombre de folds
+            scoring (str): Nom de scorer scikit-learn
+            halving_factor (int): 1 / part des configurations conservées à chaque tour
+            min_samples (int): Exemples d'apprentissage par fold au premier tour
+            workers (int): Processus (1 = dans le processus courant)
+            cache_dir (str): Dossier des matrices de folds
+            test_size (float): Part du jeu de test, tenu hors de la recherche
+            random_state (int): Graine des splits
+        """
+        self.candidates = candidates or candidate_grid()
+        self.cv_folds = cv_folds or SEARCH_CONFIG['cv_folds']
+        self.scoring = scoring or SEARCH_CONFIG['scoring']
+        self.halving_factor = halving_factor or SEARCH_CONFIG['halving_factor']
+        self.min_samples = min_samples or SEARCH_CONFIG['min_samples']
+        self.workers = workers or SEARCH_CONFIG['workers'] or os.cpu_count()
+        self.cache_dir = Path(cache_dir or SEARCH_CONFIG['cache_dir'])
+        self.random_state = random_state if random_state is not None else MODEL_CONFIG['random_state']
+        get_scorer(self.scoring)  # Nom invalide : erreur avant tout calcul
+        
+        cleaned = TextProcessor().clean_batch(messages)
+        labels = np.asarray(labels, dtype=int)
+        train_idx, test_idx = train_test_split(
+            np.arange(len(labels)),
+            test_size=test_size or MODEL_CONFIG['test_size'],
+            random_state=self.random_state,
+            stratify=labels
+        )
+        self.X_train = [cleaned[i] for i in train_idx]
+        self.X_test = [cleaned[i] for i in test_idx]
+        self.y_train = labels[train_idx]
+        self.y_test = labels[test_idx]
+        
+        self._key = None
+        self.rounds = []
+        self.results = {}
+        self.best = None
+        self.cache_hits = 0
+        self.timings = {}
+    
+    def data_key(self):
+        """Clé des folds : données d'apprentissage, découpage et code de vectorisation"""
+        digest = hashlib.sha1()
+        for text in self.X_train:
+            digest.update(text.encode('utf-8'))
+            digest.update(b'\0')
+        digest.update(self.y_train.tobytes())
+        digest.update(json.dumps({
+            'cv_folds': self.cv_folds,
+            'random_state': self.random_state,
+            'sklearn': sklearn.__version__,
+            'code': code_fingerprint(self._vectorize_folds)
+        }, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def fold_matrices(self, max_features):
+        """
+        Matrices des folds pour une taille de vocabulaire, depuis le cache si possible
+        
+        Returns:
+            list: Une description par fold (matrices partagées et labels en .npy)
+        """
+        directory = self.cache_dir / f"{self._key[:16]}-{max_features}"
+        index = directory / "folds.json"
+        if index.exists():
+            self.cache_hits += 1
+            with open(index, encoding='utf-8') as f:
+                return json.load(f)
+        
+        folds = self._vectorize_folds(max_features, directory)
+        # L'index est écrit en dernier : un cache interrompu est recalculé
+        with open(index, 'w', encoding='utf-8') as f:
+            json.dump(folds, f)
+        return folds
+    
+    def _vectorize_folds(self, max_features, directory):
+        splitter = StratifiedKFold(n_splits=self.cv_folds, shuffle=True,
+                                   random_state=self.random_state)
+        folds = []
+        for number, (train_idx, val_idx) in enumerate(splitter.split(self.X_train, self.y_train)):
+            # Ordre aléatoire : les premiers exemples forment l'échantillon d'un tour
+            train_idx = np.random.default_rng(self.random_state + number).permutation(train_idx)
+            vectorizer = TfidfVectorizer(max_features=max_features)
+            X_train = vectorizer.fit_transform([self.X_train[i] for i in train_idx])
+            X_val = vectorizer.transform([self.X_train[i] for i in val_idx])
+            
+            fold_dir = directory / f"fold_{number}"
+            fold = {
+                'X_train': share_csr(X_train, fold_dir, 'X_train'),
+                'X_val': share_csr(X_val, fold_dir, 'X_val'),
+                'y_train': str(fold_dir / 'y_train.npy'),
+                'y_val': str(fold_dir / 'y_val.npy'),
+                'train_size': int(len(train_idx))
+            }
+            np.save(fold['y_train'], self.y_train[train_idx])
+            np.save(fold['y_val'], self.y_train[val_idx])
+            folds.append(fold)
+        return folds
+    
+    def run(self):
+        """
+        Exécute les tours de successive halving
+        
+        Returns:
+            dict: Meilleure configuration (avec son score moyen de validation)
+        """
+        start = time.perf_counter()
+        self._key = self.data_key()
+        folds = {
+            max_features: self.fold_matrices(max_features)
+            for max_features in sorted({c['max_features'] for c in self.candidates})
+        }
+        self.timings['folds_s'] = time.perf_counter() - start
+        logger.info(f"📦 Folds prêts ({self.cache_hits}/{len(folds)} depuis le cache, "
+                    f"{self.timings['folds_s']:.1f} s)")
+        
+        full = max(fold['train_size'] for fold_list in folds.values() for fold in fold_list)
+        n_samples = min(self.min_samples, full)
+        candidates = list(self.candidates)
+        
+        start = time.perf_counter()
+        pool = None
+        if self.workers > 1:
+            pool = ProcessPoolExecutor(max_workers=self.workers,
+                                       mp_context=multiprocessing.get_context('spawn'))
+        try:
+            while True:
+                round_start = time.perf_counter()
+                scores = self._score_round(pool, candidates, folds, n_samples)
+                ranked = sorted(range(len(candidates)), key=lambda i: -scores[i].mean())
+                
+                entries = []
+                for i in ranked:
+                    name = candidate_name(candidates[i])
+                    entry = {**candidates[i], 'name': name, 'samples': n_samples,
+                             'mean_score': float(scores[i].mean()),
+                             'std_score': float(scores[i].std())}
+                    self.results[name] = entry
+                    entries.append(entry)
+                self.rounds.append({
+                    'samples': n_samples,
+                    'candidates': len(candidates),
+                    'seconds': time.perf_counter() - round_start,
+                    'results': entries
+                })
+                logger.info(f"🔁 Tour {len(self.rounds)} : {len(candidates)} configurations "
+                            f"sur {n_samples} exemples/fold, meilleure {entries[0]['name']} "
+                            f"({self.scoring}={entries[0]['mean_score']:.4f})")
+                
+                if n_samples >= full:
+                    break
+                keep = max(1, math.ceil(len(candidates) / self.halving_factor))
+                candidates = [candidates[i] for i in ranked[:keep]]
+                n_samples = full if keep == 1 else min(n_samples * self.halving_factor, full)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        self.timings['search_s'] = time.perf_counter() - start
+        self.best = self.rounds[-1]['results'][0]
+        return self.best
+    
+    def _score_round(self, pool, candidates, folds, n_samples):
+        """Scores (configurations x folds) d'un tour"""
+        tasks = [
+            (candidate, fold, n_samples, self.scoring)
+            for candidate in candidates
+            for fold in folds[candidate['max_features']]
+        ]
+        if pool is None:
+            scores = [score_fold(*task) for task in tasks]
+        else:
+            scores = [future.result() for future in [pool.submit(score_fold, *task) for task in tasks]]
+        return np.asarray(scores).reshape(len(candidates), self.cv_folds)
+    
+    def refit(self):
+        """
+        Réentraîne la meilleure configuration sur tout le jeu d'apprentissage
+        
+        Returns:
+            MLModel: Modèle évalué sur le jeu de test, avec ses hyperparamètres
+        """
+        start = time.perf_counter()
+        best = self.best
+        vectorizer = TfidfVectorizer(max_features=best['max_features'])
+        X_train_vec = vectorizer.fit_transform(self.X_train)
+        estimator = new_estimator(best).fit(X_train_vec, self.y_train)
+        
+        spam_scores = estimator.predict_proba(vectorizer.transform(self.X_test))[:, 1]
+        metrics = build_evaluation(self.y_test, (spam_scores > 0.5).astype(int), spam_scores)['metrics']
+        
+        model = MLModel(best['algorithm'], max_features=best['max_features'], params=best['params'])
+        model.set_trained(estimator, vectorizer, X_train_vec, self.y_train, metrics)
+        self.timings['refit_s'] = time.perf_counter() - start
+        return model
+    
+    def report(self):
+        """Rapport sérialisable de la recherche"""
+        return {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'scoring': self.scoring,
+            'cv_folds': self.cv_folds,
+            'halving_factor': self.halving_factor,
+            'workers': self.workers,
+            'candidates': len(self.candidates),
+            'fits': sum(r['candidates'] for r in self.rounds) * self.cv_folds,
+            'fold_cache_hits': self.cache_hits,
+            'timings': self.timings,
+            'best': self.best,
+            'rounds': self.rounds
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--data', default=str(SEARCH_CONFIG['data_path']),
+                        help="CSV ou JSONL (défaut: SEARCH_CONFIG['data_path'])")
+    parser.add_argument('--algorithms', nargs='+', choices=list(MLModel.ALGORITHMS))
+    parser.add_argument('--scoring')
+    parser.add_argument('--folds', type=int)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--output', default=str(SEARCH_CONFIG['bundle_path']))
+    parser.add_argument('--report', default=str(SEARCH_CONFIG['report_path']))
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
+    print("="*60)
+    print("🔎 RECHERCHE D'HYPERPARAMÈTRES")
+    print("="*60 + "\n")
+    
+    messages, labels = load_dataset(args.data)
+    search = HyperparameterSearch(messages, labels, candidate_grid(args.algorithms),
+                                  cv_folds=args.folds, scoring=args.scoring, workers=args.workers)
+    best = search.run()
+    model = search.refit()
+    
+    report = search.report()
+    report['test_metrics'] = model.metrics
+    print(f"\n🏆 {best['name']} : {search.scoring}={best['mean_score']:.4f} "
+          f"(± {best['std_score']:.4f}, {search.cv_folds} folds)")
+    print(f"🎯 Test : accuracy={model.metrics['accuracy']*100:.2f}%  "
+          f"f1={model.metrics['f1']*100:.2f}%")
+    print(f"⏱️ {report['fits']} entraînements, dont {search.rounds[-1]['candidates'] * search.cv_folds} "
+          f"sur les folds complets (grille : {len(search.candidates) * search.cv_folds}) "
+          f"en {search.timings['search_s']:.1f} s")
+    
+    metadata = {'search': {key: report[key] for key in ('scoring', 'cv_folds', 'candidates', 'best')}}
+    if model.save_bundle(args.output, metadata):
+        print(f"✅ Bundle : {args.output}")
+    
+    report_path = Path(args.report)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"✅ Rapport : {report_path}")
+
+
+if __name__ == "__main__":
+    main()
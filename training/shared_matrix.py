@@ -0,0 +1,50 @@
+# training/shared_matrix.py
+"""
+Matrices creuses partagées entre processus par fichiers mappés en mémoire
+
+La matrice CSR est écrite une fois (data, indices, indptr en .npy) ; les
+processus de travail la rouvrent en lecture seule avec np.load(mmap_mode='r') :
+les pages sont partagées par le cache du système au lieu d'être copiées
+et sérialisées vers chaque processus.
+"""
+from pathlib import Path
+
+import numpy as np
+import scipy.sparse as sp
+
+def share_csr(matrix, directory, name):
+    """
+    Écrit une matrice creuse pour la partager
+    
+    Args:
+        matrix: Matrice creuse (convertie en CSR)
+        directory (str): Dossier des fichiers .npy
+        name (str): Préfixe des fichiers
+    
+    Returns:
+        dict: Description picklable (chemins, forme) à passer à load_csr
+    """
+    matrix = sp.csr_matrix(matrix)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    
+    spec = {'shape': matrix.shape}
+    for part in ('data', 'indices', 'indptr'):
+        path = directory / f"{name}.{part}.npy"
+        np.save(path, getattr(matrix, part))
+        spec[part] = str(path)
+    return spec
+
+def load_csr(spec):
+    """
+    Rouvre une matrice partagée, sans copie (tableaux en lecture seule)
+    
+    Args:
+        spec (dict): Sortie de share_csr
+    
+    Returns:
+        scipy.sparse.csr_matrix: Matrice adossée aux fichiers mappés
+    """
+    data, indices, indptr = (np.load(spec[part], mmap_mode='r')
+                             for part in ('data', 'indices', 'indptr'))
+    return sp.csr_matrix((data, indices, indptr), shape=spec['shape'], copy=False)
@@ -0,0 +1,237 @@
+# training/streaming.py
+"""
+Entraînement en flux (out-of-core) sur un CSV ou un JSONL lu par blocs
+
+Chaque bloc est nettoyé, vectorisé par hachage (aucun vocabulaire à
+garder en mémoire) puis appris avec partial_fit. Le jeu d'évaluation est
+un échantillon uniforme du flux (reservoir sampling) : un message entré
+dans le réservoir n'est pas appris, et celui qu'il remplace rejoint le
+bloc d'apprentissage. La mémoire reste bornée par la taille d'un bloc et
+celle du réservoir, quelle que soit la taille du corpus.
+
+Usage : python -m training.streaming --data archive.jsonl [--algorithm svm] [--chunk-size 10000]
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+from sklearn.naive_bayes import MultinomialNB
+
+from config.settings import MODEL_CONFIG, STREAMING_CONFIG
+from models.ml_model import MLModel
+from models.text_processor import TextProcessor
+
+logger = logging.getLogger(__name__)
+
+# Estimateurs avec partial_fit, par clé de MLModel.ALGORITHMS
+STREAMING_ALGORITHMS = {
+    'naive_bayes': MultinomialNB,
+    'logistic_regression': lambda: SGDClassifier(loss='log_loss', alpha=1e-5,
+                                                 random_state=MODEL_CONFIG['random_state']),
+    'svm': lambda: SGDClassifier(loss='modified_huber', alpha=1e-5,
+                                 random_state=MODEL_CONFIG['random_state'])
+}
+
+LABELS = {'ham': 0, 'spam': 1, '0': 0, '1': 1, 0: 0, 1: 1}
+
+def iter_chunks(path, chunk_size):
+    """
+    Lit un jeu de données par blocs
+    
+    CSV : colonnes v1 (label) / v2 (message) comme data/spam.csv, ou
+    label / message. JSONL : un objet {"label": ..., "message": ...} par ligne.
+    
+    Yields:
+        tuple: (messages, labels np.ndarray) ; les lignes au label inconnu sont ignorées
+    """
+    path = Path(path)
+    if path.suffix in ('.jsonl', '.json'):
+        reader = pd.read_json(path, lines=True, chunksize=chunk_size, dtype=False)
+    else:
+        reader = pd.read_csv(path, encoding='latin-1', chunksize=chunk_size,
+                             dtype=str, keep_default_na=False)
+    
+    with reader:
+        for chunk in reader:
+            if 'v1' in chunk.columns:
+                chunk = chunk.rename(columns={'v1': 'label', 'v2': 'message'})
+            labels = chunk['label'].map(lambda value: LABELS.get(str(value).strip().lower()))
+            known = labels.notna().to_numpy()
+            yield (chunk['message'].astype(str).to_numpy()[known].tolist(),
+                   labels.to_numpy()[known].astype(int))
+
+
+class StreamingTrainer:
+    """Apprend un modèle bloc par bloc, avec un jeu d'évaluation échantillonné du flux"""
+    
+    def __init__(self, algorithm=None, chunk_size=None, n_features=None,
+                 holdout_size=None, random_state=None):
+        """
+        Initialise l'entraîneur
+        
+        Args:
+            algorithm (str): Clé de STREAMING_ALGORITHMS
+            chunk_size (int): Lignes lues et apprises par bloc
+            n_features (int): Dimension de l'espace de hachage
+            holdout_size (int): Taille du réservoir d'évaluation
+            random_state (int): Graine du réservoir
+        """
+        self.algorithm = algorithm or MODEL_CONFIG['algorithm']
+        if self.algorithm not in STREAMING_ALGORITHMS:
+            raise ValueError(f"Algorithme sans partial_fit: {self.algorithm}")
+        
+        self.chunk_size = chunk_size or STREAMING_CONFIG['chunk_size']
+        self.holdout_size = holdout_size or STREAMING_CONFIG['holdout_size']
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features or STREAMING_CONFIG['n_features'],
+            alternate_sign=False  # Features positives (Naive Bayes)
+        )
+        self.estimator = STREAMING_ALGORITHMS[self.algorithm]()
+        self.text_processor = TextProcessor()
+        self.rng = np.random.default_rng(
+            random_state if random_state is not None else MODEL_CONFIG['random_state']
+        )
+        
+        # Réservoir d'évaluation : textes nettoyés et labels
+        self.holdout_texts = []
+        self.holdout_labels = []
+        self.seen = 0
+        self.trained = 0
+        self.chunks = 0
+    
+    def _sample_holdout(self, cleaned, labels):
+        """
+        Passe un bloc dans le réservoir (algorithme R)
+        
+        Returns:
+            tuple: (textes, labels) à apprendre : ceux non retenus, et ceux évincés du réservoir
+        """
+        fill = min(max(self.holdout_size - len(self.holdout_texts), 0), len(cleaned))
+        self.holdout_texts.extend(cleaned[:fill])
+        self.holdout_labels.extend(labels[:fill])
+        
+        # Rang de chaque message restant dans le flux, et emplacement tiré
+        ranks = np.arange(self.seen + fill + 1, self.seen + len(cleaned) + 1)
+        slots = self.rng.integers(0, ranks) if len(ranks) else ranks
+        self.seen += len(cleaned)
+        
+        train_texts, train_labels = [], []
+        for text, label, slot in zip(cleaned[fill:], labels[fill:], slots):
+            if slot < self.holdout_size:
+                train_texts.append(self.holdout_texts[slot])
+                train_labels.append(self.holdout_labels[slot])
+                self.holdout_texts[slot] = text
+                self.holdout_labels[slot] = label
+            else:
+                train_texts.append(text)
+                train_labels.append(label)
+        return train_texts, train_labels
+    
+    def partial_fit(self, messages, labels):
+        """Apprend un bloc de messages bruts"""
+        cleaned = self.text_processor.clean_batch(messages)
+        train_texts, train_labels = self._sample_holdout(cleaned, labels)
+        if train_texts:
+            self.estimator.partial_fit(self.vectorizer.transform(train_texts),
+                                       np.asarray(train_labels, dtype=int), classes=[0, 1])
+            self.trained += len(train_texts)
+        self.chunks += 1
+    
+    def fit(self, path):
+        """
+        Apprend tout le jeu de données, bloc par bloc
+        
+        Args:
+            path (str): CSV ou JSONL
+        
+        Returns:
+            StreamingTrainer: self
+        """
+        start = time.perf_counter()
+        for messages, labels in iter_chunks(path, self.chunk_size):
+            self.partial_fit(messages, labels)
+            if self.chunks % 10 == 0:
+                logger.info(f"📥 {self.seen} messages lus ({self.trained} appris)")
+        
+        logger.info(f"✅ Flux terminé : {self.seen} messages en {self.chunks} blocs "
+                    f"({time.perf_counter() - start:.1f} s)")
+        return self
+    
+    def evaluate(self):
+        """Métriques sur le réservoir d'évaluation"""
+        if not self.holdout_texts or not self.trained:
+            return {}
+        y_true = np.asarray(self.holdout_labels, dtype=int)
+        y_pred = self.estimator.predict(self.vectorizer.transform(self.holdout_texts))
+        return {
+            'accuracy': accuracy_score(y_true, y_pred),
+            'precision': precision_score(y_true, y_pred, zero_division=0),
+            'recall': recall_score(y_true, y_pred, zero_division=0),
+            'f1': f1_score(y_true, y_pred, zero_division=0)
+        }
+    
+    def to_model(self):
+        """
+        Modèle utilisable par l'application
+        
+        Returns:
+            MLModel: Estimateur et vectorizer par hachage, avec les métriques du réservoir
+        """
+        model = MLModel(self.algorithm)
+        model.set_trained(self.estimator, self.vectorizer,
+                          metrics=self.evaluate(), trained_samples=self.trained)
+        return model
+
+
+def peak_rss_mb():
+    """Pic de mémoire du processus (Mo), ou None si indisponible"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--data', default=str(STREAMING_CONFIG['data_path']),
+                        help="CSV ou JSONL (défaut: STREAMING_CONFIG['data_path'])")
+    parser.add_argument('--algorithm', choices=list(STREAMING_ALGORITHMS))
+    parser.add_argument('--chunk-size', type=int)
+    parser.add_argument('--holdout-size', type=int)
+    parser.add_argument('--output', default=str(STREAMING_CONFIG['bundle_path']))
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
+    print("="*60)
+    print("🌊 ENTRAÎNEMENT EN FLUX")
+    print("="*60 + "\n")
+    
+    trainer = StreamingTrainer(args.algorithm, args.chunk_size, holdout_size=args.holdout_size)
+    trainer.fit(args.data)
+    model = trainer.to_model()
+    
+    metrics = model.metrics
+    if metrics:
+        print(f"\n🎯 Accuracy: {metrics['accuracy']*100:.2f}%  F1: {metrics['f1']*100:.2f}%  "
+              f"(réservoir de {len(trainer.holdout_texts)} messages)")
+    rss = peak_rss_mb()
+    if rss is not None:
+        print(f"💾 Pic mémoire : {rss:.0f} Mo")
+    
+    if model.save_bundle(args.output, {'data_path': args.data, 'streaming': True,
+                                       'chunk_size': trainer.chunk_size}):
+        print(f"✅ Bundle : {args.output}")
+
+
+if __name__ == "__main__":
+    main()
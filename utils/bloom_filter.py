@@ -0,0 +1,43 @@
+# utils/bloom_filter.py
+"""
+Filtre de Bloom sur des empreintes binaires
+"""
+import math
+
+class BloomFilter:
+    """Ensemble probabiliste : pas de faux négatifs, faux positifs bornés"""
+    
+    def __init__(self, capacity, error_rate=0.001):
+        """
+        Dimensionne le filtre
+        
+        Args:
+            capacity (int): Nombre d'éléments attendus
+            error_rate (float): Taux de faux positifs visé à pleine capacité
+        """
+        capacity = max(int(capacity), 1)
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hash_count = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, digest):
+        """Positions des bits (double hachage à partir d'une empreinte de 16 octets)"""
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:16], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+    
+    def add(self, digest):
+        """Ajoute une empreinte"""
+        for position in self._positions(digest):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def __contains__(self, digest):
+        return all(self.bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(digest))
+    
+    @property
+    def nbytes(self):
+        """Mémoire occupée par le tableau de bits"""
+        return len(self.bits)
@@ -450,6 +450,17 @@ class AnalysisTab(tk.Frame):
             self.spam_progress['value'] = spam_prob
             self.spam_label.config(text=f"{spam_prob:.1f}%")
             
+            # Tokens ayant le plus pesé (calculés à la demande pour un verdict
+            # venant du préfiltre ou de l'index des quasi-doublons)
+            explanation = result.get('explanation')
+            if explanation is None and result.get('original_message'):
+                explanation = self.prediction_service.explain(result['original_message'])
+            explanation = explanation or {'spam': [], 'ham': []}
+            spam_tokens = ", ".join(f"{token} (+{weight:.2f})"
+                                    for token, weight in explanation['spam']) or "—"
+            ham_tokens = ", ".join(f"{token} ({weight:.2f})"
+                                   for token, weight in explanation['ham']) or "—"
+            
             # Informations détaillées
             features = result.get('features', {})
             info_text = f"""Analyse détaillée :
@@ -462,6 +473,10 @@ class AnalysisTab(tk.Frame):
 - Contient chiffres   : {'Oui' if features.get('has_numbers') else 'Non'}
 - Ratio majuscules    : {features.get('uppercase_ratio', 0)*100:.1f}%
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Pourquoi ce verdict :
+- Vers SPAM : {spam_tokens}
+- Vers HAM  : {ham_tokens}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 Timestamp : {result.get('timestamp', 'N/A')}
 Version   : {result.get('model_version', 'N/A')}
 """
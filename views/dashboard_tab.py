@@ -21,10 +21,11 @@ logger = logging.getLogger(__name__)
 class DashboardTab(tk.Frame):
     """Onglet principal moderne avec statistiques et visualisations"""
     
-    def __init__(self, parent, stats_service, **kwargs):
+    def __init__(self, parent, stats_service, prediction_service=None, **kwargs):
         super().__init__(parent, bg=StyleManager.get_color('background'), **kwargs)
         
         self.stats_service = stats_service
+        self.prediction_service = prediction_service
         self.metrics = {}
         self.charts = {}
         
@@ -475,6 +476,16 @@ class DashboardTab(tk.Frame):
             3
         )
         
+        # Indicateur 5: Campagnes (clusters de quasi-doublons)
+        self.metrics['campaigns'] = self.create_analysis_indicator(
+            indicators_frame,
+            "Campagnes",
+            "🧬",
+            "0",
+            StyleManager.get_color('danger'),
+            4
+        )
+        
         return section_frame
     
     def create_analysis_indicator(self, parent, title, icon, value, color, column):
@@ -708,6 +719,12 @@ class DashboardTab(tk.Frame):
                     recent_count = min(total_int, 50)  # Fallback
                 self.metrics['recent']['value_label'].config(text=f"{recent_count}")
             
+            if 'campaigns' in self.metrics and self.prediction_service is not None:
+                near_duplicate_stats = self.prediction_service.get_near_duplicate_stats()
+                self.metrics['campaigns']['value_label'].config(
+                    text=f"{near_duplicate_stats.get('campaigns', 0)}"
+                )
+            
             # Mettre à jour l'anneau de distribution
             if 'distribution' in self.charts:
                 spam_percentage = spam_rate
@@ -468,6 +468,21 @@ class HistoryTab(tk.Frame):
         # Version du modèle
         self.add_info_row(info_frame, "Version:", model_version)
         
+        # Tokens ayant le plus pesé dans le verdict. Recalculée, l'explication
+        # vient du modèle actuel : elle est signalée comme telle si ce n'est
+        # plus le modèle qui a produit la prédiction
+        explanation = prediction.get('explanation')
+        if explanation is None and message:
+            explanation = self.prediction_service.explain(message)
+            if explanation and explanation['model_version'] != model_version:
+                self.add_info_row(info_frame, "Explication:",
+                                  f"modèle actuel ({explanation['model_version']})")
+        if explanation:
+            self.add_info_row(info_frame, "Vers SPAM:", ", ".join(
+                f"{token} (+{weight:.2f})" for token, weight in explanation['spam']) or "—")
+            self.add_info_row(info_frame, "Vers HAM:", ", ".join(
+                f"{token} ({weight:.2f})" for token, weight in explanation['ham']) or "—")
+        
         # Séparateur
         tk.Frame(scroll_frame.scrollable_frame, bg="#e0e0e0", height=1).pack(fill=tk.X, pady=20)
         
@@ -494,9 +509,27 @@ class HistoryTab(tk.Frame):
         message_text.insert("1.0", message)
         message_text.config(state=tk.DISABLED)
         
+        # Boutons d'action
+        buttons_frame = tk.Frame(details_window, bg="white")
+        buttons_frame.pack(pady=20)
+        
+        if prediction.get('id') is not None:
+            tk.Button(
+                buttons_frame,
+                text="⚠️ Prédiction incorrecte",
+                command=lambda: self.report_wrong_prediction(prediction, details_window),
+                font=("Arial", 11),
+                bg=get_colors()['warning'],
+                fg="white",
+                padx=20,
+                pady=10,
+                relief=tk.FLAT,
+                cursor="hand2"
+            ).pack(side=tk.LEFT, padx=(0, 10))
+        
         # Bouton fermer
         tk.Button(
-            details_window,
+            buttons_frame,
             text="Fermer",
             command=details_window.destroy,
             font=("Arial", 11),
@@ -506,7 +539,23 @@ class HistoryTab(tk.Frame):
             pady=10,
             relief=tk.FLAT,
             cursor="hand2"
-        ).pack(pady=20)
+        ).pack(side=tk.LEFT)
+    
+    def report_wrong_prediction(self, prediction, details_window):
+        """Signale une prédiction erronée pour corriger le modèle"""
+        response = messagebox.askyesno(
+            "Confirmation",
+            "Signaler cette prédiction comme incorrecte ?\n\n"
+            "Le modèle sera corrigé avec le label inverse.",
+            parent=details_window
+        )
+        
+        if response:
+            if self.prediction_service.submit_feedback(prediction['id']):
+                messagebox.showinfo("Merci", "Correction enregistrée", parent=details_window)
+                logger.info(f"✅ Correction signalée: {prediction['id']}")
+            else:
+                messagebox.showerror("Erreur", "Échec de l'enregistrement", parent=details_window)
     
     def add_info_row(self, parent, label, value):
         """Ajoute une ligne d'information"""
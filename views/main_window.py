@@ -133,7 +133,8 @@ class MainWindow(tk.Tk):
         # Onglet Dashboard
         self.dashboard_tab = DashboardTab(
             self.notebook,
-            self.controller.get_statistics_service()
+            self.controller.get_statistics_service(),
+            self.controller.get_prediction_service()
         )
         self.notebook.add(self.dashboard_tab, text="📊 Dashboard")
         
@@ -152,7 +153,10 @@ class MainWindow(tk.Tk):
         self.notebook.add(self.history_tab, text="📋 Historique")
         
         # Onglet Paramètres
-        self.settings_tab = SettingsTab(self.notebook)
+        self.settings_tab = SettingsTab(
+            self.notebook,
+            self.controller.get_prediction_service()
+        )
         self.notebook.add(self.settings_tab, text="⚙️ Paramètres")
         
         # Binding pour refresh automatique
@@ -10,7 +10,7 @@ import json
 import shutil
 from pathlib import Path
 
-from config.settings import get_colors, UI_CONFIG, APP_INFO, MODEL_CONFIG, DATABASE_CONFIG, LOGGING_CONFIG
+from config.settings import get_colors, UI_CONFIG, APP_INFO, MODEL_CONFIG, DATABASE_CONFIG, LOGGING_CONFIG, RETRAIN_CONFIG
 from .components import ScrollableFrame
 from config.config_manager import config_manager
 
@@ -19,9 +19,11 @@ logger = logging.getLogger(__name__)
 class SettingsTab(tk.Frame):
     """Onglet des paramètres"""
     
-    def __init__(self, parent, **kwargs):
+    def __init__(self, parent, prediction_service=None, **kwargs):
         super().__init__(parent, bg=get_colors()['bg'], **kwargs)
         
+        self.prediction_service = prediction_service
+        self.retrain_job = None
         self.settings_vars = {}
         self.translated_widgets = {}  # Pour stocker les widgets à traduire
         
@@ -281,7 +283,7 @@ class SettingsTab(tk.Frame):
             cursor="hand2"
         ).pack(pady=5)
         
-        tk.Button(
+        self.retrain_btn = tk.Button(
             actions_frame,
             text="🔁 Réentraîner le modèle",
             command=self.retrain_model,
@@ -292,7 +294,37 @@ class SettingsTab(tk.Frame):
             pady=12,
             relief=tk.FLAT,
             cursor="hand2"
-        ).pack(pady=5)
+        )
+        self.retrain_btn.pack(pady=5)
+        
+        # Progression du réentraînement (affichée pendant un job)
+        self.retrain_frame = tk.Frame(actions_frame, bg="white")
+        self.retrain_progress = ttk.Progressbar(
+            self.retrain_frame,
+            mode='determinate',
+            maximum=100,
+            length=300
+        )
+        self.retrain_progress.pack(side=tk.LEFT, padx=(0, 10))
+        self.retrain_status = tk.Label(
+            self.retrain_frame,
+            text="",
+            font=("Arial", 9),
+            bg="white",
+            fg=get_colors()['text']
+        )
+        self.retrain_status.pack(side=tk.LEFT)
+        self.retrain_cancel_btn = tk.Button(
+            self.retrain_frame,
+            text="⏹️ Annuler",
+            command=self.cancel_retraining,
+            font=("Arial", 9),
+            bg=get_colors()['danger'],
+            fg="white",
+            relief=tk.FLAT,
+            cursor="hand2"
+        )
+        self.retrain_cancel_btn.pack(side=tk.LEFT, padx=10)
         
         tk.Button(
             actions_frame,
@@ -585,21 +617,37 @@ class SettingsTab(tk.Frame):
                 )
     
     def retrain_model(self):
-        """Réentraîne le modèle"""
+        """Réentraîne le modèle dans un processus séparé, avec suivi de la progression"""
         current_language = config_manager.get_setting('language', 'fr')
         
+        if self.prediction_service is None:
+            messagebox.showerror(
+                "Erreur" if current_language == 'fr' else "Error",
+                "Service de prédiction indisponible" if current_language == 'fr' else "Prediction service unavailable"
+            )
+            return
+        
         response = messagebox.askyesno(
             "Confirmation" if current_language == 'fr' else "Confirm",
-            "Réentraîner le modèle ML ?\n\nCela peut prendre quelques minutes." if current_language == 'fr' else "Retrain ML model?\n\nThis may take a few minutes."
+            "Réentraîner le modèle ML ?\n\nL'application reste utilisable pendant l'entraînement." if current_language == 'fr' else "Retrain ML model?\n\nThe application stays usable during training."
         )
         
         if response:
             try:
-                # TODO: Implémenter le réentraînement
-                messagebox.showinfo(
-                    "Info" if current_language == 'fr' else "Info",
-                    "Fonctionnalité en développement" if current_language == 'fr' else "Feature in development"
-                )
+                self.retrain_job = self.prediction_service.start_retraining()
+                if self.retrain_job is None:
+                    messagebox.showinfo(
+                        "Info" if current_language == 'fr' else "Info",
+                        "Un réentraînement est déjà en cours" if current_language == 'fr' else "Retraining already running"
+                    )
+                    return
+                
+                self.retrain_btn.config(state=tk.DISABLED)
+                self.retrain_cancel_btn.config(state=tk.NORMAL)
+                self.retrain_progress['value'] = 0
+                self.retrain_status.config(text="")
+                self.retrain_frame.pack(pady=5)
+                self.after(RETRAIN_CONFIG['poll_interval_ms'], self._poll_retraining)
                 logger.info("ℹ️ Réentraînement demandé")
             except Exception as e:
                 logger.error(f"❌ Erreur réentraînement: {e}")
@@ -608,6 +656,49 @@ class SettingsTab(tk.Frame):
                     f"Erreur: {str(e)}" if current_language == 'fr' else f"Error: {str(e)}"
                 )
     
+    def _poll_retraining(self):
+        """Met à jour la progression du réentraînement (rappelé par after())"""
+        current_language = config_manager.get_setting('language', 'fr')
+        state = self.retrain_job.poll()
+        
+        self.retrain_progress['value'] = state['percent']
+        text = f"{state['percent']:.0f}% {state['message']}"
+        if state['eta_s'] is not None:
+            text += f" (~{state['eta_s']:.0f} s)"
+        self.retrain_status.config(text=text)
+        
+        if state['status'] == 'registering':
+            self.retrain_cancel_btn.config(state=tk.DISABLED)
+        
+        if not self.retrain_job.done:
+            self.after(RETRAIN_CONFIG['poll_interval_ms'], self._poll_retraining)
+            return
+        
+        self.retrain_btn.config(state=tk.NORMAL)
+        self.retrain_frame.pack_forget()
+        
+        if state['status'] == 'finished':
+            accuracy = state.get('metrics', {}).get('accuracy', 0) * 100
+            activated = state.get('activated')
+            messagebox.showinfo(
+                "Succès" if current_language == 'fr' else "Success",
+                (f"Modèle {state['version']} entraîné (accuracy {accuracy:.2f}%)"
+                 + ("\nIl sert désormais les prédictions." if activated else ""))
+                if current_language == 'fr' else
+                (f"Model {state['version']} trained (accuracy {accuracy:.2f}%)"
+                 + ("\nIt now serves predictions." if activated else ""))
+            )
+        elif state['status'] == 'error':
+            messagebox.showerror(
+                "Erreur" if current_language == 'fr' else "Error",
+                f"Erreur: {state['error']}" if current_language == 'fr' else f"Error: {state['error']}"
+            )
+    
+    def cancel_retraining(self):
+        """Annule le réentraînement en cours"""
+        if self.retrain_job is not None and self.retrain_job.cancel():
+            self.retrain_cancel_btn.config(state=tk.DISABLED)
+    
     def export_logs(self):
         """Exporte les logs"""
         try: